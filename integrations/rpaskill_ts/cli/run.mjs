@@ -49,12 +49,174 @@ function ensureDirForFile(filePath) {
   return resolved;
 }
 
+function browserOptions(args, config) {
+  return {
+    headless: toBool(args.headless ?? config.headless, true),
+    channel: args.channel ?? config.channel,
+    executablePath: args.executablePath ?? config.executablePath,
+    slowMo: toInt(config.slowMo, 0),
+    timeout: toInt(config.timeout, 0),
+    proxy: config.proxy,
+    args: config.args,
+    userDataDir: config.userDataDir,
+    storageStatePath: config.storageStatePath,
+    // Allow explicit `viewport: null` in config.
+    viewport: hasOwn(config, 'viewport') ? config.viewport : { width: 1440, height: 900 },
+  };
+}
+
+async function runAction(rpa, action, config) {
+  if (action === 'webSearch') {
+    return await rpa.webSearch({
+      engine: config.engine ?? 'bing',
+      query: config.query,
+      pages: toInt(config.pages, 2),
+      perPage: toInt(config.perPage, 10),
+      details: toInt(config.details, 0),
+      preferredDomains: config.preferredDomains,
+      keywords: config.keywords,
+      screenshotPrefix: config.screenshotPrefix,
+      openScreenshotPrefix: config.openScreenshotPrefix,
+      openScreenshotFullPage: config.openScreenshotFullPage,
+      tracePath: config.tracePath,
+      traceAppend: !!config.traceAppend,
+      afterSearchDelayMs: config.afterSearchDelayMs,
+      navigationTimeout: config.navigationTimeout,
+      baikeUrl: config.baikeUrl,
+    });
+  }
+  if (action === 'adaptiveSearch') {
+    return await rpa.adaptiveSearch({
+      query: config.query,
+      goal: config.goal,
+      language: config.language,
+      engine: config.engine,
+      pages: toInt(config.pages, 2),
+      perPage: toInt(config.perPage, 10),
+      details: toInt(config.details, 0),
+      minResults: toInt(config.minResults, 5),
+      maxRounds: toInt(config.maxRounds, 2),
+      strictKeywords: !!config.strictKeywords,
+      keywords: config.keywords,
+      logEnabled: !!config.logEnabled,
+      logPath: config.logPath,
+      logFormat: config.logFormat,
+      logAppend: !!config.logAppend,
+      logFlushEachRound: !!config.logFlushEachRound,
+      logIncludeResults: config.logIncludeResults ?? true,
+      logIncludeOpened: config.logIncludeOpened ?? false,
+      logIncludeSnippets: config.logIncludeSnippets ?? true,
+      logMaxResults: toInt(config.logMaxResults, 5),
+      logMaxOpened: toInt(config.logMaxOpened, 3),
+      screenshotPrefix: config.screenshotPrefix,
+      openScreenshotPrefix: config.openScreenshotPrefix,
+      openScreenshotFullPage: config.openScreenshotFullPage,
+      tracePath: config.tracePath,
+      traceAppend: !!config.traceAppend,
+      afterSearchDelayMs: config.afterSearchDelayMs,
+      navigationTimeout: config.navigationTimeout,
+      baikeUrl: config.baikeUrl,
+    });
+  }
+  if (action === 'inspectPage') {
+    return await rpa.inspectPage({
+      url: config.url,
+      waitUntil: config.waitUntil,
+      waitForSelector: config.waitForSelector,
+      timeout: config.timeout,
+      capturePrefix: config.capturePrefix,
+      captureFullPage: config.captureFullPage,
+      includeHtml: config.includeHtml,
+      includeAccessibility: config.includeAccessibility,
+      includeElements: config.includeElements,
+      maxElements: config.maxElements,
+      tracePath: config.tracePath,
+      traceAppend: !!config.traceAppend,
+      detectBlockers: config.detectBlockers,
+      pauseForHuman: !!config.pauseForHuman,
+      pauseMessage: config.pauseMessage,
+      pauseTimeoutMs: config.pauseTimeoutMs,
+    });
+  }
+  if (action === 'searchOnSite') {
+    return await rpa.searchOnSite({
+      url: config.url,
+      searchUrl: config.searchUrl,
+      query: config.query,
+      searchInput: config.searchInput,
+      searchButton: config.searchButton,
+      submitByEnter: config.submitByEnter,
+      resultsWaitFor: config.resultsWaitFor,
+      waitForLoadState: config.waitForLoadState,
+      limit: config.limit,
+      screenshotPath: config.screenshotPath,
+      baseUrl: config.baseUrl,
+      navigationTimeout: config.navigationTimeout,
+      navigationWaitUntil: config.navigationWaitUntil,
+      inputTimeout: config.inputTimeout,
+      resultsTimeout: config.resultsTimeout,
+      beforeSearchDelayMs: config.beforeSearchDelayMs,
+      afterSearchDelayMs: config.afterSearchDelayMs,
+      cookieAcceptSelector: config.cookieAcceptSelector,
+      pauseForHuman: !!config.pauseForHuman,
+      pauseForHumanMode: config.pauseForHumanMode,
+      pauseMessage: config.pauseMessage,
+      pauseTimeoutMs: config.pauseTimeoutMs,
+      stepDelayMs: config.stepDelayMs,
+      stepDelayJitterMs: config.stepDelayJitterMs,
+      typeDelayMs: config.typeDelayMs,
+      typeDelayJitterMs: config.typeDelayJitterMs,
+      tracePath: config.tracePath,
+      traceAppend: !!config.traceAppend,
+      capturePrefix: config.capturePrefix,
+      captureFullPage: config.captureFullPage,
+      includeHtml: config.includeHtml,
+      includeElements: config.includeElements,
+      maxElements: config.maxElements,
+      captureOnBlocked: config.captureOnBlocked,
+      captureOnDone: config.captureOnDone,
+      detectBlockers: config.detectBlockers,
+      list: config.list,
+    });
+  }
+  if (action === 'searchProductsHeuristic') {
+    return await rpa.searchProductsHeuristic({
+      searchUrl: config.searchUrl,
+      resultsWaitFor: config.resultsWaitFor,
+      waitForLoadState: config.waitForLoadState,
+      resultsTimeout: config.resultsTimeout,
+      afterSearchDelayMs: config.afterSearchDelayMs,
+      pauseForHuman: !!config.pauseForHuman,
+      pauseForHumanMode: config.pauseForHumanMode,
+      pauseMessage: config.pauseMessage,
+      pauseTimeoutMs: config.pauseTimeoutMs,
+      stepDelayMs: config.stepDelayMs,
+      stepDelayJitterMs: config.stepDelayJitterMs,
+      scrollSteps: config.scrollSteps,
+      scrollDelayMs: config.scrollDelayMs,
+      tracePath: config.tracePath,
+      traceAppend: !!config.traceAppend,
+      capturePrefix: config.capturePrefix,
+      captureFullPage: config.captureFullPage,
+      includeHtml: config.includeHtml,
+      includeElements: config.includeElements,
+      maxElements: config.maxElements,
+      captureOnBlocked: config.captureOnBlocked,
+      captureOnDone: config.captureOnDone,
+      detectBlockers: config.detectBlockers,
+      limit: config.limit,
+      baseUrl: config.baseUrl,
+      screenshotPath: config.screenshotPath,
+    });
+  }
+  throw new Error(`Unknown --action: ${action}`);
+}
+
 async function main() {
   const args = parseArgs(process.argv.slice(2));
   const action = args.action;
   const inputPath = args.input;
   const outputPath = args.output;
-  const executablePath = args.executablePath;
 
   if (args.help || !action || !inputPath || !outputPath) {
     console.log(`Usage:
@@ -73,162 +235,9 @@ async function main() {
       saveStorageTarget = ensureDirForFile(config.saveStorageStatePath);
     }
 
-    await rpa.initBrowser({
-      headless: toBool(args.headless ?? config.headless, true),
-      channel: args.channel ?? config.channel,
-      executablePath: executablePath ?? config.executablePath,
-      slowMo: toInt(config.slowMo, 0),
-      timeout: toInt(config.timeout, 0),
-      proxy: config.proxy,
-      args: config.args,
-      userDataDir: config.userDataDir,
-      storageStatePath: config.storageStatePath,
-      // Allow explicit `viewport: null` in config.
-      viewport: hasOwn(config, 'viewport') ? config.viewport : { width: 1440, height: 900 },
-    });
+    await rpa.initBrowser(browserOptions(args, config));
 
-    let response;
-    if (action === 'webSearch') {
-      response = await rpa.webSearch({
-        engine: config.engine ?? 'bing',
-        query: config.query,
-        pages: toInt(config.pages, 2),
-        perPage: toInt(config.perPage, 10),
-        details: toInt(config.details, 0),
-        preferredDomains: config.preferredDomains,
-        keywords: config.keywords,
-        screenshotPrefix: config.screenshotPrefix,
-        openScreenshotPrefix: config.openScreenshotPrefix,
-        openScreenshotFullPage: config.openScreenshotFullPage,
-        tracePath: config.tracePath,
-        traceAppend: !!config.traceAppend,
-        afterSearchDelayMs: config.afterSearchDelayMs,
-        navigationTimeout: config.navigationTimeout,
-        baikeUrl: config.baikeUrl,
-      });
-    } else if (action === 'adaptiveSearch') {
-      response = await rpa.adaptiveSearch({
-        query: config.query,
-        goal: config.goal,
-        language: config.language,
-        engine: config.engine,
-        pages: toInt(config.pages, 2),
-        perPage: toInt(config.perPage, 10),
-        details: toInt(config.details, 0),
-        minResults: toInt(config.minResults, 5),
-        maxRounds: toInt(config.maxRounds, 2),
-        strictKeywords: !!config.strictKeywords,
-        keywords: config.keywords,
-        logEnabled: !!config.logEnabled,
-        logPath: config.logPath,
-        logFormat: config.logFormat,
-        logAppend: !!config.logAppend,
-        logFlushEachRound: !!config.logFlushEachRound,
-        logIncludeResults: config.logIncludeResults ?? true,
-        logIncludeOpened: config.logIncludeOpened ?? false,
-        logIncludeSnippets: config.logIncludeSnippets ?? true,
-        logMaxResults: toInt(config.logMaxResults, 5),
-        logMaxOpened: toInt(config.logMaxOpened, 3),
-        screenshotPrefix: config.screenshotPrefix,
-        openScreenshotPrefix: config.openScreenshotPrefix,
-        openScreenshotFullPage: config.openScreenshotFullPage,
-        tracePath: config.tracePath,
-        traceAppend: !!config.traceAppend,
-        afterSearchDelayMs: config.afterSearchDelayMs,
-        navigationTimeout: config.navigationTimeout,
-        baikeUrl: config.baikeUrl,
-      });
-    } else if (action === 'inspectPage') {
-      response = await rpa.inspectPage({
-        url: config.url,
-        waitUntil: config.waitUntil,
-        waitForSelector: config.waitForSelector,
-        timeout: config.timeout,
-        capturePrefix: config.capturePrefix,
-        captureFullPage: config.captureFullPage,
-        includeHtml: config.includeHtml,
-        includeAccessibility: config.includeAccessibility,
-        includeElements: config.includeElements,
-        maxElements: config.maxElements,
-        tracePath: config.tracePath,
-        traceAppend: !!config.traceAppend,
-        detectBlockers: config.detectBlockers,
-        pauseForHuman: !!config.pauseForHuman,
-        pauseMessage: config.pauseMessage,
-        pauseTimeoutMs: config.pauseTimeoutMs,
-      });
-    } else if (action === 'searchOnSite') {
-      response = await rpa.searchOnSite({
-        url: config.url,
-        searchUrl: config.searchUrl,
-        query: config.query,
-        searchInput: config.searchInput,
-        searchButton: config.searchButton,
-        submitByEnter: config.submitByEnter,
-        resultsWaitFor: config.resultsWaitFor,
-        waitForLoadState: config.waitForLoadState,
-        limit: config.limit,
-        screenshotPath: config.screenshotPath,
-        baseUrl: config.baseUrl,
-        navigationTimeout: config.navigationTimeout,
-        navigationWaitUntil: config.navigationWaitUntil,
-        inputTimeout: config.inputTimeout,
-        resultsTimeout: config.resultsTimeout,
-        beforeSearchDelayMs: config.beforeSearchDelayMs,
-        afterSearchDelayMs: config.afterSearchDelayMs,
-        cookieAcceptSelector: config.cookieAcceptSelector,
-        pauseForHuman: !!config.pauseForHuman,
-        pauseForHumanMode: config.pauseForHumanMode,
-        pauseMessage: config.pauseMessage,
-        pauseTimeoutMs: config.pauseTimeoutMs,
-        stepDelayMs: config.stepDelayMs,
-        stepDelayJitterMs: config.stepDelayJitterMs,
-        typeDelayMs: config.typeDelayMs,
-        typeDelayJitterMs: config.typeDelayJitterMs,
-        tracePath: config.tracePath,
-        traceAppend: !!config.traceAppend,
-        capturePrefix: config.capturePrefix,
-        captureFullPage: config.captureFullPage,
-        includeHtml: config.includeHtml,
-        includeElements: config.includeElements,
-        maxElements: config.maxElements,
-        captureOnBlocked: config.captureOnBlocked,
-        captureOnDone: config.captureOnDone,
-        detectBlockers: config.detectBlockers,
-        list: config.list,
-      });
-    } else if (action === 'searchProductsHeuristic') {
-      response = await rpa.searchProductsHeuristic({
-        searchUrl: config.searchUrl,
-        resultsWaitFor: config.resultsWaitFor,
-        waitForLoadState: config.waitForLoadState,
-        resultsTimeout: config.resultsTimeout,
-        afterSearchDelayMs: config.afterSearchDelayMs,
-        pauseForHuman: !!config.pauseForHuman,
-        pauseForHumanMode: config.pauseForHumanMode,
-        pauseMessage: config.pauseMessage,
-        pauseTimeoutMs: config.pauseTimeoutMs,
-        stepDelayMs: config.stepDelayMs,
-        stepDelayJitterMs: config.stepDelayJitterMs,
-        scrollSteps: config.scrollSteps,
-        scrollDelayMs: config.scrollDelayMs,
-        tracePath: config.tracePath,
-        traceAppend: !!config.traceAppend,
-        capturePrefix: config.capturePrefix,
-        captureFullPage: config.captureFullPage,
-        includeHtml: config.includeHtml,
-        includeElements: config.includeElements,
-        maxElements: config.maxElements,
-        captureOnBlocked: config.captureOnBlocked,
-        captureOnDone: config.captureOnDone,
-        detectBlockers: config.detectBlockers,
-        limit: config.limit,
-        baseUrl: config.baseUrl,
-        screenshotPath: config.screenshotPath,
-      });
-    } else {
-      throw new Error(`Unknown --action: ${action}`);
-    }
+    const response = await runAction(rpa, action, config);
 
     const out = {
       ok: true,
@@ -94,11 +94,14 @@ async function main() {
     'getTitle',
     'waitForNavigation',
     'waitForURL',
+    'waitForUrlPredicate',
     'click',
     'rightClick',
     'doubleClick',
     'input',
     'type',
+    'fillFirstMatching',
+    'clickFirstMatching',
     'press',
     'selectOption',
     'check',
@@ -114,6 +117,7 @@ async function main() {
     'extractAllText',
     'extractAttribute',
     'extractAllAttributes',
+    'extractResultRows',
     'extractTable',
     'extractImage',
     'extractAllImages',
@@ -124,6 +128,7 @@ async function main() {
     'extractLocalStorage',
     'extractSessionStorage',
     'captureScreenshot',
+    'captureBundle',
     'webSearch',
     'adaptiveSearch',
     'searchOnSite',
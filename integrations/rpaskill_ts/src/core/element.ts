@@ -1,5 +1,6 @@
+import { Locator, Page } from 'playwright';
 import { browserManager } from './browser.js';
-import { ElementOptions } from '../types.js';
+import { ElementOptions, FirstMatchOptions, FirstMatchResult, SelectorSpec } from '../types.js';
 
 export class ElementOperator {
   async click(selector: string, options: ElementOptions = {}): Promise<void> {
@@ -40,6 +41,70 @@ export class ElementOperator {
     await page.fill(selector, text, elementOptions);
   }
 
+  /**
+   * Fill the first selector (in priority order) that is present on the page.
+   * Trying candidates here instead of one RPC per attempt keeps heuristic forms to a single round trip.
+   */
+  async fillFirstMatching(selectors: SelectorSpec[], text: string, options: FirstMatchOptions = {}): Promise<FirstMatchResult> {
+    const page = await browserManager.getPage();
+    const timeout = options.timeout ?? 3000;
+    await this.waitForAny(selectors, timeout);
+    for (const selector of selectors) {
+      const loc = this.locate(page, selector);
+      if ((await loc.count()) === 0) continue;
+      try {
+        await loc.click({ timeout });
+        await loc.fill(text, { timeout: Math.max(timeout, 10000) });
+        for (const key of options.pressAfter ?? []) {
+          await page.keyboard.press(key, { delay: options.delay ?? 40 });
+        }
+        for (const type of options.dispatchAfter ?? []) {
+          await loc.dispatchEvent(type);
+        }
+        return { ok: true, usedSelector: selector };
+      } catch {
+        // try the next candidate
+      }
+    }
+    return { ok: false, usedSelector: '' };
+  }
+
+  /** Click the first selector (in priority order) that is present on the page. */
+  async clickFirstMatching(selectors: SelectorSpec[], options: FirstMatchOptions = {}): Promise<FirstMatchResult> {
+    const page = await browserManager.getPage();
+    const timeout = options.timeout ?? 5000;
+    await this.waitForAny(selectors, timeout);
+    for (const selector of selectors) {
+      const loc = this.locate(page, selector);
+      if ((await loc.count()) === 0) continue;
+      try {
+        await loc.click({ timeout, force: options.force ?? false, noWaitAfter: options.noWaitAfter ?? false });
+        return { ok: true, usedSelector: selector };
+      } catch {
+        // try the next candidate
+      }
+    }
+    return { ok: false, usedSelector: '' };
+  }
+
+  private locate(page: Page, spec: SelectorSpec): Locator {
+    if (typeof spec === 'string') return page.locator(spec).first();
+    const loc = page.locator(spec.css);
+    return (spec.hasText ? loc.filter({ hasText: spec.hasText }) : loc).first();
+  }
+
+  private async waitForAny(selectors: SelectorSpec[], timeout: number): Promise<void> {
+    const page = await browserManager.getPage();
+    const css = selectors.map((s) => (typeof s === 'string' ? s : s.css));
+    try {
+      // Give late-rendering forms a chance before checking candidates one by one
+      // (text filters are ignored here; the loop below applies them).
+      await page.locator(css.join(', ')).first().waitFor({ state: 'attached', timeout });
+    } catch {
+      // none appeared; the per-selector loop reports ok=false
+    }
+  }
+
   async type(selector: string, text: string, options: ElementOptions & { delay?: number } = {}): Promise<void> {
     const page = await browserManager.getPage();
     const elementOptions = {
@@ -1,5 +1,5 @@
 import { browserManager } from './browser.js';
-import { ExtractOptions, TableData } from '../types.js';
+import { ExtractOptions, ResultColumnSpec, ResultRow, TableData } from '../types.js';
 
 export class Extractor {
   async extractText(selector: string, options: ExtractOptions = {}): Promise<string> {
@@ -34,6 +34,34 @@ export class Extractor {
     return attributes;
   }
 
+  async extractResultRows(
+    rowSelector: string,
+    columns: Record<string, ResultColumnSpec>,
+    options: ExtractOptions = {}
+  ): Promise<ResultRow[]> {
+    const page = await browserManager.getPage();
+    // One round trip for the whole table: every column of every row is projected in the page.
+    return await page.$$eval(
+      rowSelector,
+      (rows, cols) =>
+        rows.map((row) => {
+          const out: Record<string, string | string[] | null> = {};
+          for (const [name, spec] of Object.entries(cols)) {
+            const read = (el: Element) =>
+              !spec.attr || spec.attr === 'text' ? el.textContent || '' : el.getAttribute(spec.attr) || '';
+            if (spec.all) {
+              out[name] = Array.from(row.querySelectorAll(spec.selector)).map(read);
+            } else {
+              const el = row.querySelector(spec.selector);
+              out[name] = el ? read(el) : null;
+            }
+          }
+          return out;
+        }),
+      columns
+    );
+  }
+
   async extractTable(selector: string, options: ExtractOptions = {}): Promise<TableData[]> {
     const page = await browserManager.getPage();
     
@@ -1,5 +1,5 @@
 import { browserManager } from './browser.js';
-import { NavigationOptions, LoadState } from '../types.js';
+import { NavigationOptions, LoadState, UrlPredicateOptions } from '../types.js';
 
 export class Navigator {
   async navigate(url: string, options: NavigationOptions = {}): Promise<void> {
@@ -59,6 +59,28 @@ export class Navigator {
     await page.waitForURL(url, navigationOptions);
   }
 
+  async waitForUrlPredicate(
+    pattern: string,
+    options: UrlPredicateOptions = {}
+  ): Promise<{ matched: boolean; url: string }> {
+    const page = await browserManager.getPage();
+    const re = new RegExp(pattern, options.flags ?? 'i');
+    const negate = options.negate ?? false;
+    try {
+      // Resolves on the first URL change that satisfies the predicate (or immediately if the current one does).
+      await page.waitForURL((u) => re.test(u.href) !== negate, {
+        timeout: options.timeout ?? 30000,
+        waitUntil: 'commit',
+      });
+      return { matched: true, url: page.url() };
+    } catch (err) {
+      if ((err as Error)?.name === 'TimeoutError') {
+        return { matched: false, url: page.url() };
+      }
+      throw err;
+    }
+  }
+
   async closePage(): Promise<void> {
     const page = await browserManager.getPage();
     await page.close();
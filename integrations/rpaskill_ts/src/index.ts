@@ -1,3 +1,5 @@
+import fs from 'node:fs';
+import path from 'node:path';
 import { browserManager } from './core/browser.js';
 import { navigator } from './core/navigator.js';
 import { elementOperator } from './core/element.js';
@@ -15,8 +17,12 @@ import {
   AdaptiveSearchResponse,
   AdaptiveSearchRound,
   BrowserOptions,
+  CaptureBundleOptions,
+  CaptureBundleResult,
   ElementOptions,
   ExtractOptions,
+  FirstMatchOptions,
+  FirstMatchResult,
   FlowControlOptions,
   HeuristicProductSearchOptions,
   InspectPageOptions,
@@ -25,10 +31,14 @@ import {
   ListExtractionProfile,
   LoadState,
   NavigationOptions,
+  ResultColumnSpec,
+  ResultRow,
   SearchGoal,
   SearchResultRecord,
   SearchTaskOptions,
+  SelectorSpec,
   TableData,
+  UrlPredicateOptions,
   WebSearchEngine,
   WebSearchOpened,
   WebSearchOptions,
@@ -91,6 +101,13 @@ export class RPASkill {
     await navigator.waitForURL(url, options);
   }
 
+  async waitForUrlPredicate(
+    pattern: string,
+    options: UrlPredicateOptions = {}
+  ): Promise<{ matched: boolean; url: string }> {
+    return await navigator.waitForUrlPredicate(pattern, options);
+  }
+
   // Element Operations
   async click(selector: string, options: ElementOptions = {}): Promise<void> {
     await elementOperator.click(selector, options);
@@ -112,6 +129,14 @@ export class RPASkill {
     await elementOperator.type(selector, text, options);
   }
 
+  async fillFirstMatching(selectors: SelectorSpec[], text: string, options: FirstMatchOptions = {}): Promise<FirstMatchResult> {
+    return await elementOperator.fillFirstMatching(selectors, text, options);
+  }
+
+  async clickFirstMatching(selectors: SelectorSpec[], options: FirstMatchOptions = {}): Promise<FirstMatchResult> {
+    return await elementOperator.clickFirstMatching(selectors, options);
+  }
+
   async press(key: string, options: { delay?: number } = {}): Promise<void> {
     await elementOperator.press(key, options);
   }
@@ -173,6 +198,14 @@ export class RPASkill {
     return await extractor.extractAllAttributes(selector, attribute, options);
   }
 
+  async extractResultRows(
+    rowSelector: string,
+    columns: Record<string, ResultColumnSpec>,
+    options: ExtractOptions = {}
+  ): Promise<ResultRow[]> {
+    return await extractor.extractResultRows(rowSelector, columns, options);
+  }
+
   async extractTable(selector: string, options: ExtractOptions = {}): Promise<TableData[]> {
     return await extractor.extractTable(selector, options);
   }
@@ -295,6 +328,47 @@ export class RPASkill {
     return await inspectPageSkill.inspect(options);
   }
 
+  // Capture the current page state (url + screenshot + html + result rows) in one call, without navigating.
+  async captureBundle(options: CaptureBundleOptions = {}): Promise<CaptureBundleResult> {
+    const page = await browserManager.getPage();
+    const out: CaptureBundleResult = { url: page.url(), errors: {} };
+    const tasks: Promise<void>[] = [];
+    // Each part fails independently; a broken screenshot should not cost the extracted rows.
+    const part = (name: string, task: () => Promise<void>) =>
+      tasks.push(
+        task().catch((err) => {
+          out.errors[name] = (err && err.message) || String(err);
+        })
+      );
+
+    if (options.screenshotPath) {
+      const screenshotPath = options.screenshotPath;
+      part('screenshot', async () => {
+        fs.mkdirSync(path.dirname(screenshotPath), { recursive: true });
+        await page.screenshot({ path: screenshotPath, fullPage: options.fullPage ?? false });
+        out.screenshotPath = screenshotPath;
+      });
+    }
+    if (options.htmlPath) {
+      const htmlPath = options.htmlPath;
+      part('html', async () => {
+        const html = await page.content();
+        fs.mkdirSync(path.dirname(htmlPath), { recursive: true });
+        fs.writeFileSync(htmlPath, html, 'utf-8');
+        out.htmlPath = htmlPath;
+      });
+    }
+    if (options.rowSelector && options.columns) {
+      const { rowSelector, columns } = options;
+      part('rows', async () => {
+        out.rows = await extractor.extractResultRows(rowSelector, columns);
+      });
+    }
+
+    await Promise.all(tasks);
+    return out;
+  }
+
   // Utils
   getConfig() {
     return config;
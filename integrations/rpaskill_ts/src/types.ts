@@ -31,11 +31,40 @@ export interface ElementOptions {
   noWaitAfter?: boolean;
 }
 
+/** A CSS selector, or CSS plus a text filter (locator.filter({ hasText }) instead of the `:has-text()` engine). */
+export type SelectorSpec = string | { css: string; hasText?: string };
+
+export interface FirstMatchOptions extends ElementOptions {
+  /** Keys pressed after a successful fill (e.g. ['Space', 'Backspace'] to fire key listeners). */
+  pressAfter?: string[];
+  /**
+   * DOM events dispatched on the filled element (e.g. ['input', 'keyup']). Cheaper than `pressAfter`:
+   * listeners fire without typing into the field.
+   */
+  dispatchAfter?: string[];
+  /** Delay between keydown/keyup for `pressAfter`. */
+  delay?: number;
+}
+
+export interface FirstMatchResult {
+  ok: boolean;
+  /** The candidate that matched, as passed in ('' when none did). */
+  usedSelector: SelectorSpec;
+}
+
 export interface NavigationOptions {
   timeout?: number;
   waitUntil?: 'load' | 'domcontentloaded' | 'networkidle';
 }
 
+export interface UrlPredicateOptions {
+  /** RegExp flags for the pattern (default 'i'). */
+  flags?: string;
+  /** Wait for a URL that does NOT match the pattern. */
+  negate?: boolean;
+  timeout?: number;
+}
+
 export interface ExtractOptions {
   timeout?: number;
 }
@@ -57,6 +86,34 @@ export interface ListExtractionProfile {
   fields: Record<string, ListExtractionField>;
 }
 
+export interface ResultColumnSpec {
+  /** Selector relative to the row element. */
+  selector: string;
+  /** 'text' (default) for textContent, otherwise an attribute name. */
+  attr?: 'text' | string;
+  /** Collect every match in the row instead of the first one. */
+  all?: boolean;
+}
+
+export type ResultRow = Record<string, string | string[] | null>;
+
+export interface CaptureBundleOptions {
+  screenshotPath?: string;
+  fullPage?: boolean;
+  /** Written server-side so the HTML never crosses the RPC boundary. */
+  htmlPath?: string;
+  rowSelector?: string;
+  columns?: Record<string, ResultColumnSpec>;
+}
+
+export interface CaptureBundleResult {
+  url: string;
+  screenshotPath?: string;
+  htmlPath?: string;
+  rows?: ResultRow[];
+  errors: Record<string, string>;
+}
+
 export interface ListExtractionOptions {
   limit?: number;
   baseUrl?: string;
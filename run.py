@@ -1,38 +1,109 @@
 from __future__ import annotations
 
-import argparse
 import os
 import subprocess
 import sys
 import json
 from pathlib import Path
 
-from runtime.engine import run_skill
 
+def _venv_python(venv_dir: Path) -> Path:
+    if os.name == "nt":
+        return venv_dir / "Scripts" / "python.exe"
+    return venv_dir / "bin" / "python"
 
-def _maybe_reexec_in_venv(project_root: Path) -> None:
+
+def _maybe_reexec_in_venv(
+    project_root: Path,
+    *,
+    script: Path | None = None,
+    argv: list[str] | None = None,
+) -> None:
     """
     Ensure we run under the shared venv (runtime/deps/python/venv) when it exists.
 
     This makes "public dependencies" truly shared across all skills without users having
-    to remember which python to invoke.
+    to remember which python to invoke. Wrapper scripts pass their own `script` path so the
+    re-exec restarts the wrapper rather than run.py.
     """
     if os.environ.get("SKILLBOX_NO_REEXEC") == "1":
         return
-    venv_py = project_root / "runtime" / "deps" / "python" / "venv" / "Scripts" / "python.exe"
+    venv_dir = project_root / "runtime" / "deps" / "python" / "venv"
+    venv_py = _venv_python(venv_dir)
     if not venv_py.exists():
         return
-    if Path(sys.executable).resolve() == venv_py.resolve():
+    # Compare prefixes: on POSIX the venv python is usually a symlink to the base interpreter.
+    if Path(sys.prefix).resolve() == venv_dir.resolve():
         return
     env = os.environ.copy()
     env["SKILLBOX_NO_REEXEC"] = "1"
-    subprocess.check_call([str(venv_py), str(Path(__file__).resolve()), *sys.argv[1:]], env=env)
+    if script is None:
+        script = Path(__file__).resolve()
+    if argv is None:
+        argv = sys.argv[1:]
+    cmd = [str(venv_py), str(script), *argv]
+    if os.name != "nt":
+        # Replace this process instead of spawning a child and waiting on it.
+        os.execve(str(venv_py), cmd, env)
+    # Windows has no real exec (os.exec* spawns and detaches from the console), so wait on a child.
+    subprocess.check_call(cmd, env=env)
     raise SystemExit(0)
 
 
+def _list_skills(root_dir: Path) -> int:
+    from runtime.registry import discover_skills
+
+    skills = discover_skills(root_dir)
+    if not skills:
+        print("(no skills found)")
+        return 0
+    w1 = max(len(s.name) for s in skills)
+    w2 = max(len(s.version) for s in skills)
+    print(f"{'skill'.ljust(w1)}  {'version'.ljust(w2)}  description")
+    for s in skills:
+        print(f"{s.name.ljust(w1)}  {s.version.ljust(w2)}  {s.description}")
+    return 0
+
+
+def _validate_skill(name: str, root_dir: Path) -> int:
+    from runtime.registry import validate_skill
+
+    validate_skill(name, root_dir)
+    print("OK")
+    return 0
+
+
+# Bare words json.loads accepts (NaN/Infinity are its float extensions; -Infinity starts with "-").
+_JSON_LITERALS = frozenset({"true", "false", "null", "NaN", "Infinity"})
+
+
+def _parse_override_value(v: str) -> object:
+    """Parse JSON scalars/arrays/objects; fall back to the raw string."""
+    # Only values that could be JSON reach json.loads: plain strings (the common case, e.g.
+    # query=laptops) would just raise and be caught, which costs far more than this check.
+    c = v[:1]
+    if c in ('"', "[", "{", "-") or c.isdigit() or v in _JSON_LITERALS:
+        try:
+            return json.loads(v)
+        except ValueError:
+            return v
+    return v
+
+
 def main(argv: list[str] | None = None) -> int:
     project_root = Path(__file__).resolve().parent
-    _maybe_reexec_in_venv(project_root)
+    if argv is None:
+        # Only when invoked as a CLI; in-process callers (wrappers) already chose their interpreter.
+        _maybe_reexec_in_venv(project_root)
+
+    # Common quick commands skip argparse entirely (import + parser setup dominate their runtime).
+    cli_argv = sys.argv[1:] if argv is None else list(argv)
+    if cli_argv == ["--list"]:
+        return _list_skills(project_root)
+    if len(cli_argv) == 3 and cli_argv[0] == "--validate" and cli_argv[1] == "--skill":
+        return _validate_skill(cli_argv[2], project_root)
+
+    import argparse
 
     parser = argparse.ArgumentParser(description="Run a skill by name (or list/validate skills).")
     parser.add_argument("--skill", required=False, help="Skill name, e.g. web_automation_skill")
@@ -56,27 +127,12 @@ def main(argv: list[str] | None = None) -> int:
     root_dir = Path(args.root).resolve() if args.root else project_root
 
     if args.list:
-        from runtime.registry import discover_skills
-
-        skills = discover_skills(root_dir)
-        if not skills:
-            print("(no skills found)")
-            return 0
-        w1 = max(len(s.name) for s in skills)
-        w2 = max(len(s.version) for s in skills)
-        print(f"{'skill'.ljust(w1)}  {'version'.ljust(w2)}  description")
-        for s in skills:
-            print(f"{s.name.ljust(w1)}  {s.version.ljust(w2)}  {s.description}")
-        return 0
+        return _list_skills(root_dir)
 
     if args.validate:
         if not args.skill:
             raise SystemExit("--validate requires --skill <name>")
-        from runtime.registry import validate_skill
-
-        validate_skill(args.skill, root_dir)
-        print("OK")
-        return 0
+        return _validate_skill(args.skill, root_dir)
 
     if not args.skill:
         raise SystemExit("Missing --skill (or use --list/--validate)")
@@ -90,11 +146,10 @@ def main(argv: list[str] | None = None) -> int:
         v = v.strip()
         if not k:
             raise SystemExit(f"Invalid --set key: {item}")
-        # Try to parse JSON scalars/arrays/objects; fall back to raw string.
-        try:
-            overrides[k] = json.loads(v)
-        except Exception:
-            overrides[k] = v
+        overrides[k] = _parse_override_value(v)
+
+    # Imported late: --list/--validate do not need the engine's import graph.
+    from runtime.engine import run_skill
 
     res = run_skill(
         args.skill,
@@ -102,7 +157,7 @@ def main(argv: list[str] | None = None) -> int:
         run_id=args.run_id,
         agent_id=args.agent,
         config_overrides=overrides or None,
-        invocation={"argv": sys.argv[1:], "set": args.set},
+        invocation={"argv": cli_argv, "set": args.set},
     )
     # Keep CLI output predictable for piping.
     # Use ASCII escapes to avoid Windows console encoding issues (e.g., GBK).
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
+from types import ModuleType
+
+
+def _import_run(root: Path) -> ModuleType:
+    """Import run.py from the given project root so the skill runs in this process."""
+    p = str(root)
+    if p not in sys.path:
+        sys.path.insert(0, p)
+    import run
+
+    return run
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -21,46 +31,33 @@ def main(argv: list[str] | None = None) -> int:
     p.add_argument("--root", default=".", help="Project root (default: .)")
     args = p.parse_args(argv)
 
-    query = args.query or input("query: ").strip()
-    if not query:
-        raise SystemExit("Missing --query (or empty input)")
-
     root = Path(args.root).resolve()
     run_py = root / "run.py"
     if not run_py.exists():
         raise SystemExit(f"run.py not found under root: {root}")
+    run = _import_run(root)
+    if argv is None:
+        run._maybe_reexec_in_venv(root, script=Path(__file__).resolve())
+
+    query = args.query or input("query: ").strip()
+    if not query:
+        raise SystemExit("Missing --query (or empty input)")
 
-    cmd = [
-        sys.executable,
-        str(run_py),
-        "--skill",
-        "web_search_skill",
-        "--root",
-        str(root),
-        "--run-id",
-        args.run_id,
-        "--agent",
-        args.agent,
-        "--set",
-        f'query={query}',
-        "--set",
-        f"engine={args.engine}",
-        "--set",
-        f"pages={args.pages}",
-        "--set",
-        f"perPage={args.per_page}",
-        "--set",
-        f"details={args.details}",
-        "--set",
-        f"headless={args.headless}",
-        "--set",
-        f"channel={args.channel}",
-    ]
-    if args.executable_path:
-        cmd += ["--set", f"executablePath={args.executable_path}"]
+    # Skill config keys -> values; None means "not given" and is left to the skill default.
+    overrides = {
+        "query": query,
+        "engine": args.engine,
+        "pages": args.pages,
+        "perPage": args.per_page,
+        "details": args.details,
+        "headless": args.headless,
+        "channel": args.channel,
+        "executablePath": args.executable_path or None,
+    }
+    cmd = ["--skill", "web_search_skill", "--root", str(root), "--run-id", args.run_id, "--agent", args.agent]
+    cmd += [x for k, v in overrides.items() if v is not None for x in ("--set", f"{k}={v}")]
 
-    subprocess.check_call(cmd)
-    return 0
+    return run.main(cmd)
 
 
 if __name__ == "__main__":
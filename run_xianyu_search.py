@@ -8,7 +8,7 @@ with open('xianyu_search_config.json', 'r', encoding='utf-8') as f:
 
 # 构建命令参数
 cmd = [
-    'python', 'run.py',
+    sys.executable, 'run.py',
     '--skill', 'rpa_ts_skill',
 ]
 
@@ -22,14 +22,10 @@ for key, value in config.items():
 
 print(f"Running command: {' '.join(cmd)}")
 
-# 运行命令
-result = subprocess.run(cmd, capture_output=True, text=True)
-
+# 运行命令：子进程直接继承本进程的 stdout/stderr，边运行边输出，不在内存里缓存整段输出
 print("\nCommand output:")
-print(result.stdout)
-
-if result.stderr:
-    print("\nCommand error:")
-    print(result.stderr)
+sys.stdout.flush()
+proc = subprocess.Popen(cmd)
+returncode = proc.wait()
 
-print(f"\nReturn code: {result.returncode}")
+print(f"\nReturn code: {returncode}")
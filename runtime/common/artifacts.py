@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-import json
 import hashlib
+import mmap
+import os
+import stat
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Literal, Optional
+from typing import Any, Iterator, Literal, Optional
 
-from ..utils import ensure_dir
+from ..utils import dumps_json_pretty, dumps_jsonl, ensure_dir
+from .jsonl import JsonlAppender
 
 
 def _sha256_bytes(b: bytes) -> str:
@@ -15,7 +20,7 @@ def _sha256_bytes(b: bytes) -> str:
     return h.hexdigest()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ArtifactMeta:
     skill: str
     run_id: str
@@ -45,6 +50,35 @@ class ArtifactStore:
         ensure_dir(self.shared_dir)
         # Append-only index per agent (safe without locks).
         self._index_path = self.agent_dir / "index.jsonl"
+        self._index = JsonlAppender(self._index_path)
+        # (path, mtime_ns, size) -> sha256, so re-recording an unchanged file skips re-hashing.
+        self._hash_cache: dict[tuple[str, int, int], str] = {}
+        # Parent dirs already created by write_bytes; skips a mkdir/stat per artifact.
+        self._ensured_dirs: set[Path] = {self.agent_dir, self.shared_dir}
+        # Index lines held back while a batch() block is open, per thread: sites running
+        # concurrently on one store each batch (and flush) only their own records.
+        self._local = threading.local()
+
+    @contextmanager
+    def batch(self) -> Iterator["ArtifactStore"]:
+        """
+        Group several writes/records: their index lines are appended in one write and flushed
+        once when the block exits. Nested batches join the outermost one.
+
+        Batches are per thread; records from other threads are not held back.
+        """
+        local = self._local
+        if getattr(local, "pending", None) is not None:
+            yield self
+            return
+        local.pending = []
+        try:
+            yield self
+        finally:
+            pending, local.pending = local.pending, None
+            if pending:
+                self._index.write(b"".join(pending))
+                self._index.flush()
 
     def path(self, rel: str, *, scope: Literal["agent", "shared"] = "agent") -> Path:
         base = self.agent_dir if scope == "agent" else self.shared_dir
@@ -68,8 +102,14 @@ class ArtifactStore:
         *,
         scope: Literal["agent", "shared"] = "agent",
         indent: int = 2,
+        compact: bool = False,
     ) -> Path:
-        b = (json.dumps(data, ensure_ascii=False, indent=indent) + "\n").encode("utf-8")
+        if compact:
+            # Single-line output; cheaper to encode for large machine-only payloads.
+            b = dumps_jsonl(data)
+        else:
+            # Encoded straight to UTF-8 bytes (orjson when available), no intermediate str.
+            b = dumps_json_pretty(data, indent=indent)
         return self.write_bytes(rel, b, scope=scope)
 
     def write_bytes(
@@ -80,7 +120,10 @@ class ArtifactStore:
         scope: Literal["agent", "shared"] = "agent",
     ) -> Path:
         p = self.path(rel, scope=scope)
-        ensure_dir(p.parent)
+        parent = p.parent
+        if parent not in self._ensured_dirs:
+            ensure_dir(parent)
+            self._ensured_dirs.add(parent)
         p.write_bytes(data)
         self._record(p, size=len(data), sha256=_sha256_bytes(data), scope=scope, kind=None, data=None)
         return p
@@ -100,20 +143,38 @@ class ArtifactStore:
         """
         try:
             p = Path(path)
-            if not p.exists() or not p.is_file():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                return None
+            if not stat.S_ISREG(st.st_mode):
                 return None
 
-            size = p.stat().st_size
-            sha256 = self._sha256_file(p)
+            size = st.st_size
+            key = (str(p), st.st_mtime_ns, size)
+            sha256 = self._hash_cache.get(key)
+            if sha256 is None:
+                sha256 = self._sha256_file(p)
+                self._hash_cache[key] = sha256
             rec = self._record(p, size=size, sha256=sha256, scope=scope, kind=kind, data=data)
             return rec
         except Exception:
             # Indexing should never break the skill run.
             return None
 
-    def _sha256_file(self, path: Path, *, chunk_size: int = 1024 * 1024) -> str:
+    def _sha256_file(self, path: Path, *, chunk_size: int = 1024 * 1024, mmap_threshold: int = 64 * 1024) -> str:
         h = hashlib.sha256()
         with path.open("rb") as f:
+            # Larger files: hash one mapped buffer so hashlib/OpenSSL runs without a Python read loop.
+            if os.fstat(f.fileno()).st_size > mmap_threshold:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        h.update(mm)
+                    return h.hexdigest()
+                except (OSError, ValueError):
+                    # e.g. file truncated concurrently or mapping unsupported; fall back to reads.
+                    h = hashlib.sha256()
+                    f.seek(0)
             while True:
                 chunk = f.read(chunk_size)
                 if not chunk:
@@ -144,6 +205,16 @@ class ArtifactStore:
             rec["kind"] = kind
         if data is not None:
             rec["data"] = data
-        with self._index_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        line = dumps_jsonl(rec)
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append(line)
+        else:
+            self._index.write(line)
         return rec
+
+    def flush(self, *, fsync: bool = False) -> None:
+        self._index.flush(fsync=fsync)
+
+    def close(self) -> None:
+        self._index.close()
@@ -1,21 +1,46 @@
 from __future__ import annotations
 
-import json
+import atexit
 import os
-import uuid
+import queue
+import threading
+import weakref
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Literal, Optional
+from typing import Any, Callable, Literal, Optional
 
-from ..utils import ensure_dir
+from ..utils import dumps_jsonl, ensure_dir, utc_now_iso_ms
+from .jsonl import JsonlAppender
 
 
-def _utc_ts() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+_PID = os.getpid()
 
 
-@dataclass(frozen=True)
+def _refresh_pid() -> None:
+    global _PID
+    _PID = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_pid)
+
+
+# Logs with a running writer thread; drained at interpreter exit (daemon threads are not joined).
+_BACKGROUND: "weakref.WeakSet[EventLog]" = weakref.WeakSet()
+
+
+def _close_background() -> None:
+    for log in list(_BACKGROUND):
+        try:
+            log.close()
+        except Exception:
+            pass
+
+
+atexit.register(_close_background)
+
+
+@dataclass(frozen=True, slots=True)
 class EventMeta:
     skill: str
     run_id: str
@@ -26,13 +51,32 @@ class EventLog:
     """
     Append-only JSONL event log.
 
-    Without locks, the safe pattern for multi-agent is: one file per agent.
+    Each record is written with a single append `write()` on a descriptor kept open for the
+    log's lifetime (call `close()` when done). On POSIX that keeps lines from different
+    processes from interleaving; elsewhere the safe pattern is still one file per agent.
+
+    With `background=True`, `emit` only serializes the record and queues it; a writer thread
+    appends whatever has queued up in one write. Order is preserved per log. `flush()` waits
+    for queued records to reach the file and `close()` drains the queue before returning.
     """
 
-    def __init__(self, path: Path, *, meta: EventMeta) -> None:
+    def __init__(self, path: Path, *, meta: EventMeta, background: bool = False) -> None:
         self.path = path
         self.meta = meta
         ensure_dir(self.path.parent)
+        self._out = JsonlAppender(self.path, raw=True)
+        # Identity fields never change for a log; build them once and splice into each record.
+        self._base = {"skill": meta.skill, "run_id": meta.run_id, "agent_id": meta.agent_id}
+        self._q: Optional[queue.SimpleQueue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        # Guards `_q` handoffs: nothing is queued after close()'s sentinel, so no record is lost.
+        self._q_lock = threading.Lock()
+        if background:
+            self._q = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._writer, name=f"eventlog:{path}", daemon=True)
+            self._thread.start()
+            _BACKGROUND.add(self)
 
     def emit(
         self,
@@ -43,35 +87,122 @@ class EventLog:
         data: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
         rec: dict[str, Any] = {
-            "ts": _utc_ts(),
-            "id": uuid.uuid4().hex[:12],
+            "ts": utc_now_iso_ms(),
+            # 48 random bits: plenty for per-run uniqueness, without building a UUID object.
+            "id": os.urandom(6).hex(),
             "level": level,
             "event": event,
             "message": message,
-            "skill": self.meta.skill,
-            "run_id": self.meta.run_id,
-            "agent_id": self.meta.agent_id,
-            "pid": os.getpid(),
+            **self._base,
+            "pid": _PID,
         }
         if data:
             rec["data"] = data
-        # Note: no lock. Prefer one file per agent to avoid interleaving lines.
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        # Serialized here rather than on the writer thread: callers may keep mutating `data`.
+        line = dumps_jsonl(rec)
+        if self._q is not None:
+            with self._q_lock:
+                q = self._q
+                if q is not None:
+                    q.put(line)
+                    return rec
+        # Note: no lock. One append write per record; prefer one file per agent on Windows.
+        self._out.write(line)
         return rec
 
+    def _writer(self) -> None:
+        q = self._q
+        assert q is not None
+        while True:
+            item = q.get()
+            batch: list[bytes] = []
+            done = False
+            while True:
+                if item is None:
+                    done = True
+                    break
+                if isinstance(item, threading.Event):
+                    # flush() marker: everything queued before it must be written first.
+                    self._write_batch(batch)
+                    batch = []
+                    item.set()
+                else:
+                    batch.append(item)
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+            if done:
+                return
+
+    def _write_batch(self, batch: list[bytes]) -> None:
+        if not batch:
+            return
+        try:
+            self._out.write(batch[0] if len(batch) == 1 else b"".join(batch))
+        except Exception as e:
+            # Surfaced to the caller on the next flush()/close().
+            if self._error is None:
+                self._error = e
+
+    def _raise_writer_error(self) -> None:
+        err, self._error = self._error, None
+        if err is not None:
+            raise err
+
+    def flush(self, *, fsync: bool = False) -> None:
+        marker: Optional[threading.Event] = None
+        with self._q_lock:
+            if self._q is not None and self._thread is not None and self._thread.is_alive():
+                marker = threading.Event()
+                self._q.put(marker)
+        if marker is not None:
+            marker.wait()
+        self._raise_writer_error()
+        self._out.flush(fsync=fsync)
+
+    def close(self) -> None:
+        with self._q_lock:
+            q, thread = self._q, self._thread
+            if q is not None:
+                # Sentinel first, then detach: an emit racing with close() either queued its
+                # record ahead of the sentinel or sees no queue and writes synchronously.
+                q.put(None)
+            self._q = None
+            self._thread = None
+        _BACKGROUND.discard(self)
+        if thread is not None:
+            thread.join()
+        self._out.close()
+        self._raise_writer_error()
+
 
 class EventBus:
     """
     Convenience wrapper: log agent-private events and (optionally) shared events.
 
     Default goes to agent log only; shared log is best reserved for a single coordinator agent
-    until locking is implemented.
+    until locking is implemented. Pass `shared_factory` instead of `shared_log` to create the
+    shared log only on the first shared-scope emit.
     """
 
-    def __init__(self, *, agent_log: EventLog, shared_log: Optional[EventLog] = None) -> None:
+    def __init__(
+        self,
+        *,
+        agent_log: EventLog,
+        shared_log: Optional[EventLog] = None,
+        shared_factory: Optional[Callable[[], EventLog]] = None,
+    ) -> None:
         self._agent = agent_log
         self._shared = shared_log
+        self._shared_factory = shared_factory if shared_log is None else None
+
+    def _get_shared(self) -> Optional[EventLog]:
+        if self._shared is None and self._shared_factory is not None:
+            self._shared = self._shared_factory()
+            self._shared_factory = None
+        return self._shared
 
     def emit(
         self,
@@ -84,13 +215,19 @@ class EventBus:
     ) -> dict[str, Any]:
         if scope == "agent":
             return self._agent.emit(event, message=message, level=level, data=data)
+        shared = self._get_shared()
         if scope == "shared":
-            if not self._shared:
+            if not shared:
                 raise RuntimeError("shared event log is not configured for this run")
-            return self._shared.emit(event, message=message, level=level, data=data)
+            return shared.emit(event, message=message, level=level, data=data)
         # both
         rec = self._agent.emit(event, message=message, level=level, data=data)
-        if self._shared:
-            self._shared.emit(event, message=message, level=level, data=data)
+        if shared:
+            shared.emit(event, message=message, level=level, data=data)
         return rec
 
+    def close(self) -> None:
+        self._agent.close()
+        # Never-materialized shared logs have nothing to close.
+        if self._shared:
+            self._shared.close()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+# Appenders that still hold an open handle; flushed/closed at interpreter exit.
+_OPEN: "weakref.WeakSet[JsonlAppender]" = weakref.WeakSet()
+
+
+def _close_all() -> None:
+    for appender in list(_OPEN):
+        try:
+            appender.close()
+        except Exception:
+            pass
+
+
+atexit.register(_close_all)
+
+
+class JsonlAppender:
+    """
+    Append-only JSONL file that keeps its handle open between writes.
+
+    Opening/closing per line costs a syscall pair per record (CreateFile/CloseHandle on Windows),
+    which dominates for small records. Writes are buffered and flushed at most every
+    `flush_interval_s` seconds (0 = flush every write), on `flush()`, and on `close()`.
+
+    With `raw=True` each record goes out as one `os.write` on an O_APPEND descriptor instead:
+    no user-space buffering, and on POSIX a single append write is not interleaved with
+    other processes appending to the same file (for records up to the filesystem's atomic size).
+
+    Safe to share between threads of one process (e.g. a skill scraping sites concurrently).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        flush_interval_s: float = 1.0,
+        buffer_size: int = 1 << 16,
+        raw: bool = False,
+    ) -> None:
+        self.path = path
+        self.flush_interval_s = flush_interval_s
+        self.buffer_size = buffer_size
+        self.raw = raw
+        self._fh: Optional[BinaryIO] = None
+        self._fd: Optional[int] = None
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def write(self, line: bytes) -> None:
+        with self._lock:
+            self._write(line)
+
+    def _write(self, line: bytes) -> None:
+        if self.raw:
+            if self._fd is None:
+                flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+                self._fd = os.open(str(self.path), flags, 0o644)
+                _OPEN.add(self)
+            view = memoryview(line)
+            while view:
+                n = os.write(self._fd, view)
+                view = view[n:]
+            return
+        if self._fh is None:
+            self._fh = self.path.open("ab", buffering=self.buffer_size)
+            self._last_flush = time.monotonic()
+            _OPEN.add(self)
+        self._fh.write(line)
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval_s:
+            self._fh.flush()
+            self._last_flush = now
+
+    def flush(self, *, fsync: bool = False) -> None:
+        with self._lock:
+            self._flush(fsync=fsync)
+
+    def _flush(self, *, fsync: bool) -> None:
+        if self._fd is not None:
+            if fsync:
+                os.fsync(self._fd)
+            return
+        if self._fh is None:
+            return
+        self._fh.flush()
+        self._last_flush = time.monotonic()
+        if fsync:
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            fh, self._fh = self._fh, None
+            fd, self._fd = self._fd, None
+        _OPEN.discard(self)
+        if fh is not None:
+            fh.close()
+        if fd is not None:
+            os.close(fd)
@@ -1,19 +1,14 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Literal, Optional
+from typing import Any, Callable, Literal, Optional
 
-from ..utils import ensure_dir
+from ..utils import dumps_jsonl, ensure_dir, utc_now_iso_ms
+from .jsonl import JsonlAppender
 
 
-def _utc_ts() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
-
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MemoryMeta:
     skill: str
     run_id: str
@@ -27,38 +22,69 @@ class MemoryLog:
     Intended to store small, query-friendly facts/decisions, not large blobs.
     """
 
-    def __init__(self, path: Path, *, meta: MemoryMeta) -> None:
+    def __init__(self, path: Path, *, meta: MemoryMeta, flush_interval_s: float = 1.0) -> None:
         self.path = path
         self.meta = meta
         ensure_dir(self.path.parent)
+        self._out = JsonlAppender(self.path, flush_interval_s=flush_interval_s)
 
     def append(self, item: dict[str, Any]) -> dict[str, Any]:
         rec = {
-            "ts": _utc_ts(),
+            "ts": utc_now_iso_ms(),
             "skill": self.meta.skill,
             "run_id": self.meta.run_id,
             "agent_id": self.meta.agent_id,
             "item": item,
         }
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._out.write(dumps_jsonl(rec))
         return rec
 
+    def flush(self, *, fsync: bool = False) -> None:
+        self._out.flush(fsync=fsync)
+
+    def close(self) -> None:
+        self._out.close()
+
 
 class MemoryStore:
-    def __init__(self, *, agent_log: MemoryLog, shared_log: Optional[MemoryLog] = None) -> None:
+    """
+    Agent-private memory plus an optional shared log.
+
+    Pass `shared_factory` instead of `shared_log` to create the shared log only on the first
+    shared-scope append.
+    """
+
+    def __init__(
+        self,
+        *,
+        agent_log: MemoryLog,
+        shared_log: Optional[MemoryLog] = None,
+        shared_factory: Optional[Callable[[], MemoryLog]] = None,
+    ) -> None:
         self._agent = agent_log
         self._shared = shared_log
+        self._shared_factory = shared_factory if shared_log is None else None
+
+    def _get_shared(self) -> Optional[MemoryLog]:
+        if self._shared is None and self._shared_factory is not None:
+            self._shared = self._shared_factory()
+            self._shared_factory = None
+        return self._shared
 
     def append(self, item: dict[str, Any], *, scope: Literal["agent", "shared", "both"] = "agent") -> dict[str, Any]:
         if scope == "agent":
             return self._agent.append(item)
+        shared = self._get_shared()
         if scope == "shared":
-            if not self._shared:
+            if not shared:
                 raise RuntimeError("shared memory is not configured for this run")
-            return self._shared.append(item)
+            return shared.append(item)
         rec = self._agent.append(item)
-        if self._shared:
-            self._shared.append(item)
+        if shared:
+            shared.append(item)
         return rec
 
+    def close(self) -> None:
+        self._agent.close()
+        if self._shared:
+            self._shared.close()
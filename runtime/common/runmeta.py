@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from ..utils import ensure_dir
+from ..utils import dumps_json_pretty, ensure_dir
 
 
 def _utc_ts() -> str:
@@ -25,13 +25,17 @@ class RunMeta:
 
 def write_if_missing(path: Path, obj: dict[str, Any]) -> None:
     """
-    Best-effort "create once" without locks.
-    Good enough when a single coordinator writes shared metadata.
+    "Create once" without locks: O_EXCL makes the existence check and the create one atomic
+    step, so when several agents race only the first one writes.
     """
     ensure_dir(path.parent)
-    if path.exists():
+    data = dumps_json_pretty(obj)
+    try:
+        fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o644)
+    except FileExistsError:
         return
-    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
 
 
 def write_agent_meta(agent_dir: Path, meta: RunMeta, *, config: dict[str, Any]) -> Path:
@@ -45,7 +49,7 @@ def write_agent_meta(agent_dir: Path, meta: RunMeta, *, config: dict[str, Any])
         "config": config,
     }
     ensure_dir(agent_dir)
-    p.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    p.write_bytes(dumps_json_pretty(payload))
     return p
 
 
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import os
+import secrets
 import traceback
-import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from .config import PlatformConfig, load_platform_config, load_skill_config
 from .common import (
@@ -23,7 +24,7 @@ from .common import (
 )
 from .logger import create_logger
 from .registry import resolve_skill
-from .utils import add_sys_path, ensure_dir, utc_now_compact, write_json
+from .utils import add_sys_path, ensure_dir, import_module, utc_now_compact, write_json
 
 
 @dataclass
@@ -49,8 +50,63 @@ class SkillContext:
     is_coordinator: bool
 
 
+# (skill name, skill dir) -> resolved run(ctx); saves the import + attribute checks on repeat runs.
+_RUN_CACHE: dict[tuple[str, str], Callable[[SkillContext], Any]] = {}
+
+
+def _load_skill_run(skill_name: str, skill_dir: Path) -> Callable[[SkillContext], Any]:
+    key = (skill_name, str(skill_dir))
+    fn = _RUN_CACHE.get(key)
+    if fn is None:
+        module_name = f"skills.{skill_name}.main"
+        fn = getattr(import_module(module_name), "run", None)
+        if fn is None:
+            raise AttributeError(f"{module_name} must define run(ctx)")
+        _RUN_CACHE[key] = fn
+    return fn
+
+
+_META_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _meta_pool() -> ThreadPoolExecutor:
+    """Small shared pool for the per-run metadata writes (created once, reused across runs)."""
+    global _META_POOL
+    if _META_POOL is None:
+        _META_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="skillbox-meta")
+    return _META_POOL
+
+
+# Memory item recorded at every skill start; built once and only ever serialized.
+_START_ITEM: dict[str, Any] = {"type": "skill.start", "message": "skill started"}
+
+# Env vars read by run_skill and the config/registry loaders it calls. Keep in sync with them:
+# anything not listed here is invisible to those loaders during run_skill.
+_ENV_KEYS = (
+    "SKILLBOX_SKILLS_DIR",
+    "SKILLBOX_OUTPUTS_DIR",
+    "SKILLBOX_LOGS_DIR",
+    "SKILLBOX_DEPS_DIR",
+    "SKILLBOX_LOG_LEVEL",
+    "PLAYWRIGHT_BROWSERS_PATH",
+    "SKILLBOX_SKILL_PATHS",
+    "SKILLBOX_NO_SKILL_CACHE",
+    "SKILLBOX_CACHE_DIR",
+    "SKILLBOX_RUN_ID",
+    "SKILLBOX_AGENT_ID",
+    "SKILLBOX_COORDINATOR",
+)
+
+
+def _env_snapshot() -> dict[str, str]:
+    """Read the env vars run_skill depends on once, instead of through os.environ per lookup."""
+    environ = os.environ
+    return {k: environ[k] for k in _ENV_KEYS if k in environ}
+
+
 def _make_run_id() -> str:
-    return f"{utc_now_compact()}_{uuid.uuid4().hex[:8]}"
+    # 4 random bytes -> 8 hex chars, same suffix as before without building a full UUID.
+    return f"{utc_now_compact()}_{secrets.token_hex(4)}"
 
 
 def run_skill(
@@ -68,8 +124,9 @@ def run_skill(
     This import style enables per-skill "common code" via relative imports, e.g.
     `from .common.login import login`.
     """
-    platform_cfg = load_platform_config(root_dir=root_dir)
-    mf = resolve_skill(skill_name, platform_cfg.root_dir)
+    env = _env_snapshot()
+    platform_cfg = load_platform_config(root_dir=root_dir, environ=env)
+    mf = resolve_skill(skill_name, platform_cfg.root_dir, environ=env)
     skill_dir = mf.skill_dir
 
     # Make project root (and the skill's owning root) importable so `import skills.xxx.main` works from any CWD.
@@ -77,19 +134,22 @@ def run_skill(
     add_sys_path(mf.project_root)
 
     if run_id is None:
-        run_id = os.environ.get("SKILLBOX_RUN_ID") or _make_run_id()
+        run_id = env.get("SKILLBOX_RUN_ID") or _make_run_id()
     if agent_id is None:
-        agent_id = os.environ.get("SKILLBOX_AGENT_ID") or "agent0"
-    is_coordinator = os.environ.get("SKILLBOX_COORDINATOR") == "1" or agent_id == "agent0"
+        agent_id = env.get("SKILLBOX_AGENT_ID") or "agent0"
+    is_coordinator = env.get("SKILLBOX_COORDINATOR") == "1" or agent_id == "agent0"
 
     # Standard run layout:
     # outputs/<skill>/<run_id>/
     #   shared/...
     #   agents/<agent_id>/work/...
-    run_dir = ensure_dir(platform_cfg.outputs_dir / skill_name / run_id)
-    shared_dir = ensure_dir(run_dir / "shared")
-    agent_dir = ensure_dir(run_dir / "agents" / agent_id)
-    work_dir = ensure_dir(agent_dir / "work")
+    run_dir = platform_cfg.outputs_dir / skill_name / run_id
+    shared_dir = run_dir / "shared"
+    agent_dir = run_dir / "agents" / agent_id
+    work_dir = agent_dir / "work"
+    # One mkdir -p for the deepest agent path creates run_dir/agent_dir on the way.
+    ensure_dir(work_dir)
+    shared_dir.mkdir(exist_ok=True)
 
     # Skills should write outputs into an agent-private directory by default.
     outputs_dir = agent_dir
@@ -114,14 +174,21 @@ def run_skill(
     # - agent events/memory are safe without locks
     # - shared events/memory should ideally be written by a single coordinator agent
     meta = EventMeta(skill=skill_name, run_id=run_id, agent_id=agent_id)
-    agent_events = EventLog(agent_dir / "events.jsonl", meta=meta)
-    shared_events = EventLog(shared_dir / "events.jsonl", meta=meta)
-    events = EventBus(agent_log=agent_events, shared_log=shared_events)
+    # Agent log is private to this process, so its writes can go through a writer thread;
+    # the shared log stays synchronous so concurrent agents append whole records in order.
+    agent_events = EventLog(agent_dir / "events.jsonl", meta=meta, background=True)
+    # Shared logs are created on first shared-scope write; most skills only log agent-scoped.
+    events = EventBus(
+        agent_log=agent_events,
+        shared_factory=lambda: EventLog(shared_dir / "events.jsonl", meta=meta),
+    )
 
     mm = MemoryMeta(skill=skill_name, run_id=run_id, agent_id=agent_id)
     agent_memory = MemoryLog(agent_dir / "memory.jsonl", meta=mm)
-    shared_memory = MemoryLog(shared_dir / "memory.jsonl", meta=mm)
-    memory = MemoryStore(agent_log=agent_memory, shared_log=shared_memory)
+    memory = MemoryStore(
+        agent_log=agent_memory,
+        shared_factory=lambda: MemoryLog(shared_dir / "memory.jsonl", meta=mm),
+    )
 
     artifacts = ArtifactStore(
         agent_dir=agent_dir,
@@ -130,10 +197,9 @@ def run_skill(
     )
 
     skill_cfg = load_skill_config(skill_dir)
-    merged_cfg: dict[str, Any] = dict(skill_cfg)
-    if config_overrides:
-        # Shallow merge is the default; keep it predictable and stable.
-        merged_cfg.update(config_overrides)
+    # Shallow merge is the default; keep it predictable and stable. Always a fresh dict, so
+    # skills may mutate ctx.config without touching the loaded skill config.
+    merged_cfg: dict[str, Any] = {**skill_cfg, **config_overrides} if config_overrides else dict(skill_cfg)
 
     # Write run metadata files to make later searching/iteration easier.
     # - agent.json: always written (agent-private)
@@ -147,9 +213,11 @@ def run_skill(
         started_at=started_at,
         coordinator=is_coordinator,
     )
-    write_agent_meta(agent_dir, meta, config=merged_cfg)
+    # Written on the I/O pool while request.json is written below; joined before the skill runs.
+    pool = _meta_pool()
+    meta_writes: list[Future[Any]] = [pool.submit(write_agent_meta, agent_dir, meta, config=merged_cfg)]
     if is_coordinator:
-        write_shared_run_meta(shared_dir, meta)
+        meta_writes.append(pool.submit(write_shared_run_meta, shared_dir, meta))
 
     ctx = SkillContext(
         skill_name=skill_name,
@@ -189,15 +257,13 @@ def run_skill(
             },
             scope="agent",
         )
+        for fut in meta_writes:
+            fut.result()
 
-        ctx.events.emit("skill.start", message="skill started", scope="agent")
-        ctx.memory.append({"type": "skill.start", "message": "skill started"}, scope="agent")
+        ctx.events.emit("skill.start", message=_START_ITEM["message"], scope="agent")
+        ctx.memory.append(_START_ITEM, scope="agent")
 
-        module_name = f"skills.{skill_name}.main"
-        mod = __import__(module_name, fromlist=["run"])
-        if not hasattr(mod, "run"):
-            raise AttributeError(f"{module_name} must define run(ctx)")
-        res = mod.run(ctx)  # type: ignore[attr-defined]
+        res = _load_skill_run(skill_name, skill_dir)(ctx)
         if res is None:
             res = {"status": "ok"}
         if not isinstance(res, dict):
@@ -229,3 +295,10 @@ def run_skill(
         except Exception:
             pass
         raise
+    finally:
+        # JSONL logs keep their handles open during the run; flush and release them here.
+        for closer in (events.close, memory.close, artifacts.close):
+            try:
+                closer()
+            except Exception:
+                pass
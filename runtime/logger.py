@@ -7,6 +7,30 @@ from typing import Optional
 from .utils import ensure_dir
 
 
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders `asctime` once per wall-clock second.
+
+    Both handlers (file + console) share one instance, and chatty skills log many lines per
+    second; the datefmt has no sub-second part, so the rendered string only changes per second.
+    """
+
+    def __init__(self, fmt: str, datefmt: str) -> None:
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        # (second, rendered); one tuple so concurrent handlers never see a mismatched pair.
+        self._cached: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        sec = int(record.created)
+        cached_sec, cached = self._cached
+        if sec == cached_sec and datefmt == self.datefmt:
+            return cached
+        rendered = super().formatTime(record, datefmt)
+        if datefmt == self.datefmt:
+            self._cached = (sec, rendered)
+        return rendered
+
+
 def create_logger(
     name: str,
     *,
@@ -28,7 +52,7 @@ def create_logger(
     if getattr(logger, "_skillbox_configured", False):
         return logger
 
-    fmt = logging.Formatter(
+    fmt = _CachedTimeFormatter(
         fmt="%(asctime)s %(levelname)s [%(name)s] [run=%(run_id)s] %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
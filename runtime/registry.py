@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Mapping, Optional
 
-from .utils import add_sys_path
+from .utils import add_sys_path, import_module, resolved_str
 
 
 @dataclass(frozen=True)
@@ -20,6 +22,18 @@ class SkillManifest:
     capabilities: dict[str, Any]
 
 
+_StatManifest = list[tuple[Path, Path, int, int]]
+
+# In-process caches (validated by the same skill.json stats as the on-disk snapshot):
+# - roots -> (stat manifest, discovered skills, name index)
+# - skill.json path -> ((mtime_ns, size), parsed json), so only edited manifests are re-read
+_CACHE_LOCK = threading.Lock()
+_DISCOVERY_CACHE: dict[
+    tuple[Path, ...], tuple[_StatManifest, list[SkillManifest], dict[str, SkillManifest]]
+] = {}
+_MANIFEST_CACHE: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+
 def _iter_skill_roots(project_root: Path, *, environ: dict[str, str] = os.environ) -> list[Path]:
     """
     Skill roots are "project-like" roots that contain a `skills/` folder.
@@ -27,14 +41,14 @@ def _iter_skill_roots(project_root: Path, *, environ: dict[str, str] = os.enviro
     - Always include current project_root
     - Optionally include extra roots from SKILLBOX_SKILL_PATHS (os.pathsep-separated)
     """
-    roots = [project_root.resolve()]
+    roots = [Path(resolved_str(project_root))]
     extra = environ.get("SKILLBOX_SKILL_PATHS", "").strip()
     if extra:
         for item in extra.split(os.pathsep):
             item = item.strip().strip('"')
             if not item:
                 continue
-            p = Path(item).expanduser().resolve()
+            p = Path(resolved_str(Path(item).expanduser()))
             if p not in roots:
                 roots.append(p)
     return roots
@@ -44,51 +58,271 @@ def _load_manifest(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def discover_skills(project_root: Path, *, environ: dict[str, str] = os.environ) -> list[SkillManifest]:
+def _load_manifest_safe(path: Path) -> Optional[dict[str, Any]]:
+    try:
+        data = _load_manifest(path)
+    except Exception:
+        # Ignore broken manifests during discovery; validation will surface it.
+        return None
+    return data if isinstance(data, dict) else None
+
+
+# Cold scans read skill.json files on a small thread pool once there are at least this many
+# to read: a win on network/roaming home dirs, not worth the pool startup for a handful.
+_PARALLEL_READ_MIN = 4
+_PARALLEL_READ_WORKERS = 8
+
+
+def _read_manifests(manifest: _StatManifest, *, use_cache: bool) -> list[Optional[dict[str, Any]]]:
+    """Parsed skill.json per manifest entry (None if unreadable), in manifest order."""
+    out: list[Optional[dict[str, Any]]] = [None] * len(manifest)
+    misses: list[int] = []
+    if use_cache:
+        with _CACHE_LOCK:
+            for i, (_, mf, mtime_ns, size) in enumerate(manifest):
+                hit = _MANIFEST_CACHE.get(mf)
+                if hit is not None and hit[0] == (mtime_ns, size):
+                    out[i] = hit[1]
+                else:
+                    misses.append(i)
+    else:
+        misses = list(range(len(manifest)))
+
+    paths = [manifest[i][1] for i in misses]
+    if len(paths) >= _PARALLEL_READ_MIN:
+        with ThreadPoolExecutor(max_workers=min(_PARALLEL_READ_WORKERS, len(paths))) as ex:
+            loaded = list(ex.map(_load_manifest_safe, paths))
+    else:
+        loaded = [_load_manifest_safe(p) for p in paths]
+
+    for i, data in zip(misses, loaded):
+        out[i] = data
+    if use_cache:
+        with _CACHE_LOCK:
+            for i, data in zip(misses, loaded):
+                if data is not None:
+                    _, mf, mtime_ns, size = manifest[i]
+                    _MANIFEST_CACHE[mf] = ((mtime_ns, size), data)
+    return out
+
+
+def _snapshot_path(environ: Mapping[str, str] = os.environ) -> Optional[Path]:
+    """The on-disk snapshot is opt-in: None unless SKILLBOX_CACHE_DIR names a folder for it."""
+    base = environ.get("SKILLBOX_CACHE_DIR", "").strip()
+    if not base:
+        return None
+    return Path(base).expanduser() / "skills_snapshot.json"
+
+
+def _build_manifest(roots: list[Path]) -> _StatManifest:
     """
-    Discover skills across skill roots.
+    Stat every `<root>/skills/*/skill.json` without reading it.
 
-    A discoverable skill is a folder under `<root>/skills/<skill_name>/` with `skill.json`.
+    Returns (root, skill.json path, mtime_ns, size) in discovery order; this doubles as the
+    snapshot validation key and the work list for a cold scan.
     """
-    manifests: list[SkillManifest] = []
-    seen: set[str] = set()
-    for root in _iter_skill_roots(project_root, environ=environ):
+    out: _StatManifest = []
+    for root in roots:
         skills_dir = root / "skills"
         if not skills_dir.exists():
             continue
         for d in sorted([p for p in skills_dir.iterdir() if p.is_dir()]):
             mf = d / "skill.json"
-            if not mf.exists():
-                continue
             try:
-                data = _load_manifest(mf)
-                name = str(data.get("name") or d.name)
-                if name in seen:
-                    # First match wins; keep deterministic ordering.
-                    continue
-                manifests.append(
-                    SkillManifest(
-                        name=name,
-                        version=str(data.get("version") or "0.0.0"),
-                        description=str(data.get("description") or ""),
-                        entry=str(data.get("entry") or "main:run"),
-                        skill_dir=d,
-                        project_root=root,
-                        capabilities=dict(data.get("capabilities") or {}),
-                    )
-                )
-                seen.add(name)
-            except Exception:
-                # Ignore broken manifests during discovery; validation will surface it.
+                st = mf.stat()
+            except OSError:
                 continue
-    return manifests
+            out.append((root, mf, st.st_mtime_ns, st.st_size))
+    return out
+
+
+def _manifest_key(manifest: _StatManifest) -> list[list[Any]]:
+    return [[str(mf), mtime_ns, size] for _, mf, mtime_ns, size in manifest]
+
+
+def _load_snapshot(
+    roots: list[Path],
+    manifest: _StatManifest,
+    *,
+    environ: Mapping[str, str] = os.environ,
+) -> Optional[list[SkillManifest]]:
+    """Return cached manifests if the snapshot for these roots still matches every skill.json stat."""
+    path = _snapshot_path(environ)
+    if path is None:
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        entry = data.get(os.pathsep.join(str(r) for r in roots))
+        if not entry or entry.get("manifest") != _manifest_key(manifest):
+            return None
+        return [
+            SkillManifest(
+                name=str(it["name"]),
+                version=str(it["version"]),
+                description=str(it["description"]),
+                entry=str(it["entry"]),
+                skill_dir=Path(it["skill_dir"]),
+                project_root=Path(it["project_root"]),
+                capabilities=dict(it.get("capabilities") or {}),
+            )
+            for it in entry["skills"]
+        ]
+    except Exception:
+        return None
+
+
+def _write_snapshot(
+    roots: list[Path],
+    manifest: _StatManifest,
+    skills: list[SkillManifest],
+    *,
+    environ: Mapping[str, str] = os.environ,
+) -> None:
+    """Best-effort: a missing/unwritable cache dir only costs the next call a cold scan."""
+    path = _snapshot_path(environ)
+    if path is None:
+        return
+    try:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                data = {}
+        except Exception:
+            data = {}
+        data[os.pathsep.join(str(r) for r in roots)] = {
+            "manifest": _manifest_key(manifest),
+            "skills": [
+                {
+                    "name": s.name,
+                    "version": s.version,
+                    "description": s.description,
+                    "entry": s.entry,
+                    "skill_dir": str(s.skill_dir),
+                    "project_root": str(s.project_root),
+                    "capabilities": s.capabilities,
+                }
+                for s in skills
+            ],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception:
+        return
+
+
+def _manifest_from_data(data: dict[str, Any], *, name: str, skill_dir: Path, project_root: Path) -> SkillManifest:
+    return SkillManifest(
+        name=name,
+        version=str(data.get("version") or "0.0.0"),
+        description=str(data.get("description") or ""),
+        entry=str(data.get("entry") or "main:run"),
+        skill_dir=skill_dir,
+        project_root=project_root,
+        capabilities=dict(data.get("capabilities") or {}),
+    )
+
+
+def discover_skills(project_root: Path, *, environ: dict[str, str] = os.environ) -> list[SkillManifest]:
+    """
+    Discover skills across skill roots.
+
+    A discoverable skill is a folder under `<root>/skills/<skill_name>/` with `skill.json`.
+
+    Results are cached in-process and, when SKILLBOX_CACHE_DIR is set, in a snapshot
+    (`$SKILLBOX_CACHE_DIR/skills_snapshot.json`) shared across processes; both are reused only
+    while every skill.json keeps the same path/mtime/size. Set SKILLBOX_NO_SKILL_CACHE=1 to
+    always scan.
+    """
+    skills, _ = _discover(project_root, environ=environ)
+    return list(skills)
+
+
+def _get_index(project_root: Path, *, environ: Mapping[str, str] = os.environ) -> dict[str, SkillManifest]:
+    """Name -> manifest for the current skill roots (shared cache object; do not mutate)."""
+    _, index = _discover(project_root, environ=environ)
+    return index
+
+
+def _discover(
+    project_root: Path, *, environ: Mapping[str, str] = os.environ
+) -> tuple[list[SkillManifest], dict[str, SkillManifest]]:
+    roots = _iter_skill_roots(project_root, environ=environ)
+    manifest = _build_manifest(roots)
+    use_cache = environ.get("SKILLBOX_NO_SKILL_CACHE") != "1"
+    cache_key = tuple(roots)
+    if use_cache:
+        with _CACHE_LOCK:
+            hit = _DISCOVERY_CACHE.get(cache_key)
+        if hit is not None and hit[0] == manifest:
+            return hit[1], hit[2]
+        cached = _load_snapshot(roots, manifest, environ=environ)
+        if cached is not None:
+            index = {s.name: s for s in cached}
+            with _CACHE_LOCK:
+                _DISCOVERY_CACHE[cache_key] = (manifest, cached, index)
+            return cached, index
+
+    manifests: list[SkillManifest] = []
+    index: dict[str, SkillManifest] = {}
+    for (root, mf, _, _), data in zip(manifest, _read_manifests(manifest, use_cache=use_cache)):
+        if data is None:
+            continue
+        d = mf.parent
+        try:
+            name = str(data.get("name") or d.name)
+            if name in index:
+                # First match wins; keep deterministic ordering.
+                continue
+            sm = _manifest_from_data(data, name=name, skill_dir=d, project_root=root)
+            manifests.append(sm)
+            index[name] = sm
+        except Exception:
+            continue
+    if use_cache:
+        with _CACHE_LOCK:
+            _DISCOVERY_CACHE[cache_key] = (manifest, manifests, index)
+        _write_snapshot(roots, manifest, manifests, environ=environ)
+    return manifests, index
+
+
+def _probe_skill(skill_name: str, project_root: Path, *, environ: Mapping[str, str]) -> Optional[SkillManifest]:
+    """
+    Fast path for the usual layout where the folder name is the skill name.
+
+    Stats `<root>/skills/<skill_name>/skill.json` per root and parses only that file, instead of
+    statting (and on a cold cache, parsing) every manifest. Returns None whenever the result
+    could be ambiguous, so the caller falls back to full discovery.
+
+    Caveat: a *different* folder that declares `"name": "<skill_name>"` in an earlier position
+    would win full discovery but is not seen here. Two skills claiming one name is a
+    misconfiguration either way; `--list` still shows discovery order.
+    """
+    if not skill_name or skill_name in (".", "..") or "/" in skill_name or "\\" in skill_name:
+        return None
+    use_cache = environ.get("SKILLBOX_NO_SKILL_CACHE") != "1"
+    for root in _iter_skill_roots(project_root, environ=environ):
+        mf = root / "skills" / skill_name / "skill.json"
+        try:
+            st = mf.stat()
+        except OSError:
+            continue
+        data = _read_manifests([(root, mf, st.st_mtime_ns, st.st_size)], use_cache=use_cache)[0]
+        if data is None or str(data.get("name") or skill_name) != skill_name:
+            return None
+        return _manifest_from_data(data, name=skill_name, skill_dir=mf.parent, project_root=root)
+    return None
 
 
 def resolve_skill(skill_name: str, project_root: Path, *, environ: dict[str, str] = os.environ) -> SkillManifest:
-    for mf in discover_skills(project_root, environ=environ):
-        if mf.name == skill_name:
-            return mf
-    raise FileNotFoundError(f"Skill manifest not found for skill={skill_name!r} under skill roots")
+    mf = _probe_skill(skill_name, project_root, environ=environ)
+    if mf is not None:
+        return mf
+    try:
+        return _get_index(project_root, environ=environ)[skill_name]
+    except KeyError:
+        raise FileNotFoundError(f"Skill manifest not found for skill={skill_name!r} under skill roots") from None
 
 
 def validate_skill(skill_name: str, project_root: Path, *, environ: dict[str, str] = os.environ) -> None:
@@ -108,9 +342,10 @@ def validate_skill(skill_name: str, project_root: Path, *, environ: dict[str, st
     add_sys_path(mf.project_root)
 
     module_name = f"skills.{mf.name}.{mod_rel}"
-    mod = __import__(module_name, fromlist=[fn])
-    if not hasattr(mod, fn):
+    mod = import_module(module_name)
+    entry = getattr(mod, fn, None)
+    if entry is None:
         raise AttributeError(f"Missing entry function {fn!r} in {module_name}")
-    if not callable(getattr(mod, fn)):
+    if not callable(entry):
         raise TypeError(f"Entry {module_name}:{fn} is not callable")
 
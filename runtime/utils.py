@@ -1,19 +1,44 @@
 from __future__ import annotations
 
+import functools
 import importlib
 import json
 import os
 import sys
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
 from types import ModuleType
 from typing import Any, Optional
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
 
 def utc_now_compact() -> str:
-    # Example: 20260210T153045Z
-    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    # Example: 20260210T153045Z (built from gmtime fields; no tz-aware datetime or strftime)
+    t = time.gmtime()
+    return f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}T{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}Z"
+
+
+# (epoch_ms, formatted) for the most recent utc_now_iso_ms() call; one tuple so readers never
+# see a mismatched pair when several threads log at once.
+_ISO_MS_CACHE: tuple[int, str] = (-1, "")
+
+
+def utc_now_iso_ms() -> str:
+    # Example: 2026-02-10T15:30:45.123Z (memoized per millisecond for bursty event logging)
+    global _ISO_MS_CACHE
+    ms = time.time_ns() // 1_000_000
+    cached_ms, cached = _ISO_MS_CACHE
+    if ms == cached_ms:
+        return cached
+    sec, rem = divmod(ms, 1000)
+    ts = f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))}.{rem:03d}Z"
+    _ISO_MS_CACHE = (ms, ts)
+    return ts
 
 
 def ensure_dir(path: Path) -> Path:
@@ -27,7 +52,38 @@ def read_json(path: Path) -> Any:
 
 def write_json(path: Path, data: Any, *, indent: int = 2) -> None:
     ensure_dir(path.parent)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=indent) + "\n", encoding="utf-8")
+    path.write_bytes(dumps_json_pretty(data, indent=indent))
+
+
+def dumps_jsonl(obj: Any) -> bytes:
+    """
+    Serialize one JSONL record to UTF-8 bytes (including the trailing newline).
+
+    Uses orjson when installed; falls back to stdlib json for values orjson rejects
+    (e.g. ints beyond 64 bits) or when it is not available.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def dumps_json_pretty(obj: Any, *, indent: int = 2) -> bytes:
+    """
+    Serialize an indented JSON document to UTF-8 bytes (including the trailing newline).
+
+    orjson only supports two-space indentation, so other widths go through stdlib json.
+    """
+    if orjson is not None and indent == 2:
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            pass
+    return (json.dumps(obj, ensure_ascii=False, indent=indent) + "\n").encode("utf-8")
 
 
 def try_load_yaml(path: Path) -> dict[str, Any]:
@@ -49,8 +105,26 @@ def import_module(module_name: str) -> ModuleType:
     return importlib.import_module(module_name)
 
 
+@functools.lru_cache(maxsize=128)
+def _resolve_abs(p: str) -> str:
+    return str(Path(p).resolve())
+
+
+def resolved_str(path: Path | str) -> str:
+    """
+    `str(Path(path).resolve())`, memoized for absolute paths.
+
+    resolve() stats every path component; the same roots are resolved on every run. Relative
+    paths depend on the CWD, so they are resolved fresh each time.
+    """
+    p = os.fspath(path)
+    if os.path.isabs(p):
+        return _resolve_abs(p)
+    return str(Path(p).resolve())
+
+
 def add_sys_path(path: Path) -> None:
-    p = str(path.resolve())
+    p = resolved_str(path)
     if p not in sys.path:
         sys.path.insert(0, p)
 
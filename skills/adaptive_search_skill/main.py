@@ -1,35 +1,10 @@
 from __future__ import annotations
 
-import json
-import re
 from pathlib import Path
 from typing import Any
 
-from skills.rpa_ts_skill.common.runner import run_rpaskill_ts
-
-
-def _collect_screenshots_from_trace(trace_path: Path) -> list[str]:
-    shots: list[str] = []
-    seen = set()
-    if not trace_path.exists():
-        return shots
-    for line in trace_path.read_text(encoding="utf-8", errors="replace").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            rec = json.loads(line)
-        except Exception:
-            continue
-        sp = rec.get("screenshotPath")
-        if not sp:
-            continue
-        sp = str(sp)
-        if sp in seen:
-            continue
-        seen.add(sp)
-        shots.append(sp)
-    return shots
+from skills.rpa_ts_skill.common.fsutil import sanitize_profile_name
+from skills.rpa_ts_skill.common.runner import collect_screenshots_from_trace, run_rpaskill_ts
 
 
 def run(ctx) -> dict[str, Any]:
@@ -49,8 +24,8 @@ def run(ctx) -> dict[str, Any]:
     profile_account_raw = str(cfg.get("profileAccount") or cfg.get("account") or cfg.get("profile") or "default").strip()
 
     # Keep directory names filesystem-friendly and stable across shells/quoting.
-    profile_site = re.sub(r"[^A-Za-z0-9._-]+", "_", profile_site_raw) or "adaptive_search"
-    profile_account = re.sub(r"[^A-Za-z0-9._-]+", "_", profile_account_raw) or "default"
+    profile_site = sanitize_profile_name(profile_site_raw) or "adaptive_search"
+    profile_account = sanitize_profile_name(profile_account_raw) or "default"
 
     # Convention: browser_profiles/<site>/<account>/
     profile_dir = (ctx.platform.deps_dir / "browser_profiles" / profile_site / profile_account).resolve()
@@ -70,6 +45,7 @@ def run(ctx) -> dict[str, Any]:
     cfg.setdefault("openScreenshotFullPage", True)
     cfg.setdefault("tracePath", str((ctx.outputs_dir / "rpa_trace.jsonl").resolve()))
 
-    out = run_rpaskill_ts(ctx, action="adaptiveSearch", payload=dict(cfg))
-    screenshots = _collect_screenshots_from_trace(Path(cfg["tracePath"]))
+    # cfg is already this run's private copy (run_rpaskill_ts does not mutate the payload).
+    out = run_rpaskill_ts(ctx, action="adaptiveSearch", payload=cfg)
+    screenshots = collect_screenshots_from_trace(Path(cfg["tracePath"]))
     return {"status": "ok", "rpaskill_ts": out, "screenshots": screenshots, "tracePath": cfg["tracePath"]}
@@ -1,182 +1,244 @@
 from __future__ import annotations
 
+import json
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any
 from urllib.parse import quote
 
+from skills.rpa_ts_skill.common.fsutil import cached_exists, ensure_dir, mark_exists, sanitize_profile_name
 from skills.rpa_ts_skill.common.runner import run_rpaskill_ts
 
 
-_PRICE_RE = re.compile(r"([0-9]{1,8}(?:\\.[0-9]{1,2})?)")
+_PRICE_RE = re.compile(r"([0-9]{1,8}(?:\.[0-9]{1,2})?)")
+# Currency signs and thousands separators, dropped in one translate() pass.
+_PRICE_STRIP = str.maketrans("", "", "￥¥,")
+# Keywords repeat across sites and sweep iterations; percent-encode each one once.
+_quote = lru_cache(maxsize=256)(quote)
 
 
 def _to_number(price_text: object) -> float | None:
     if price_text is None:
         return None
-    s = str(price_text)
-    # Normalize common currency chars/spaces.
-    s = s.replace("￥", "").replace("¥", "").replace(",", "").strip()
+    if isinstance(price_text, (int, float)) and not isinstance(price_text, bool):
+        # Already numeric (some extractors return parsed prices): skip the text pipeline.
+        v = float(price_text)
+        return v if v > 0 else None
+    # Normalize common currency chars; surrounding whitespace does not affect search().
+    s = str(price_text).translate(_PRICE_STRIP)
     m = _PRICE_RE.search(s)
     if not m:
         return None
     try:
         v = float(m.group(1))
-        return v if v > 0 else None
-    except Exception:
+    except ValueError:
         return None
+    return v if v > 0 else None
+
+
+def _iter_records(obj: Any) -> list[dict[str, Any]]:
+    # Node runner output is {"ok":true,"action":...,"response":[...]}; a bare list is accepted too.
+    rows = obj.get("response") if isinstance(obj, dict) else obj
+    if not isinstance(rows, list):
+        return []
+    # Decoded JSON objects are always plain dicts, so an exact type check suffices.
+    return [r for r in rows if type(r) is dict]
 
 
-def _iter_records(obj: Any) -> Iterable[dict[str, Any]]:
-    if isinstance(obj, dict) and isinstance(obj.get("response"), list):
-        # Node runner output: {"ok":true,"action":...,"response":[...]}
-        for it in obj["response"]:
-            if isinstance(it, dict):
-                yield it
-        return
-    if isinstance(obj, list):
-        for it in obj:
-            if isinstance(it, dict):
-                yield it
-        return
-
-
-def _pick_cheapest(rows: list[dict[str, Any]]) -> dict[str, Any] | None:
-    best: dict[str, Any] | None = None
-    best_price: float | None = None
-    for r in rows:
-        p = _to_number(r.get("price"))
-        if p is None:
-            continue
-        if best is None or (best_price is not None and p < best_price) or best_price is None:
-            best = r
-            best_price = p
-    if best is None:
+def _pick_cheapest(rows: list[tuple[str, dict[str, Any]]]) -> dict[str, Any] | None:
+    priced = [(p, site, r) for site, r in rows if (p := _to_number(r.get("price"))) is not None]
+    if not priced:
         return None
+    # min() keeps the first row among equal prices, same as a strict "<" scan.
+    best_price, site, best = min(priced, key=itemgetter(0))
     out = dict(best)
+    # Only the winner needs its source site spelled out; per_site already groups the rest.
+    out["site"] = site
     out["_priceNumber"] = best_price
     return out
 
 
+def _jd_payload(
+    cfg: dict[str, Any],
+    *,
+    keyword: str,
+    account: str,
+    limit_per_site: int,
+    common_browser: dict[str, Any],
+    common_control: dict[str, Any],
+    deps_dir: Path,
+    outs_dir: Path,
+) -> dict[str, Any]:
+    jd_search_url = f"https://search.jd.com/Search?keyword={_quote(keyword)}&enc=utf-8"
+    jd_profile_dir = deps_dir / "browser_profiles" / "jd" / account
+    ensure_dir(jd_profile_dir)
+    jd_storage_state = deps_dir / "storage_states" / "jd" / f"{account}.json"
+    ensure_dir(jd_storage_state.parent)
+
+    payload: dict[str, Any] = {
+        "searchUrl": jd_search_url,
+        "resultsWaitFor": "#J_goodsList .gl-item",
+        "waitForLoadState": "domcontentloaded",
+        "limit": limit_per_site,
+        "screenshotPath": str(outs_dir / "screenshots" / "jd_search.png"),
+        "capturePrefix": str(outs_dir / "captures" / "jd_search"),
+        "list": {
+            "itemSelector": "#J_goodsList .gl-item",
+            "fields": {
+                "title": {"selector": ".p-name em", "attr": "text"},
+                "price": {"selector": ".p-price i", "attr": "text"},
+                "link": {"selector": ".p-name a", "attr": "href"},
+            },
+        },
+        "userDataDir": str(jd_profile_dir),
+        "saveStorageStatePath": str(jd_storage_state),
+        "tracePath": str(outs_dir / "jd_rpa_trace.jsonl"),
+        "traceAppend": False,
+        **common_browser,
+        **common_control,
+        "pauseMessage": cfg.get("jd_pauseMessage")
+        or "京东可能会出现『访问频繁/安全验证/登录』。请在浏览器里处理后保持页面不关闭，脚本会继续抓取商品列表。",
+    }
+    if cached_exists(jd_storage_state):
+        payload["storageStatePath"] = str(jd_storage_state)
+
+    return payload
+
+
+def _pdd_payload(
+    cfg: dict[str, Any],
+    *,
+    keyword: str,
+    account: str,
+    limit_per_site: int,
+    common_browser: dict[str, Any],
+    common_control: dict[str, Any],
+    deps_dir: Path,
+    outs_dir: Path,
+) -> dict[str, Any]:
+    pdd_search_url = f"https://mobile.yangkeduo.com/search_result.html?search_key={_quote(keyword)}"
+    pdd_profile_dir = deps_dir / "browser_profiles" / "pdd" / account
+    ensure_dir(pdd_profile_dir)
+    pdd_storage_state = deps_dir / "storage_states" / "pdd" / f"{account}.json"
+    ensure_dir(pdd_storage_state.parent)
+
+    payload: dict[str, Any] = {
+        "searchUrl": pdd_search_url,
+        "resultsWaitFor": str(cfg.get("pdd_resultsWaitFor") or r"text=/[￥¥]\s*\d/"),
+        "waitForLoadState": "domcontentloaded",
+        "limit": limit_per_site,
+        "scrollSteps": int(cfg.get("pdd_scrollSteps") or 6),
+        "scrollDelayMs": int(cfg.get("pdd_scrollDelayMs") or 1200),
+        "screenshotPath": str(outs_dir / "screenshots" / "pdd_search.png"),
+        "capturePrefix": str(outs_dir / "captures" / "pdd_search"),
+        "userDataDir": str(pdd_profile_dir),
+        "saveStorageStatePath": str(pdd_storage_state),
+        "tracePath": str(outs_dir / "pdd_rpa_trace.jsonl"),
+        "traceAppend": False,
+        **common_browser,
+        **common_control,
+        "pauseMessage": cfg.get("pdd_pauseMessage")
+        or "拼多多可能会出现验证码/安全验证/登录。请在浏览器里完成后保持页面不关闭，脚本会继续抓取价格列表。",
+    }
+    if cached_exists(pdd_storage_state):
+        payload["storageStatePath"] = str(pdd_storage_state)
+
+    return payload
+
+
+def _coerce_common(cfg: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Browser launch options and human/pace/capture controls shared by every site payload."""
+    g = cfg.get
+    browser: dict[str, Any] = {
+        "headless": bool(g("headless", False)),
+        "channel": g("channel") or "msedge",
+        "slowMo": int(g("slowMo") or 0),
+        "args": g("args") or [],
+        "viewport": g("viewport", None),
+    }
+
+    control: dict[str, Any] = {
+        "pauseForHuman": bool(g("pauseForHuman", True)),
+        "pauseForHumanMode": str(g("pauseForHumanMode") or "auto"),
+        "pauseTimeoutMs": int(g("pauseTimeoutMs") or 0),
+        "stepDelayMs": int(g("stepDelayMs") or 900),
+        "stepDelayJitterMs": int(g("stepDelayJitterMs") or 700),
+        "captureFullPage": bool(g("captureFullPage", True)),
+        "includeHtml": bool(g("includeHtml", True)),
+        "includeElements": bool(g("includeElements", True)),
+        "maxElements": int(g("maxElements") or 350),
+        "captureOnBlocked": bool(g("captureOnBlocked", True)),
+        "captureOnDone": bool(g("captureOnDone", True)),
+        "detectBlockers": bool(g("detectBlockers", True)),
+        "resultsTimeout": int(g("resultsTimeout") or 120000),
+        "afterSearchDelayMs": int(g("afterSearchDelayMs") or 3000),
+    }
+    return browser, control
+
+
+_SITE_ACTIONS = {"jd": "searchOnSite", "pdd": "searchProductsHeuristic"}
+_SITE_PAYLOADS = {"jd": _jd_payload, "pdd": _pdd_payload}
+
+
+def _site_result(payload: dict[str, Any], out: Any) -> dict[str, Any]:
+    return {"searchUrl": payload["searchUrl"], "rows": _iter_records(out)}
+
+
+def _run_site(ctx, name: str, payload: dict[str, Any]) -> dict[str, Any]:
+    out = run_rpaskill_ts(ctx, action=_SITE_ACTIONS[name], payload=payload)
+    mark_exists(out.get("savedStorageStatePath"))
+    return _site_result(payload, out)
+
+
 def run(ctx) -> dict[str, Any]:
     cfg = ctx.config or {}
     keyword = str(cfg.get("keyword") or "苹果15手机").strip()
     limit_per_site = int(cfg.get("limit_per_site") or 30)
     account = str(cfg.get("profileAccount") or cfg.get("account") or cfg.get("profile") or "default").strip()
-    account = re.sub(r"[^A-Za-z0-9._-]+", "_", account) or "default"
-
-    common_browser: dict[str, Any] = {
-        "headless": bool(cfg.get("headless", False)),
-        "channel": cfg.get("channel") or "msedge",
-        "slowMo": int(cfg.get("slowMo") or 0),
-        "args": cfg.get("args") or [],
-        "viewport": cfg.get("viewport", None),
-    }
+    account = sanitize_profile_name(account) or "default"
+
+    common_browser, common_control = _coerce_common(cfg)
 
-    common_control: dict[str, Any] = {
-        "pauseForHuman": bool(cfg.get("pauseForHuman", True)),
-        "pauseForHumanMode": str(cfg.get("pauseForHumanMode") or "auto"),
-        "pauseTimeoutMs": int(cfg.get("pauseTimeoutMs") or 0),
-        "stepDelayMs": int(cfg.get("stepDelayMs") or 900),
-        "stepDelayJitterMs": int(cfg.get("stepDelayJitterMs") or 700),
-        "captureFullPage": bool(cfg.get("captureFullPage", True)),
-        "includeHtml": bool(cfg.get("includeHtml", True)),
-        "includeElements": bool(cfg.get("includeElements", True)),
-        "maxElements": int(cfg.get("maxElements") or 350),
-        "captureOnBlocked": bool(cfg.get("captureOnBlocked", True)),
-        "captureOnDone": bool(cfg.get("captureOnDone", True)),
-        "detectBlockers": bool(cfg.get("detectBlockers", True)),
-        "resultsTimeout": int(cfg.get("resultsTimeout") or 120000),
-        "afterSearchDelayMs": int(cfg.get("afterSearchDelayMs") or 3000),
+    site_kwargs = {
+        "keyword": keyword,
+        "account": account,
+        "limit_per_site": limit_per_site,
+        "common_browser": common_browser,
+        "common_control": common_control,
+        # Resolved once here; per-site paths are built below them without further resolve() calls.
+        "deps_dir": ctx.platform.deps_dir.resolve(),
+        "outs_dir": Path(ctx.outputs_dir).resolve(),
     }
+    sites = [name for name in ("jd", "pdd") if bool(cfg.get(f"enable_{name}", True))]
+    payloads = {name: _SITE_PAYLOADS[name](cfg, **site_kwargs) for name in sites}
 
-    all_rows: list[dict[str, Any]] = []
-    per_site: dict[str, Any] = {}
+    # Each site is a separate Node/Playwright process, so the two scrapes can overlap.
+    # "enter" mode waits on this console's stdin, which only one site can own at a time.
+    parallel = (
+        len(sites) > 1
+        and bool(cfg.get("parallel_sites", True))
+        and not (common_control["pauseForHuman"] and common_control["pauseForHumanMode"] == "enter")
+    )
+    site_results: dict[str, dict[str, Any]] = {}
+    if parallel:
+        with ThreadPoolExecutor(max_workers=len(sites)) as ex:
+            futs = {ex.submit(_run_site, ctx, name, payloads[name]): name for name in sites}
+            for fut in as_completed(futs):
+                site_results[futs[fut]] = fut.result()
+    else:
+        for name in sites:
+            site_results[name] = _run_site(ctx, name, payloads[name])
 
-    # JD (new)
-    if bool(cfg.get("enable_jd", True)):
-        jd_search_url = f"https://search.jd.com/Search?keyword={quote(keyword)}&enc=utf-8"
-        jd_profile_dir = (ctx.platform.deps_dir / "browser_profiles" / "jd" / account).resolve()
-        jd_profile_dir.mkdir(parents=True, exist_ok=True)
-        jd_storage_state = (ctx.platform.deps_dir / "storage_states" / "jd" / f"{account}.json").resolve()
-        jd_storage_state.parent.mkdir(parents=True, exist_ok=True)
-
-        payload: dict[str, Any] = {
-            "searchUrl": jd_search_url,
-            "resultsWaitFor": "#J_goodsList .gl-item",
-            "waitForLoadState": "domcontentloaded",
-            "limit": limit_per_site,
-            "screenshotPath": str((ctx.outputs_dir / "screenshots" / "jd_search.png").resolve()),
-            "capturePrefix": str((ctx.outputs_dir / "captures" / "jd_search").resolve()),
-            "list": {
-                "itemSelector": "#J_goodsList .gl-item",
-                "fields": {
-                    "title": {"selector": ".p-name em", "attr": "text"},
-                    "price": {"selector": ".p-price i", "attr": "text"},
-                    "link": {"selector": ".p-name a", "attr": "href"},
-                },
-            },
-            "userDataDir": str(jd_profile_dir),
-            "storageStatePath": str(jd_storage_state) if jd_storage_state.exists() else None,
-            "saveStorageStatePath": str(jd_storage_state),
-            "tracePath": str((ctx.outputs_dir / "jd_rpa_trace.jsonl").resolve()),
-            "traceAppend": False,
-            **common_browser,
-            **common_control,
-            "pauseMessage": cfg.get("jd_pauseMessage")
-            or "京东可能会出现『访问频繁/安全验证/登录』。请在浏览器里处理后保持页面不关闭，脚本会继续抓取商品列表。",
-        }
-        if payload.get("storageStatePath") is None:
-            payload.pop("storageStatePath", None)
-
-        jd_out = run_rpaskill_ts(ctx, action="searchOnSite", payload=payload)
-        jd_rows = []
-        for r in _iter_records(jd_out):
-            rec = dict(r)
-            rec["site"] = "jd"
-            jd_rows.append(rec)
-        per_site["jd"] = {"searchUrl": jd_search_url, "rows": jd_rows}
-        all_rows.extend(jd_rows)
-
-    # PDD (new)
-    if bool(cfg.get("enable_pdd", True)):
-        pdd_search_url = f"https://mobile.yangkeduo.com/search_result.html?search_key={quote(keyword)}"
-        pdd_profile_dir = (ctx.platform.deps_dir / "browser_profiles" / "pdd" / account).resolve()
-        pdd_profile_dir.mkdir(parents=True, exist_ok=True)
-        pdd_storage_state = (ctx.platform.deps_dir / "storage_states" / "pdd" / f"{account}.json").resolve()
-        pdd_storage_state.parent.mkdir(parents=True, exist_ok=True)
-
-        payload = {
-            "searchUrl": pdd_search_url,
-            "resultsWaitFor": str(cfg.get("pdd_resultsWaitFor") or r"text=/[￥¥]\s*\d/"),
-            "waitForLoadState": "domcontentloaded",
-            "limit": limit_per_site,
-            "scrollSteps": int(cfg.get("pdd_scrollSteps") or 6),
-            "scrollDelayMs": int(cfg.get("pdd_scrollDelayMs") or 1200),
-            "screenshotPath": str((ctx.outputs_dir / "screenshots" / "pdd_search.png").resolve()),
-            "capturePrefix": str((ctx.outputs_dir / "captures" / "pdd_search").resolve()),
-            "userDataDir": str(pdd_profile_dir),
-            "storageStatePath": str(pdd_storage_state) if pdd_storage_state.exists() else None,
-            "saveStorageStatePath": str(pdd_storage_state),
-            "tracePath": str((ctx.outputs_dir / "pdd_rpa_trace.jsonl").resolve()),
-            "traceAppend": False,
-            **common_browser,
-            **common_control,
-            "pauseMessage": cfg.get("pdd_pauseMessage")
-            or "拼多多可能会出现验证码/安全验证/登录。请在浏览器里完成后保持页面不关闭，脚本会继续抓取价格列表。",
-        }
-        if payload.get("storageStatePath") is None:
-            payload.pop("storageStatePath", None)
-
-        pdd_out = run_rpaskill_ts(ctx, action="searchProductsHeuristic", payload=payload)
-        pdd_rows = []
-        for r in _iter_records(pdd_out):
-            rec = dict(r)
-            rec["site"] = "pdd"
-            pdd_rows.append(rec)
-        per_site["pdd"] = {"searchUrl": pdd_search_url, "rows": pdd_rows}
-        all_rows.extend(pdd_rows)
+    # Merge in a fixed site order regardless of which scrape finished first.
+    all_rows: list[tuple[str, dict[str, Any]]] = []
+    per_site: dict[str, Any] = {}
+    for name in sites:
+        per_site[name] = site_results[name]
+        all_rows.extend((name, r) for r in site_results[name]["rows"])
 
     cheapest = _pick_cheapest(all_rows)
 
@@ -192,18 +254,14 @@ def run(ctx) -> dict[str, Any]:
     # Stable pointer
     try:
         marker_path = (ctx.platform.root_dir / "outputs" / "iphone15_best_price_skill" / "_latest.json").resolve()
-        marker_path.parent.mkdir(parents=True, exist_ok=True)
-        marker_path.write_text(
-            (
-                "{\n"
-                f'  "ts": "{datetime.now(timezone.utc).isoformat().replace("+00:00","Z")}",\n'
-                f'  "run_id": "{ctx.run_id}",\n'
-                f'  "agent_id": "{ctx.agent_id}",\n'
-                f'  "outputs_dir": "{str(Path(ctx.outputs_dir).resolve()).replace("\\\\","\\\\\\\\")}"\n'
-                "}\n"
-            ),
-            encoding="utf-8",
-        )
+        ensure_dir(marker_path.parent)
+        marker = {
+            "ts": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "run_id": str(ctx.run_id),
+            "agent_id": str(ctx.agent_id),
+            "outputs_dir": str(Path(ctx.outputs_dir).resolve()),
+        }
+        marker_path.write_text(json.dumps(marker, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
     except Exception:
         pass
 
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import json
-import re
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from urllib.parse import quote
 
+from skills.rpa_ts_skill.common.fsutil import cached_exists, ensure_dir, mark_exists, sanitize_profile_name
 from skills.rpa_ts_skill.common.runner import run_rpaskill_ts
 
 
@@ -14,19 +14,22 @@ def run(ctx) -> dict[str, Any]:
     cfg = ctx.config or {}
     keyword = str(cfg.get("keyword") or "空调").strip()
     limit = int(cfg.get("limit") or 12)
+    # Resolve the base dirs once; paths built below them need no further resolve() calls.
+    deps_dir = ctx.platform.deps_dir.resolve()
+    outs_dir = Path(ctx.outputs_dir).resolve()
 
     search_url = f"https://search.jd.com/Search?keyword={quote(keyword)}&enc=utf-8"
 
     # Prefer a persistent user profile directory for JD (more "browser-like").
     account_raw = str(cfg.get("profileAccount") or cfg.get("account") or cfg.get("profile") or "default").strip()
-    account = re.sub(r"[^A-Za-z0-9._-]+", "_", account_raw) or "default"
-    profile_dir = (ctx.platform.deps_dir / "browser_profiles" / "jd" / account).resolve()
-    profile_dir.mkdir(parents=True, exist_ok=True)
+    account = sanitize_profile_name(account_raw) or "default"
+    profile_dir = deps_dir / "browser_profiles" / "jd" / account
+    ensure_dir(profile_dir)
 
     # Persist login snapshot across runs via Playwright storageState.
     # NOTE: this is NOT your system Edge profile; it is a Playwright storageState JSON snapshot.
-    storage_state_path = (ctx.platform.deps_dir / "storage_states" / "jd" / f"{account}.json").resolve()
-    storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+    storage_state_path = deps_dir / "storage_states" / "jd" / f"{account}.json"
+    ensure_dir(storage_state_path.parent)
 
     payload: dict[str, Any] = {
         # action wiring (Node)
@@ -36,9 +39,9 @@ def run(ctx) -> dict[str, Any]:
         "resultsTimeout": int(cfg.get("resultsTimeout") or 60000),
         "afterSearchDelayMs": int(cfg.get("afterSearchDelayMs") or 2500),
         "limit": limit,
-        "screenshotPath": str((ctx.outputs_dir / "screenshots" / "jd_search.png").resolve()),
+        "screenshotPath": str(outs_dir / "screenshots" / "jd_search.png"),
         # Optional: capture page artifacts (screenshot + html + elements) for AI debugging / replay.
-        "capturePrefix": str((ctx.outputs_dir / "captures" / "jd_search").resolve()),
+        "capturePrefix": str(outs_dir / "captures" / "jd_search"),
         "captureFullPage": bool(cfg.get("captureFullPage", True)),
         "includeHtml": bool(cfg.get("includeHtml", True)),
         "includeElements": bool(cfg.get("includeElements", True)),
@@ -64,8 +67,7 @@ def run(ctx) -> dict[str, Any]:
         "args": cfg.get("args") or [],
         "viewport": cfg.get("viewport", None),
         "userDataDir": str(profile_dir),
-        # Load existing session if present, and always save updated state after a successful run.
-        "storageStatePath": str(storage_state_path) if storage_state_path.exists() else None,
+        # Always save updated state after a successful run.
         "saveStorageStatePath": str(storage_state_path),
         # Human-in-the-loop
         "pauseForHuman": bool(cfg.get("pauseForHuman", True)),
@@ -75,20 +77,21 @@ def run(ctx) -> dict[str, Any]:
         "pauseMessage": cfg.get("pauseMessage")
         or "京东可能会出现安全验证/登录。请在浏览器里完成验证后，保持页面不关闭；skill 会自动检测到商品列表出现后继续抓取价格...",
         # Trace
-        "tracePath": str((ctx.outputs_dir / "rpa_trace.jsonl").resolve()),
+        "tracePath": str(outs_dir / "rpa_trace.jsonl"),
         "traceAppend": False,
     }
 
-    # Avoid sending null keys that confuse some JS code paths.
-    if payload.get("storageStatePath") is None:
-        payload.pop("storageStatePath", None)
+    # Load the existing session only if present (null keys confuse some JS code paths).
+    if cached_exists(storage_state_path):
+        payload["storageStatePath"] = str(storage_state_path)
 
     out = run_rpaskill_ts(ctx, action="searchOnSite", payload=payload)
+    mark_exists(out.get("savedStorageStatePath"))
 
     # Write a stable pointer so the agent can locate artifacts without the user pasting paths/screenshots.
     try:
         skill_root = ctx.platform.root_dir / "outputs" / "jd_aircon_price_skill"
-        skill_root.mkdir(parents=True, exist_ok=True)
+        ensure_dir(skill_root)
         marker_path = skill_root / "_latest.json"
         marker = {
             "ts": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
@@ -97,10 +100,10 @@ def run(ctx) -> dict[str, Any]:
             "agent_id": str(ctx.agent_id),
             "action": "searchOnSite",
             "paths": {
-                "outputs_dir": str(Path(ctx.outputs_dir).resolve()),
+                "outputs_dir": str(outs_dir),
                 "shared_dir": str(Path(ctx.shared_dir).resolve()),
-                "captures_dir": str((ctx.outputs_dir / "captures").resolve()),
-                "screenshots_dir": str((ctx.outputs_dir / "screenshots").resolve()),
+                "captures_dir": str(outs_dir / "captures"),
+                "screenshots_dir": str(outs_dir / "screenshots"),
                 "trace_path": str(payload.get("tracePath") or ""),
                 "capture_prefix": str(payload.get("capturePrefix") or ""),
             },
@@ -117,24 +120,26 @@ def run(ctx) -> dict[str, Any]:
     except Exception:
         pass
 
-    # Index the session state if it was saved.
-    if storage_state_path.exists():
-        ctx.artifacts.record_path(
-            storage_state_path,
-            scope="agent",
-            kind="storage_state",
-            data={"site": "jd.com", "account": account},
-        )
-        try:
-            ctx.events.emit(
-                "session.saved",
-                message="JD storageState saved (for future runs)",
+    # One index append + flush for the artifacts recorded at the end of the run.
+    with ctx.artifacts.batch():
+        # Index the session state if it was saved.
+        if storage_state_path.exists():
+            ctx.artifacts.record_path(
+                storage_state_path,
                 scope="agent",
-                data={"path": str(storage_state_path)},
+                kind="storage_state",
+                data={"site": "jd.com", "account": account},
             )
-        except Exception:
-            pass
+            try:
+                ctx.events.emit(
+                    "session.saved",
+                    message="JD storageState saved (for future runs)",
+                    scope="agent",
+                    data={"path": str(storage_state_path)},
+                )
+            except Exception:
+                pass
 
-    # Persist a friendly, stable artifact for later AI querying.
-    ctx.artifacts.write_json("jd_aircon_prices.json", out, scope="agent")
+        # Persist a friendly, stable artifact for later AI querying.
+        ctx.artifacts.write_json("jd_aircon_prices.json", out, scope="agent")
     return {"status": "ok", "keyword": keyword, "searchUrl": search_url, "result": out}
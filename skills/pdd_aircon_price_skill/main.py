@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import json
-import re
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from urllib.parse import quote
 
+from skills.rpa_ts_skill.common.fsutil import cached_exists, ensure_dir, mark_exists, sanitize_profile_name
 from skills.rpa_ts_skill.common.runner import run_rpaskill_ts
 
 
@@ -14,19 +14,22 @@ def run(ctx) -> dict[str, Any]:
     cfg = ctx.config or {}
     keyword = str(cfg.get("keyword") or "空调").strip()
     limit = int(cfg.get("limit") or 12)
+    # Resolve the base dirs once; paths built below them need no further resolve() calls.
+    deps_dir = ctx.platform.deps_dir.resolve()
+    outs_dir = Path(ctx.outputs_dir).resolve()
 
     # PDD H5 search (often triggers captcha; requires human-in-loop).
     search_url = f"https://mobile.yangkeduo.com/search_result.html?search_key={quote(keyword)}"
 
     # Prefer a persistent Playwright userDataDir profile for PDD (more "browser-like").
     account_raw = str(cfg.get("profileAccount") or cfg.get("account") or cfg.get("profile") or "default").strip()
-    account = re.sub(r"[^A-Za-z0-9._-]+", "_", account_raw) or "default"
-    profile_dir = (ctx.platform.deps_dir / "browser_profiles" / "pdd" / account).resolve()
-    profile_dir.mkdir(parents=True, exist_ok=True)
+    account = sanitize_profile_name(account_raw) or "default"
+    profile_dir = deps_dir / "browser_profiles" / "pdd" / account
+    ensure_dir(profile_dir)
 
     # Persist a storageState snapshot too (useful for backup/export; userDataDir is the main reuse mechanism).
-    storage_state_path = (ctx.platform.deps_dir / "storage_states" / "pdd" / f"{account}.json").resolve()
-    storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+    storage_state_path = deps_dir / "storage_states" / "pdd" / f"{account}.json"
+    ensure_dir(storage_state_path.parent)
 
     payload: dict[str, Any] = {
         # Action wiring (Node)
@@ -39,9 +42,9 @@ def run(ctx) -> dict[str, Any]:
         "limit": limit,
         "scrollSteps": int(cfg.get("scrollSteps") or 4),
         "scrollDelayMs": int(cfg.get("scrollDelayMs") or 900),
-        "screenshotPath": str((ctx.outputs_dir / "screenshots" / "pdd_search.png").resolve()),
+        "screenshotPath": str(outs_dir / "screenshots" / "pdd_search.png"),
         # Optional: capture page artifacts (screenshot + html + elements) for AI debugging / replay.
-        "capturePrefix": str((ctx.outputs_dir / "captures" / "pdd_search").resolve()),
+        "capturePrefix": str(outs_dir / "captures" / "pdd_search"),
         "captureFullPage": bool(cfg.get("captureFullPage", True)),
         "includeHtml": bool(cfg.get("includeHtml", True)),
         "includeElements": bool(cfg.get("includeElements", True)),
@@ -60,7 +63,7 @@ def run(ctx) -> dict[str, Any]:
         "pauseMessage": cfg.get("pauseMessage")
         or "拼多多可能会出现验证码/安全验证。请在弹出的浏览器里完成验证/登录后，保持页面不关闭；脚本会在检测到价格内容出现后继续抓取。",
         # Trace
-        "tracePath": str((ctx.outputs_dir / "rpa_trace.jsonl").resolve()),
+        "tracePath": str(outs_dir / "rpa_trace.jsonl"),
         "traceAppend": False,
         # Browser
         "headless": bool(cfg.get("headless", False)),
@@ -69,19 +72,19 @@ def run(ctx) -> dict[str, Any]:
         "args": cfg.get("args") or [],
         "viewport": cfg.get("viewport", None),
         "userDataDir": str(profile_dir),
-        "storageStatePath": str(storage_state_path) if storage_state_path.exists() else None,
         "saveStorageStatePath": str(storage_state_path),
     }
 
-    if payload.get("storageStatePath") is None:
-        payload.pop("storageStatePath", None)
+    if cached_exists(storage_state_path):
+        payload["storageStatePath"] = str(storage_state_path)
 
     out = run_rpaskill_ts(ctx, action="searchProductsHeuristic", payload=payload)
+    mark_exists(out.get("savedStorageStatePath"))
 
     # Write a stable pointer so the agent can locate artifacts without the user pasting paths/screenshots.
     try:
         skill_root = ctx.platform.root_dir / "outputs" / "pdd_aircon_price_skill"
-        skill_root.mkdir(parents=True, exist_ok=True)
+        ensure_dir(skill_root)
         marker_path = skill_root / "_latest.json"
         marker = {
             "ts": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
@@ -90,10 +93,10 @@ def run(ctx) -> dict[str, Any]:
             "agent_id": str(ctx.agent_id),
             "action": "searchProductsHeuristic",
             "paths": {
-                "outputs_dir": str(Path(ctx.outputs_dir).resolve()),
+                "outputs_dir": str(outs_dir),
                 "shared_dir": str(Path(ctx.shared_dir).resolve()),
-                "captures_dir": str((ctx.outputs_dir / "captures").resolve()),
-                "screenshots_dir": str((ctx.outputs_dir / "screenshots").resolve()),
+                "captures_dir": str(outs_dir / "captures"),
+                "screenshots_dir": str(outs_dir / "screenshots"),
                 "trace_path": str(payload.get("tracePath") or ""),
                 "capture_prefix": str(payload.get("capturePrefix") or ""),
             },
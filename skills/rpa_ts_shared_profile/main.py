@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from skills.rpa_ts_skill.common.profile_defaults import apply_shared_defaults, run_with_config
+
 
 def run(ctx) -> dict[str, Any]:
     """
@@ -11,14 +13,7 @@ def run(ctx) -> dict[str, Any]:
 
     Implementation: delegate to the base rpa_ts_skill after injecting defaults.
     """
-    # Import lazily to keep import side-effects minimal.
-    from skills.rpa_ts_skill.main import run as base_run
-
-    cfg = dict(ctx.config or {})
-
-    # Default to session mode so the browser can stay open across multiple invocations.
-    if "session" not in cfg:
-        cfg["session"] = {"enabled": True, "command": "call", "userDataScope": "shared"}
+    cfg = apply_shared_defaults(dict(ctx.config or {}))
 
     # Default: fixed user profile dir (persistent across runs).
     # If profileSite/profileAccount is provided, we *do not* set userDataDir here,
@@ -29,12 +24,4 @@ def run(ctx) -> dict[str, Any]:
     ):
         cfg.setdefault("userDataDir", str((ctx.platform.deps_dir / "pw_profiles" / "rpa_ts_shared").resolve()))
 
-    # A "human-in-the-loop" RPA default should be visible unless explicitly overridden.
-    cfg.setdefault("headless", False)
-
-    old = ctx.config
-    try:
-        ctx.config = cfg
-        return base_run(ctx)
-    finally:
-        ctx.config = old
+    return run_with_config(ctx, cfg)
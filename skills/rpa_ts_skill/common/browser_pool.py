@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+def _pool_path(ctx) -> Path:
+    # Lives under runtime/deps/ (not the run dir) so later runs can find browsers started by earlier ones.
+    return ctx.platform.deps_dir / "rpa_ts_browser_pool.json"
+
+
+def _key(user_data_dir: Path) -> str:
+    # Windows paths are case-insensitive; normalize so one profile maps to one entry.
+    return os.path.normcase(str(Path(user_data_dir).resolve()))
+
+
+def _load(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save(path: Path, pool: dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-process temp name: concurrent runs must not write into each other's file.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(pool, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception:
+        # best-effort
+        return
+
+
+def get(ctx, user_data_dir: Path) -> dict[str, Any] | None:
+    """
+    Return the session state of a warm session server already running on `user_data_dir`, if any.
+
+    Callers must still health-check `baseUrl`: entries outlive the servers they point to
+    (the browser may have been closed by hand).
+    """
+    state = _load(_pool_path(ctx)).get(_key(user_data_dir))
+    return state if isinstance(state, dict) else None
+
+
+def put(ctx, user_data_dir: Path, state: dict[str, Any]) -> None:
+    path = _pool_path(ctx)
+    pool = _load(path)
+    pool[_key(user_data_dir)] = state
+    _save(path, pool)
+
+
+def discard(ctx, user_data_dir: Path) -> None:
+    path = _pool_path(ctx)
+    pool = _load(path)
+    if pool.pop(_key(user_data_dir), None) is not None:
+        _save(path, pool)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+
+# Directories already created (or found) by this process.
+_MKDIR_CACHE: set[str] = set()
+
+
+def ensure_dir(path: str | Path) -> Path:
+    """
+    mkdir -p, done at most once per directory per process.
+
+    Skills invoked repeatedly in one process (sweeps, tests) otherwise re-walk the same profile and
+    storage-state directories on every call. A directory removed after the first call is not
+    recreated; callers that delete directories should create them again with Path.mkdir.
+    """
+    key = str(path)
+    p = Path(path)
+    if key not in _MKDIR_CACHE:
+        p.mkdir(parents=True, exist_ok=True)
+        _MKDIR_CACHE.add(key)
+    return p
+
+
+# Files seen to exist (storage states are only ever rewritten, never removed, between runs).
+_EXISTS_CACHE: set[str] = set()
+
+
+def cached_exists(path: str | Path) -> bool:
+    """Path.exists() that remembers positive answers for the rest of the process."""
+    key = str(path)
+    if key in _EXISTS_CACHE:
+        return True
+    if os.path.exists(key):
+        _EXISTS_CACHE.add(key)
+        return True
+    return False
+
+
+def mark_exists(path: str | Path | None) -> None:
+    """Record a file this process just wrote (e.g. a runner's savedStorageStatePath)."""
+    if path:
+        _EXISTS_CACHE.add(str(path))
+
+
+# Characters allowed in profile folder names; everything else collapses to "_".
+_PROFILE_SAN_RE = re.compile(r"[^A-Za-z0-9._-]+")
+# Deletes every allowed character: a name that translates to "" needs no sanitizing.
+_PROFILE_ALLOWED_DELETE = str.maketrans(
+    "", "", "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-"
+)
+
+
+def sanitize_profile_name(raw: str) -> str:
+    """
+    Site/account name as used for browser_profiles/ and storage_states/ folders.
+
+    Runs of other characters become one "_"; callers supply their own default for "".
+    """
+    # Names are almost always already clean ("jd", "default"); str.translate is a plain C loop for
+    # ASCII input, so check that first and only run the regex when something needs replacing.
+    if not raw.translate(_PROFILE_ALLOWED_DELETE):
+        return raw
+    return _PROFILE_SAN_RE.sub("_", raw)
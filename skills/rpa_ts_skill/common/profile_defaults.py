@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any
+
+from skills.rpa_ts_skill.main import run as base_run
+
+
+def apply_shared_defaults(cfg: dict[str, Any]) -> dict[str, Any]:
+    """
+    Defaults shared by the profile variants (rpa_ts_shared_profile / rpa_ts_run_profile).
+
+    Only the profile directory differs between them; each variant sets that itself.
+    """
+    # Default to session mode so the browser can stay open across multiple invocations.
+    if "session" not in cfg:
+        cfg["session"] = {"enabled": True, "command": "call", "userDataScope": "shared"}
+
+    # A "human-in-the-loop" RPA default should be visible unless explicitly overridden.
+    cfg.setdefault("headless", False)
+    return cfg
+
+
+def run_with_config(ctx, cfg: dict[str, Any]) -> dict[str, Any]:
+    """Run the base rpa_ts_skill with `cfg` swapped in as ctx.config, restoring it afterwards."""
+    old = ctx.config
+    try:
+        ctx.config = cfg
+        return base_run(ctx)
+    finally:
+        ctx.config = old
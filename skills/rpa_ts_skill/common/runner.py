@@ -1,63 +1,166 @@
 from __future__ import annotations
 
+import functools
+import http.client
 import json
 import os
+import select
 import socket
 import shutil
 import subprocess
+import threading
 import time
-import urllib.error
-import urllib.request
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Mapping
+from urllib.parse import urlsplit
 
+from . import browser_pool
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
+
+@functools.lru_cache(maxsize=1)
 def _find_node() -> str:
+    # PATH does not change mid-run; a miss raises and is therefore not cached.
     node = shutil.which("node")
     if not node:
         raise RuntimeError("Node.js not found in PATH. Install Node to run TS-based skills.")
     return node
 
 
-def _iter_jsonl(path: Path) -> list[dict[str, Any]]:
-    out: list[dict[str, Any]] = []
+def _ensure_node_env(ctx) -> None:
+    """
+    Make sure Node children see PLAYWRIGHT_BROWSERS_PATH; they then inherit os.environ as-is.
+
+    An existing value always wins, so setting it once in-process is equivalent to patching a
+    fresh os.environ copy for every launch.
+    """
+    os.environ.setdefault("PLAYWRIGHT_BROWSERS_PATH", str(ctx.platform.playwright_browsers_dir))
+
+
+def _loads(data: bytes | str) -> Any:
+    # Both parsers accept UTF-8 bytes directly, so callers skip the decode step.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj: Any, *, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        try:
+            opt = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE if pretty else 0)
+            return orjson.dumps(obj, option=opt)
+        except TypeError:
+            # e.g. ints beyond 64 bits; stdlib handles those.
+            pass
+    if pretty:
+        return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _iter_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    # Streamed line by line: traces can run to many MB and are consumed in a single pass.
     try:
-        for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        fh = path.open("rb")
+    except Exception:
+        return
+    with fh:
+        for line in fh:
             line = line.strip()
             if not line:
                 continue
             try:
-                out.append(json.loads(line))
+                yield _loads(line)
             except Exception:
                 continue
-    except Exception:
-        return []
-    return out
+
+
+# Keep-alive connections to session servers, per thread (HTTPConnection is not thread-safe).
+_HTTP_LOCAL = threading.local()
+
+# Raised by request() when the server closed the connection before reading anything we sent:
+# the request never reached it, so it is safe to send again on a fresh connection.
+_UNSENT_ERRORS = (BrokenPipeError, ConnectionResetError)
+
+
+def _idle_conn_closed(conn: http.client.HTTPConnection) -> bool:
+    """True if an idle keep-alive socket is readable, i.e. the server has closed (or reset) it."""
+    sock = conn.sock
+    if sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _http_conn(host: str, port: int, timeout_s: float) -> tuple[http.client.HTTPConnection, bool]:
+    conns = getattr(_HTTP_LOCAL, "conns", None)
+    if conns is None:
+        conns = _HTTP_LOCAL.conns = {}
+    conn = conns.get((host, port))
+    if conn is not None and _idle_conn_closed(conn):
+        # Servers close idle keep-alive connections (Node: after 5s); find out before sending.
+        conn.close()
+        conn = None
+    reused = conn is not None
+    if conn is None:
+        conn = conns[(host, port)] = http.client.HTTPConnection(host, port, timeout=timeout_s)
+    conn.timeout = timeout_s
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout_s)
+    return conn, reused
+
+
+def _drop_http_conn(host: str, port: int) -> None:
+    conn = getattr(_HTTP_LOCAL, "conns", {}).pop((host, port), None)
+    if conn is not None:
+        conn.close()
 
 
 def _json_http(method: str, url: str, payload: dict[str, Any] | None = None, timeout_s: float = 5.0) -> dict[str, Any]:
     data = None
-    headers = {"accept": "application/json"}
+    headers = {"accept": "application/json", "connection": "keep-alive"}
     if payload is not None:
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        data = _dumps(payload)
         headers["content-type"] = "application/json; charset=utf-8"
 
-    req = urllib.request.Request(url, data=data, headers=headers, method=method.upper())
-    try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            raw = resp.read().decode("utf-8", errors="replace")
-            try:
-                return json.loads(raw)
-            except Exception:
-                return {"ok": False, "error": f"non-json response: {raw[:2000]}"}
-    except urllib.error.HTTPError as e:
+    parts = urlsplit(url)
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 80
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+    method = method.upper()
+    for attempt in (0, 1):
+        conn, reused = _http_conn(host, port, timeout_s)
+        sent = False
         try:
-            raw = e.read().decode("utf-8", errors="replace")
+            conn.request(method, path, body=data, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            raw = resp.read()
+        except Exception as e:
+            _drop_http_conn(host, port)
+            if sent:
+                # POST /call and /close are not idempotent: the server may have run the request
+                # before dropping the connection. Only GETs are sent again.
+                retry = method == "GET" and isinstance(e, (http.client.RemoteDisconnected, *_UNSENT_ERRORS))
+            else:
+                retry = isinstance(e, _UNSENT_ERRORS)
+            if retry and reused and attempt == 0:
+                continue
+            return {"ok": False, "error": str(e)}
+        if resp.will_close:
+            _drop_http_conn(host, port)
+        if resp.status >= 400:
+            return {"ok": False, "error": f"http {resp.status}: {raw[:2000].decode('utf-8', errors='replace')}"}
+        try:
+            return _loads(raw)
         except Exception:
-            raw = str(e)
-        return {"ok": False, "error": f"http {e.code}: {raw[:2000]}"}
-    except Exception as e:
-        return {"ok": False, "error": str(e)}
+            return {"ok": False, "error": f"non-json response: {raw[:2000].decode('utf-8', errors='replace')}"}
+    return {"ok": False, "error": "connection closed by server"}
 
 
 def _pick_free_port() -> int:
@@ -73,6 +176,59 @@ def _pick_free_port() -> int:
             pass
 
 
+# Startup probe backoff (seconds). Capped low: the server usually comes up within a few seconds and
+# every poll past that point is pure added latency.
+_PROBE_DELAY_MIN = 0.03
+_PROBE_DELAY_MAX = 0.25
+
+
+def _wait_port_open(host: str, port: int, deadline: float) -> bool:
+    """Poll a TCP connect (no HTTP) with backoff from 30ms up to 250ms until `deadline` (monotonic)."""
+    delay = _PROBE_DELAY_MIN
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(0.2)
+            if s.connect_ex((host, port)) == 0:
+                return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, _PROBE_DELAY_MAX)
+
+
+# Lowercased key substring -> artifact kind, checked in order after screenshot/html.
+_KIND_PATTERNS = (
+    ("a11y", "a11y"),
+    ("accessibility", "a11y"),
+    ("elements", "ui_map"),
+    ("uimap", "ui_map"),
+)
+_HTML_KEYS = frozenset({"htmlpath", "pagesourcepath"})
+
+
+@functools.lru_cache(maxsize=512)
+def _classify_key(key: str, *, loose_html: bool = False) -> tuple[bool, str | None]:
+    """
+    Classify a record key as (is_path_field, artifact_kind).
+
+    Path fields are "path" or "*Path". Trace records only treat htmlPath/pageSourcePath as HTML;
+    `loose_html` matches any key mentioning html/pagesource (session responses).
+    Keys repeat across every record of a trace, so results are memoized.
+    """
+    if key != "path" and not key.endswith("Path"):
+        return False, None
+    kl = key.lower()
+    if "screenshot" in kl:
+        return True, "screenshot"
+    if ("html" in kl or "pagesource" in kl) if loose_html else kl in _HTML_KEYS:
+        return True, "html"
+    for needle, kind in _KIND_PATTERNS:
+        if needle in kl:
+            return True, kind
+    return True, None
+
+
 def _session_state_path(ctx) -> Path:
     # Shared so multiple agents can reuse a single browser session.
     return ctx.shared_dir / "rpa_ts_session.json"
@@ -82,7 +238,7 @@ def _load_session_state(path: Path) -> dict[str, Any] | None:
     try:
         if not path.exists():
             return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        return _loads(path.read_bytes())
     except Exception:
         return None
 
@@ -94,13 +250,27 @@ def _save_session_state(path: Path, state: dict[str, Any] | None) -> None:
                 path.unlink()
             return
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(state, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        path.write_bytes(_dumps(state, pretty=True))
     except Exception:
         # best-effort
         return
 
 
+def _port_accepts(host: str, port: int, timeout: float = 0.1) -> bool:
+    try:
+        socket.create_connection((host, port), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+
 def _is_session_healthy(base_url: str, timeout_s: float = 1.5) -> bool:
+    parts = urlsplit(base_url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    # A dead server refuses the connect at once; skip the HTTP attempt (and its timeout) then.
+    # Not needed while a keep-alive connection to it is open.
+    if (host, port) not in getattr(_HTTP_LOCAL, "conns", {}) and not _port_accepts(host, port):
+        return False
     res = _json_http("GET", f"{base_url.rstrip('/')}/health", timeout_s=timeout_s)
     return bool(res.get("ok"))
 
@@ -125,6 +295,16 @@ def _browser_options_from_payload(payload: dict[str, Any]) -> dict[str, Any]:
     return out
 
 
+def _launch_signature(browser_opts: dict[str, Any]) -> dict[str, Any]:
+    """
+    The browser options a session server was started with, as stored in the browser pool.
+
+    JSON round-tripped, so it compares equal to the copy read back from the pool file.
+    """
+    launch = {k: v for k, v in browser_opts.items() if k != "userDataDir"}
+    return json.loads(json.dumps(launch, ensure_ascii=False, sort_keys=True, default=str))
+
+
 def _action_options_from_payload(payload: dict[str, Any]) -> dict[str, Any]:
     # Remove browser init options so we don't accidentally pass them into action methods.
     drop = {
@@ -161,8 +341,6 @@ def _ensure_session_server(ctx, *, payload: dict[str, Any]) -> dict[str, Any]:
         raise FileNotFoundError(f"Missing Node session server: {server_js}")
 
     sess = payload.get("session") if isinstance(payload.get("session"), dict) else {}
-    host = str((sess or {}).get("host") or "127.0.0.1")
-    port = int((sess or {}).get("port") or _pick_free_port())
 
     # Prefer a shared profile to persist login across multiple invocations/agents.
     user_data_scope = str((sess or {}).get("userDataScope") or "shared").lower()
@@ -174,12 +352,38 @@ def _ensure_session_server(ctx, *, payload: dict[str, Any]) -> dict[str, Any]:
         user_data_dir = ctx.shared_dir / "pw_user_data"
     user_data_dir.mkdir(parents=True, exist_ok=True)
 
-    node = _find_node()
     browser_opts = _browser_options_from_payload(payload)
 
     # Default to visible browser in session mode (user can still override via payload.headless).
     if "headless" not in browser_opts or browser_opts.get("headless") is None:
         browser_opts["headless"] = False
+    launch = _launch_signature(browser_opts)
+
+    # A server started by an earlier run may still hold this profile (Chromium allows one process
+    # per profile anyway): adopt its warm browser instead of booting a new one, but only if it
+    # was launched the way this payload asks (headed vs headless, channel, args, ...).
+    pooled = browser_pool.get(ctx, user_data_dir)
+    if pooled and pooled.get("baseUrl"):
+        if not _is_session_healthy(str(pooled["baseUrl"])):
+            browser_pool.discard(ctx, user_data_dir)
+        elif pooled.get("launch") != launch:
+            # It holds the profile we need; shut it down so the requested browser can start.
+            ctx.events.emit(
+                "rpaskill_ts.session.pool_mismatch",
+                data={"baseUrl": pooled["baseUrl"], "pid": pooled.get("pid")},
+                scope="agent",
+            )
+            _json_http("POST", f"{str(pooled['baseUrl']).rstrip('/')}/close", payload={}, timeout_s=2.5)
+            browser_pool.discard(ctx, user_data_dir)
+        else:
+            _save_session_state(state_path, pooled)
+            ctx.events.emit("rpaskill_ts.session.reuse", data={"baseUrl": pooled["baseUrl"], "pid": pooled.get("pid")}, scope="agent")
+            return pooled
+
+    host = str((sess or {}).get("host") or "127.0.0.1")
+    port = int((sess or {}).get("port") or _pick_free_port())
+
+    node = _find_node()
 
     cmd = [
         node,
@@ -208,8 +412,7 @@ def _ensure_session_server(ctx, *, payload: dict[str, Any]) -> dict[str, Any]:
     if browser_opts.get("args"):
         cmd += ["--args", json.dumps(browser_opts["args"], ensure_ascii=False)]
 
-    env = os.environ.copy()
-    env["PLAYWRIGHT_BROWSERS_PATH"] = env.get("PLAYWRIGHT_BROWSERS_PATH", str(ctx.platform.playwright_browsers_dir))
+    _ensure_node_env(ctx)
 
     # Keep server logs as artifacts for later debugging/querying.
     server_log = ctx.artifacts.write_text("work/rpa_ts_session_server.log", "", scope="agent")
@@ -223,13 +426,16 @@ def _ensure_session_server(ctx, *, payload: dict[str, Any]) -> dict[str, Any]:
     if os.name == "nt":
         creationflags = getattr(subprocess, "DETACHED_PROCESS", 0) | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
 
+    # On POSIX, a new session keeps terminal signals (Ctrl+C) from reaching the server. Popen
+    # still launches via vfork/posix_spawn here (no preexec_fn), so the Python heap is not copied.
     p = subprocess.Popen(
         cmd,
         cwd=str(integration_root),
-        env=env,
         stdout=log_fh,
         stderr=log_fh,
         creationflags=creationflags,
+        start_new_session=os.name != "nt",
+        close_fds=True,
     )
     try:
         log_fh.close()
@@ -238,12 +444,14 @@ def _ensure_session_server(ctx, *, payload: dict[str, Any]) -> dict[str, Any]:
 
     base_url = f"http://{host}:{port}"
 
-    # Wait until /health comes up (best-effort).
-    deadline = time.time() + 25.0
-    while time.time() < deadline:
-        if _is_session_healthy(base_url, timeout_s=0.7):
-            break
-        time.sleep(0.25)
+    # Wait until /health comes up (best-effort). The server only listens once its browser is up,
+    # so probe the port cheaply first and confirm with a single HTTP call.
+    deadline = time.monotonic() + 25.0
+    if _wait_port_open(host, port, deadline):
+        delay = _PROBE_DELAY_MIN
+        while not _is_session_healthy(base_url, timeout_s=0.7) and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, _PROBE_DELAY_MAX)
 
     state = {
         "baseUrl": base_url,
@@ -252,8 +460,10 @@ def _ensure_session_server(ctx, *, payload: dict[str, Any]) -> dict[str, Any]:
         "pid": p.pid,
         "userDataDir": str(user_data_dir.resolve()),
         "startedAt": time.time(),
+        "launch": launch,
     }
     _save_session_state(state_path, state)
+    browser_pool.put(ctx, user_data_dir, state)
     ctx.artifacts.record_path(state_path, scope="shared", kind="session", data={"tool": "rpaskill_ts"})
 
     if not _is_session_healthy(base_url, timeout_s=1.0):
@@ -276,10 +486,98 @@ def _close_session_server(ctx, *, state: dict[str, Any]) -> dict[str, Any]:
             pass
 
     _save_session_state(_session_state_path(ctx), None)
+    if state.get("userDataDir"):
+        browser_pool.discard(ctx, Path(str(state["userDataDir"])))
     ctx.events.emit("rpaskill_ts.session.closed", data={"baseUrl": base_url, "pid": pid}, scope="agent")
     return {"ok": True, "closed": True, "baseUrl": base_url, "pid": pid}
 
 
+def _index_path_fields(
+    ctx,
+    container: Mapping[str, Any],
+    *,
+    data: dict[str, Any],
+    loose_html: bool = False,
+    outputs_root: Path | None = None,
+) -> None:
+    """
+    Index files referenced by "*Path"/"path" string fields of `container` so AIs can discover
+    them via index.jsonl. Relative paths resolve under the outputs dir.
+
+    Pass `outputs_root` (an already resolved outputs dir) when indexing many containers.
+    """
+    root = outputs_root if outputs_root is not None else ctx.outputs_dir.resolve()
+    for k, v in container.items():
+        if not v or not isinstance(v, (str, Path)):
+            continue
+        is_path, kind = _classify_key(str(k), loose_html=loose_html)
+        if not is_path:
+            continue
+        p = Path(str(v))
+        if not p.is_absolute():
+            # Lexical join under the resolved root: no realpath() stat walk per file.
+            p = Path(os.path.normpath(root / p))
+        ctx.artifacts.record_path(p, scope="agent", kind=kind, data={**data, "field": k})
+
+
+def collect_screenshots_from_trace(trace_path: Path) -> list[str]:
+    """Distinct `screenshotPath` values of a Node trace JSONL, in first-seen order."""
+    shots: list[str] = []
+    seen = set()
+    if not trace_path.exists():
+        return shots
+    # Stream the trace in binary; most lines carry no screenshot and are skipped unparsed.
+    with trace_path.open("rb") as f:
+        for line in f:
+            if b'"screenshotPath"' not in line:
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = _loads(line)
+            except Exception:
+                continue
+            if not isinstance(rec, dict):
+                continue
+            sp = rec.get("screenshotPath")
+            if not sp:
+                continue
+            sp = str(sp)
+            if sp in seen:
+                continue
+            seen.add(sp)
+            shots.append(sp)
+    return shots
+
+
+def _replay_trace(ctx, trace_path: Any, *, kind: str) -> None:
+    """Replay a Node-side trace JSONL into platform events and index the files it references."""
+    outputs_root = ctx.outputs_dir.resolve()
+    tp = Path(str(trace_path))
+    if not tp.is_absolute():
+        # Relative trace paths resolve under integration cwd; normalize to outputs dir for safety.
+        tp = Path(os.path.normpath(outputs_root / tp))
+    if not tp.exists():
+        return
+    ctx.artifacts.record_path(tp, scope="agent", kind=kind)
+    # One index append for every file the trace references (see ArtifactStore.batch).
+    with ctx.artifacts.batch():
+        for rec in _iter_jsonl(tp):
+            ev = rec.get("event") or "trace"
+            # Namespace into platform events so tools can query it.
+            try:
+                ctx.events.emit(f"rpa.{ev}", data=rec, scope="agent")
+            except Exception:
+                pass
+            _index_path_fields(
+                ctx,
+                rec,
+                data={"url": rec.get("url"), "kind": rec.get("kind"), "event": ev},
+                outputs_root=outputs_root,
+            )
+
+
 def run_rpaskill_ts(ctx, *, action: str, payload: dict[str, Any]) -> dict[str, Any]:
     """
     Run the TypeScript RPASkill integration via Node runner and return the decoded JSON output.
@@ -291,7 +589,7 @@ def run_rpaskill_ts(ctx, *, action: str, payload: dict[str, Any]) -> dict[str, A
 
     # Prepare input + output files
     input_path = ctx.work_dir / f"rpaskill_ts_{action}_input.json"
-    input_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    input_path.write_bytes(_dumps(payload, pretty=True))
 
     output_path = ctx.outputs_dir / f"rpaskill_ts_{action}_output.json"
 
@@ -315,8 +613,7 @@ def run_rpaskill_ts(ctx, *, action: str, payload: dict[str, Any]) -> dict[str, A
     if payload.get("executablePath"):
         cmd += ["--executablePath", str(payload["executablePath"])]
 
-    env = os.environ.copy()
-    env["PLAYWRIGHT_BROWSERS_PATH"] = env.get("PLAYWRIGHT_BROWSERS_PATH", str(ctx.platform.playwright_browsers_dir))
+    _ensure_node_env(ctx)
 
     ctx.logger.info("RPASkill TS runner: %s", " ".join(cmd))
     ctx.events.emit("rpaskill_ts.start", data={"action": action, "cmd": cmd}, scope="agent")
@@ -339,21 +636,17 @@ def run_rpaskill_ts(ctx, *, action: str, payload: dict[str, Any]) -> dict[str, A
             ctx.events.emit("human.hint", message=hint, scope="agent")
         except Exception:
             pass
-        completed = subprocess.run(cmd, cwd=str(integration_root), env=env)
+        completed = subprocess.run(cmd, cwd=str(integration_root))
         stdout_path = ctx.artifacts.write_text(f"rpaskill_ts_{action}_stdout.txt", "", scope="agent")
         stderr_path = ctx.artifacts.write_text(f"rpaskill_ts_{action}_stderr.txt", "", scope="agent")
     else:
-        completed = subprocess.run(
-            cmd,
-            cwd=str(integration_root),
-            env=env,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
-        stdout_path = ctx.artifacts.write_text(f"rpaskill_ts_{action}_stdout.txt", completed.stdout, scope="agent")
-        stderr_path = ctx.artifacts.write_text(f"rpaskill_ts_{action}_stderr.txt", completed.stderr, scope="agent")
+        # Node writes straight into the artifact files: no pipes to drain, no copy in Python memory.
+        stdout_path = ctx.artifacts.path(f"rpaskill_ts_{action}_stdout.txt", scope="agent")
+        stderr_path = ctx.artifacts.path(f"rpaskill_ts_{action}_stderr.txt", scope="agent")
+        with stdout_path.open("wb") as out_fh, stderr_path.open("wb") as err_fh:
+            completed = subprocess.run(cmd, cwd=str(integration_root), stdout=out_fh, stderr=err_fh)
+        ctx.artifacts.record_path(stdout_path, scope="agent")
+        ctx.artifacts.record_path(stderr_path, scope="agent")
 
     ctx.events.emit(
         "rpaskill_ts.end",
@@ -370,7 +663,7 @@ def run_rpaskill_ts(ctx, *, action: str, payload: dict[str, Any]) -> dict[str, A
     if completed.returncode != 0:
         raise RuntimeError(f"rpaskill_ts failed with code {completed.returncode}. See {stderr_path}")
 
-    out = json.loads(output_path.read_text(encoding="utf-8"))
+    out = _loads(output_path.read_bytes())
 
     # Index important artifacts that were created "outside" ArtifactStore.
     ctx.artifacts.record_path(input_path, scope="agent", kind=f"rpaskill_ts.{action}.input")
@@ -379,50 +672,7 @@ def run_rpaskill_ts(ctx, *, action: str, payload: dict[str, Any]) -> dict[str, A
     # Optional: replay Node-side trace JSONL into events + index screenshots.
     trace_path = payload.get("tracePath")
     if trace_path:
-        tp = Path(str(trace_path))
-        if not tp.is_absolute():
-            # Relative trace paths resolve under integration cwd; normalize to outputs dir for safety.
-            tp = (ctx.outputs_dir / tp).resolve()
-        if tp.exists():
-            ctx.artifacts.record_path(tp, scope="agent", kind=f"rpaskill_ts.{action}.trace")
-            for rec in _iter_jsonl(tp):
-                ev = rec.get("event") or "trace"
-                # Namespace into platform events so tools can query it.
-                try:
-                    ctx.events.emit(f"rpa.{ev}", data=rec, scope="agent")
-                except Exception:
-                    pass
-
-                # Index any referenced files in the trace so AIs can discover them via index.jsonl.
-                # Convention: fields named "*Path" or a generic "path".
-                for k, v in rec.items():
-                    if not isinstance(v, (str, Path)):
-                        continue
-                    if k != "path" and not k.endswith("Path"):
-                        continue
-                    if not v:
-                        continue
-                    p = Path(str(v))
-                    if not p.is_absolute():
-                        p = (ctx.outputs_dir / p).resolve()
-
-                    kind = None
-                    kl = k.lower()
-                    if "screenshot" in kl:
-                        kind = "screenshot"
-                    elif kl in ("htmlpath", "pagesourcepath"):
-                        kind = "html"
-                    elif "a11y" in kl or "accessibility" in kl:
-                        kind = "a11y"
-                    elif "elements" in kl or "uimap" in kl:
-                        kind = "ui_map"
-
-                    ctx.artifacts.record_path(
-                        p,
-                        scope="agent",
-                        kind=kind,
-                        data={"url": rec.get("url"), "kind": rec.get("kind"), "event": ev, "field": k},
-                    )
+        _replay_trace(ctx, trace_path, kind=f"rpaskill_ts.{action}.trace")
     return out
 
 
@@ -497,78 +747,20 @@ def run_rpaskill_ts_session(ctx, *, action: str, payload: dict[str, Any]) -> dic
         except Exception:
             pass
     out_path = ctx.outputs_dir / f"rpaskill_ts_session_{action}_output.json"
-    out_path.write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    out_path.write_bytes(_dumps(result, pretty=True))
     ctx.artifacts.record_path(out_path, scope="agent", kind=f"rpaskill_ts.session.{action}.output")
 
     # Index common "*Path" outputs (screenshots/html/a11y/etc) for AI discoverability.
     try:
         response_obj = result.get("response") or {}
         if isinstance(response_obj, dict):
-            for k, v in response_obj.items():
-                if not isinstance(v, (str, Path)):
-                    continue
-                if k != "path" and not str(k).endswith("Path"):
-                    continue
-                p = Path(str(v))
-                if not p.is_absolute():
-                    p = (ctx.outputs_dir / p).resolve()
-
-                kind = None
-                kl = str(k).lower()
-                if "screenshot" in kl:
-                    kind = "screenshot"
-                elif "html" in kl or "pagesource" in kl:
-                    kind = "html"
-                elif "a11y" in kl or "accessibility" in kl:
-                    kind = "a11y"
-                elif "elements" in kl or "uimap" in kl:
-                    kind = "ui_map"
-
-                ctx.artifacts.record_path(p, scope="agent", kind=kind, data={"field": k, "action": action})
+            _index_path_fields(ctx, response_obj, data={"action": action}, loose_html=True)
     except Exception:
         pass
 
     # Optional: replay Node-side trace JSONL into events + index any referenced files.
     trace_path = payload.get("tracePath")
     if trace_path:
-        tp = Path(str(trace_path))
-        if not tp.is_absolute():
-            tp = (ctx.outputs_dir / tp).resolve()
-        if tp.exists():
-            ctx.artifacts.record_path(tp, scope="agent", kind=f"rpaskill_ts.session.{action}.trace")
-            for rec in _iter_jsonl(tp):
-                ev = rec.get("event") or "trace"
-                try:
-                    ctx.events.emit(f"rpa.{ev}", data=rec, scope="agent")
-                except Exception:
-                    pass
-                for k, v in rec.items():
-                    if not isinstance(v, (str, Path)):
-                        continue
-                    if k != "path" and not k.endswith("Path"):
-                        continue
-                    if not v:
-                        continue
-                    p = Path(str(v))
-                    if not p.is_absolute():
-                        p = (ctx.outputs_dir / p).resolve()
-
-                    kind = None
-                    kl = k.lower()
-                    if "screenshot" in kl:
-                        kind = "screenshot"
-                    elif kl in ("htmlpath", "pagesourcepath"):
-                        kind = "html"
-                    elif "a11y" in kl or "accessibility" in kl:
-                        kind = "a11y"
-                    elif "elements" in kl or "uimap" in kl:
-                        kind = "ui_map"
-
-                    ctx.artifacts.record_path(
-                        p,
-                        scope="agent",
-                        kind=kind,
-                        data={"url": rec.get("url"), "kind": rec.get("kind"), "event": ev, "field": k},
-                    )
+        _replay_trace(ctx, trace_path, kind=f"rpaskill_ts.session.{action}.trace")
 
     return result
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import re
-from datetime import datetime, timezone
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from .common.runner import run_rpaskill_ts, run_rpaskill_ts_session
+from .common.fsutil import cached_exists, ensure_dir, sanitize_profile_name
+from .common.runner import _dumps, run_rpaskill_ts, run_rpaskill_ts_session
+
+# One `key:value` pair of a loose object body; keys/values may be quoted, values may contain ":".
+_LOOSE_KV_RE = re.compile(r"""\s*(?:"([^"]*)"|'([^']*)'|([^:,]*?))\s*:([^,]*)""")
+
 
 def _coerce_bool(v: object) -> bool:
     if isinstance(v, bool):
@@ -17,6 +25,100 @@ def _coerce_bool(v: object) -> bool:
     return s in ("1", "true", "yes", "y", "on")
 
 
+def _unquote(v: str) -> str:
+    if len(v) >= 2 and v[0] == v[-1] and v[0] in "\"'":
+        return v[1:-1]
+    return v
+
+
+@lru_cache(maxsize=64)
+def _run_dirs(outputs_dir: str, shared_dir: str, work_dir: str) -> dict[str, str]:
+    # Only absolute strings are needed (marker/trace paths); abspath is pure string work, unlike
+    # resolve(), which stats/readlinks every component.
+    outputs = Path(os.path.abspath(outputs_dir))
+    return {
+        "outputs_dir": str(outputs),
+        "shared_dir": os.path.abspath(shared_dir),
+        "work_dir": os.path.abspath(work_dir),
+        # Best-effort guesses to help locate artifacts quickly.
+        "captures_dir": str(outputs / "captures"),
+        "screenshots_dir": str(outputs / "screenshots"),
+    }
+
+
+@lru_cache(maxsize=128)
+def _resolve_profile(deps_dir: str, site_raw: str, account_raw: str) -> tuple[str, str]:
+    """
+    (userDataDir, storage-state path) for a site/account pair, with both directories created.
+
+    Sanitizing, abspath and mkdir are all repeated per invocation otherwise; in session mode a
+    single process runs many invocations against the same profile.
+    """
+    site = sanitize_profile_name(site_raw or "default_site") or "default_site"
+    account = sanitize_profile_name(account_raw or "default") or "default"
+    deps = Path(deps_dir)
+    profile_dir = ensure_dir(os.path.abspath(deps / "browser_profiles" / site / account))
+    storage_state_path = Path(os.path.abspath(deps / "storage_states" / site / f"{account}.json"))
+    ensure_dir(storage_state_path.parent)
+    return str(profile_dir), str(storage_state_path)
+
+
+# _latest.json is only a pointer to the most recent run: when a process runs the skill many times
+# in quick succession only the last marker per path matters, so writes are coalesced.
+_MARKER_DELAY_S = 0.5
+_PENDING_MARKERS: dict[Path, bytes] = {}
+_MARKER_LOCK = threading.Lock()
+_MARKER_TIMER: threading.Timer | None = None
+
+
+def _queue_marker(path: Path, data: bytes) -> None:
+    global _MARKER_TIMER
+    with _MARKER_LOCK:
+        _PENDING_MARKERS[path] = data
+        if _MARKER_TIMER is None:
+            _MARKER_TIMER = threading.Timer(_MARKER_DELAY_S, _flush_markers)
+            _MARKER_TIMER.daemon = True
+            _MARKER_TIMER.start()
+
+
+def _flush_markers() -> None:
+    global _MARKER_TIMER
+    with _MARKER_LOCK:
+        pending = dict(_PENDING_MARKERS)
+        _PENDING_MARKERS.clear()
+        timer, _MARKER_TIMER = _MARKER_TIMER, None
+    if timer is not None:
+        timer.cancel()
+    for path, data in pending.items():
+        try:
+            # Readers never see a half-written marker.
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            try:
+                tmp.write_bytes(data)
+            except FileNotFoundError:
+                # ensure_dir() only creates the skill folder once per process; outputs/ may have
+                # been cleaned since.
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except Exception:
+            # Never break the skill due to marker writes.
+            pass
+
+
+atexit.register(_flush_markers)
+
+
+def _coerce_scalar(v: str) -> Any:
+    vl = v.lower()
+    if vl in ("true", "false"):
+        return vl == "true"
+    try:
+        return float(v) if "." in v else int(v)
+    except ValueError:
+        return v
+
+
 def _parse_loose_kv_object(text: str) -> dict[str, Any] | None:
     """
     Parse a loose object format like: {enabled:true,command:status,port:38200}
@@ -29,27 +131,22 @@ def _parse_loose_kv_object(text: str) -> dict[str, Any] | None:
     body = t[1:-1].strip()
     if not body:
         return {}
+    if "{" in body or "[" in body:
+        # Nesting is beyond the loose format (it would be split on inner commas); valid JSON expresses it.
+        # Anything else keeps the loose parse below, string values and all.
+        try:
+            obj = json.loads(t)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict):
+            return obj
 
     out: dict[str, Any] = {}
-    for part in body.split(","):
-        if ":" not in part:
-            continue
-        k, v = part.split(":", 1)
-        k = k.strip().strip('"').strip("'")
-        v = v.strip().strip('"').strip("'")
+    for m in _LOOSE_KV_RE.finditer(body):
+        k = m.group(1) if m.group(1) is not None else m.group(2) if m.group(2) is not None else m.group(3)
         if not k:
             continue
-        vl = v.lower()
-        if vl in ("true", "false"):
-            out[k] = vl == "true"
-        else:
-            try:
-                if "." in v:
-                    out[k] = float(v)
-                else:
-                    out[k] = int(v)
-            except Exception:
-                out[k] = v
+        out[k] = _coerce_scalar(_unquote(m.group(4).strip()))
     return out
 
 
@@ -65,27 +162,21 @@ def run(ctx) -> dict[str, Any]:
         Write a stable pointer file so the agent can auto-locate the most recent run's artifacts
         without the user needing to paste paths/screenshots.
         """
+        # Only this marker needs datetime (the runtime itself never loads it); import it on first use.
+        from datetime import datetime, timezone
+
         try:
-            skill_root = ctx.platform.root_dir / "outputs" / str(ctx.skill.name)
-            skill_root.mkdir(parents=True, exist_ok=True)
+            skill_root = ensure_dir(ctx.platform.root_dir / "outputs" / str(ctx.skill_name))
             marker_path = skill_root / "_latest.json"
 
-            # Best-effort guesses to help locate artifacts quickly.
-            captures_dir = ctx.outputs_dir / "captures"
-            screenshots_dir = ctx.outputs_dir / "screenshots"
-
             marker = {
                 "ts": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-                "skill": str(ctx.skill.name),
+                "skill": str(ctx.skill_name),
                 "run_id": str(ctx.run_id),
                 "agent_id": str(ctx.agent_id),
                 "action": str(action_name),
                 "paths": {
-                    "outputs_dir": str(Path(ctx.outputs_dir).resolve()),
-                    "shared_dir": str(Path(ctx.shared_dir).resolve()),
-                    "work_dir": str(Path(ctx.work_dir).resolve()),
-                    "captures_dir": str(captures_dir.resolve()),
-                    "screenshots_dir": str(screenshots_dir.resolve()),
+                    **_run_dirs(str(ctx.outputs_dir), str(ctx.shared_dir), str(ctx.work_dir)),
                     "trace_path": str(payload.get("tracePath") or ""),
                     "capture_prefix": str(payload.get("capturePrefix") or ""),
                 },
@@ -106,7 +197,8 @@ def run(ctx) -> dict[str, Any]:
                     "status": result.get("status"),
                 },
             }
-            marker_path.write_text(json.dumps(marker, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+            # orjson (when installed) emits the indented UTF-8 bytes directly; no str -> bytes pass.
+            _queue_marker(marker_path, _dumps(marker, pretty=True))
         except Exception:
             # Never break the skill due to marker writes.
             return
@@ -115,7 +207,17 @@ def run(ctx) -> dict[str, Any]:
     action = cfg.get("action", "adaptiveSearch")
     action = str(action)
 
-    input_payload = dict(cfg)
+    # Copy-on-write: session management calls (status/health/...) usually only read the config,
+    # so ctx.config is aliased until the first write. The runner never mutates the payload.
+    input_payload: dict[str, Any] = cfg
+    payload_owned = False
+
+    def _own_payload() -> dict[str, Any]:
+        nonlocal input_payload, payload_owned
+        if not payload_owned:
+            input_payload = dict(input_payload)
+            payload_owned = True
+        return input_payload
 
     # Optional multi-login support:
     # If the caller provides profileSite/profileAccount (or site/account), we map that to a stable
@@ -127,46 +229,45 @@ def run(ctx) -> dict[str, Any]:
         input_payload.get("profileAccount") or input_payload.get("account") or input_payload.get("profile") or ""
     ).strip()
     if (profile_site_raw or profile_account_raw) and not input_payload.get("userDataDir"):
-        profile_site = re.sub(r"[^A-Za-z0-9._-]+", "_", profile_site_raw or "default_site") or "default_site"
-        profile_account = re.sub(r"[^A-Za-z0-9._-]+", "_", profile_account_raw or "default") or "default"
-        profile_dir = (ctx.platform.deps_dir / "browser_profiles" / profile_site / profile_account).resolve()
-        profile_dir.mkdir(parents=True, exist_ok=True)
-        input_payload["userDataDir"] = str(profile_dir)
+        profile_dir, storage_state_path = _resolve_profile(
+            str(ctx.platform.deps_dir), profile_site_raw, profile_account_raw
+        )
+        _own_payload()["userDataDir"] = profile_dir
 
         # Also keep a storageState snapshot updated (useful for backup/export; userDataDir is the main mechanism).
-        storage_state_path = (ctx.platform.deps_dir / "storage_states" / profile_site / f"{profile_account}.json").resolve()
-        storage_state_path.parent.mkdir(parents=True, exist_ok=True)
-        if storage_state_path.exists() and not input_payload.get("storageStatePath"):
-            input_payload["storageStatePath"] = str(storage_state_path)
+        if not input_payload.get("storageStatePath") and cached_exists(storage_state_path):
+            input_payload["storageStatePath"] = storage_state_path
         # Always attempt to save an updated snapshot after the run (works for non-session runs;
         # session runs will save it best-effort via run_rpaskill_ts_session).
-        input_payload.setdefault("saveStorageStatePath", str(storage_state_path))
+        input_payload.setdefault("saveStorageStatePath", storage_state_path)
 
     # Session mode: keep a single browser open across multiple invocations within the same run_id.
     # This is the main path for "human-in-the-loop" login/captcha workflows where you want to keep
     # the browser window visible and reuse the same cookies.
     session_cfg: dict[str, Any] | None = None
-    if isinstance(input_payload.get("session"), dict):
-        session_cfg = dict(input_payload.get("session") or {})
-    elif isinstance(input_payload.get("session"), str):
-        session_cfg = _parse_loose_kv_object(str(input_payload.get("session"))) or None
+    # A config-provided dict is only read, so it is aliased and copied only if flat keys are merged in.
+    session_owned = False
+    session_raw = input_payload.get("session")
+    if isinstance(session_raw, dict):
+        session_cfg = session_raw
+    elif isinstance(session_raw, str):
+        session_cfg = _parse_loose_kv_object(session_raw) or None
+        session_owned = session_cfg is not None
 
     # Also accept PowerShell-friendly flat overrides like: --set session.command=start
     # (run.py will treat the whole key as a string).
     for k in list(input_payload.keys()):
         if not isinstance(k, str) or not k.startswith("session."):
             continue
-        if session_cfg is None:
-            session_cfg = {}
+        if not session_owned:
+            session_cfg = dict(session_cfg or {})
+            session_owned = True
         session_cfg[k[len("session.") :]] = input_payload[k]
         # Remove flattened keys so they don't leak into action option payloads.
-        try:
-            del input_payload[k]
-        except Exception:
-            pass
+        _own_payload().pop(k, None)
 
-    if session_cfg is not None:
-        input_payload["session"] = session_cfg
+    if session_cfg is not None and input_payload.get("session") is not session_cfg:
+        _own_payload()["session"] = session_cfg
 
     session_enabled = bool(session_cfg) and _coerce_bool(session_cfg.get("enabled", True))
     session_command = str((session_cfg or {}).get("command") or "call").lower() if session_cfg else "call"
@@ -178,19 +279,22 @@ def run(ctx) -> dict[str, Any]:
         _write_latest_marker(action_name=action, payload=input_payload, result=res)
         return res
 
+    # Every action below fills in defaults.
+    _own_payload()
+    run_dirs = _run_dirs(str(ctx.outputs_dir), str(ctx.shared_dir), str(ctx.work_dir))
     if action in ("webSearch", "adaptiveSearch"):
         query = input_payload.get("query")
         if not query:
             raise ValueError("config.yaml must include `query` for rpa_ts_skill when action is webSearch/adaptiveSearch")
         input_payload["query"] = query
-        input_payload.setdefault("tracePath", str((ctx.outputs_dir / "rpa_trace.jsonl").resolve()))
+        input_payload.setdefault("tracePath", str(Path(run_dirs["outputs_dir"]) / "rpa_trace.jsonl"))
     elif action == "inspectPage":
         url = input_payload.get("url")
         if not url:
             raise ValueError("config.yaml must include `url` for rpa_ts_skill when action is inspectPage")
         input_payload["url"] = url
-        input_payload.setdefault("tracePath", str((ctx.outputs_dir / "rpa_trace.jsonl").resolve()))
-        input_payload.setdefault("capturePrefix", str((ctx.outputs_dir / "captures" / "page").resolve()))
+        input_payload.setdefault("tracePath", str(Path(run_dirs["outputs_dir"]) / "rpa_trace.jsonl"))
+        input_payload.setdefault("capturePrefix", str(Path(run_dirs["captures_dir"]) / "page"))
         input_payload.setdefault("captureFullPage", True)
         input_payload.setdefault("includeHtml", True)
         input_payload.setdefault("includeAccessibility", True)
@@ -201,7 +305,7 @@ def run(ctx) -> dict[str, Any]:
             input_payload["headless"] = False
     else:
         # For other actions (e.g. searchOnSite), just pass config through.
-        input_payload.setdefault("tracePath", str((ctx.outputs_dir / "rpa_trace.jsonl").resolve()))
+        input_payload.setdefault("tracePath", str(Path(run_dirs["outputs_dir"]) / "rpa_trace.jsonl"))
 
     if session_enabled:
         out = run_rpaskill_ts_session(ctx, action=action, payload=input_payload)
@@ -1,34 +1,9 @@
 from __future__ import annotations
 
-import json
 from typing import Any
 from pathlib import Path
 
-from skills.rpa_ts_skill.common.runner import run_rpaskill_ts
-
-
-def _collect_screenshots_from_trace(trace_path: Path) -> list[str]:
-    shots: list[str] = []
-    seen = set()
-    if not trace_path.exists():
-        return shots
-    for line in trace_path.read_text(encoding="utf-8", errors="replace").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            rec = json.loads(line)
-        except Exception:
-            continue
-        sp = rec.get("screenshotPath")
-        if not sp:
-            continue
-        sp = str(sp)
-        if sp in seen:
-            continue
-        seen.add(sp)
-        shots.append(sp)
-    return shots
+from skills.rpa_ts_skill.common.runner import collect_screenshots_from_trace, run_rpaskill_ts
 
 
 def run(ctx) -> dict[str, Any]:
@@ -47,7 +22,8 @@ def run(ctx) -> dict[str, Any]:
     cfg.setdefault("openScreenshotFullPage", True)
     cfg.setdefault("tracePath", str((ctx.outputs_dir / "rpa_trace.jsonl").resolve()))
 
-    out = run_rpaskill_ts(ctx, action="webSearch", payload=dict(cfg))
-    screenshots = _collect_screenshots_from_trace(Path(cfg["tracePath"]))
+    # cfg is already this run's private copy (run_rpaskill_ts does not mutate the payload).
+    out = run_rpaskill_ts(ctx, action="webSearch", payload=cfg)
+    screenshots = collect_screenshots_from_trace(Path(cfg["tracePath"]))
     # Keep a short top-level response; full response lives in artifacts/output json.
     return {"status": "ok", "rpaskill_ts": out, "screenshots": screenshots, "tracePath": cfg["tracePath"]}
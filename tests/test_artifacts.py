@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from runtime.common.artifacts import ArtifactMeta, ArtifactStore
+
+
+def _index_paths(store: ArtifactStore) -> list[str]:
+    store.flush()
+    index = store.agent_dir / "index.jsonl"
+    if not index.exists():
+        return []
+    text = index.read_text(encoding="utf-8")
+    return [Path(json.loads(line)["path"]).name for line in text.splitlines() if line]
+
+
+class TestArtifactStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.store = ArtifactStore(
+            agent_dir=base / "agent",
+            shared_dir=base / "shared",
+            meta=ArtifactMeta(skill="s", run_id="r", agent_id="a"),
+        )
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_batch_holds_index_lines_until_exit(self) -> None:
+        with self.store.batch():
+            self.store.write_text("a.txt", "a")
+            with self.store.batch():
+                self.store.write_text("b.txt", "b")
+            self.assertEqual(_index_paths(self.store), [])
+        self.assertEqual(_index_paths(self.store), ["a.txt", "b.txt"])
+
+    def test_concurrent_batches_keep_their_own_records(self) -> None:
+        a_written = threading.Event()
+        a_done = threading.Event()
+        b_written = threading.Event()
+        errors: list[BaseException] = []
+
+        def site_a() -> None:
+            try:
+                with self.store.batch():
+                    self.store.write_text("a1.txt", "a1")
+                    a_written.set()
+                    b_written.wait(5)
+                # Leaving A's batch must not flush or disable B's open batch.
+                a_done.set()
+            except BaseException as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        def site_b() -> None:
+            try:
+                a_written.wait(5)
+                with self.store.batch():
+                    self.store.write_text("b1.txt", "b1")
+                    b_written.set()
+                    a_done.wait(5)
+                    self.assertEqual(_index_paths(self.store), ["a1.txt"])
+                    self.store.write_text("b2.txt", "b2")
+                    self.assertIsNotNone(self.store.record_path(self.store.path("b1.txt")))
+            except BaseException as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=site_a), threading.Thread(target=site_b)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        self.assertEqual(errors, [])
+        self.assertEqual(_index_paths(self.store), ["a1.txt", "b1.txt", "b2.txt", "b1.txt"])
+
+    def test_record_path_reuses_hash_until_file_changes(self) -> None:
+        p = self.store.write_text("shot.png", "one")
+        calls: list[Path] = []
+        real = self.store._sha256_file
+
+        def counting(path: Path, **kw) -> str:
+            calls.append(path)
+            return real(path, **kw)
+
+        self.store._sha256_file = counting  # type: ignore[method-assign]
+        first = self.store.record_path(p)
+        second = self.store.record_path(p)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first["sha256"], second["sha256"])
+
+        p.write_text("changed", encoding="utf-8")
+        st = p.stat()
+        os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        third = self.store.record_path(p)
+        self.assertEqual(len(calls), 2)
+        self.assertNotEqual(third["sha256"], first["sha256"])
+
+    def test_record_path_ignores_missing_files(self) -> None:
+        self.assertIsNone(self.store.record_path(self.store.path("missing.png")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from skills.rpa_ts_skill.common import browser_pool
+from skills.rpa_ts_skill.common.runner import _launch_signature
+
+
+class TestBrowserPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.ctx = SimpleNamespace(platform=SimpleNamespace(deps_dir=base / "deps"))
+        self.profile = base / "profile"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_put_get_discard(self) -> None:
+        launch = _launch_signature({"headless": True, "args": ["--lang=zh-CN"], "userDataDir": str(self.profile)})
+        browser_pool.put(self.ctx, self.profile, {"baseUrl": "http://127.0.0.1:1", "launch": launch})
+        got = browser_pool.get(self.ctx, self.profile)
+        self.assertEqual(got["launch"], launch)
+        # Atomic save leaves no temp files behind.
+        self.assertEqual([p.name for p in self.ctx.platform.deps_dir.iterdir()], ["rpa_ts_browser_pool.json"])
+
+        browser_pool.discard(self.ctx, self.profile)
+        self.assertIsNone(browser_pool.get(self.ctx, self.profile))
+
+    def test_launch_signature_tells_launch_modes_apart(self) -> None:
+        headless = _launch_signature({"headless": True, "channel": "chrome", "userDataDir": "a"})
+        self.assertEqual(headless, _launch_signature({"channel": "chrome", "headless": True, "userDataDir": "b"}))
+        self.assertNotEqual(headless, _launch_signature({"headless": False, "channel": "chrome"}))
+        self.assertNotEqual(headless, _launch_signature({"headless": True, "channel": "msedge"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
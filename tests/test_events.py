@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from runtime.common import events
+from runtime.common.events import EventLog, EventMeta
+
+
+def _records(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "events.jsonl"
+        self.meta = EventMeta(skill="s", run_id="r", agent_id="a")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_sync_emit_writes_through(self) -> None:
+        log = EventLog(self.path, meta=self.meta)
+        try:
+            rec = log.emit("one", data={"k": 1})
+            self.assertEqual(_records(self.path), [rec])
+            self.assertEqual(rec["pid"], os.getpid())
+            self.assertEqual((rec["skill"], rec["run_id"], rec["agent_id"]), ("s", "r", "a"))
+        finally:
+            log.close()
+
+    def test_background_flush_and_order(self) -> None:
+        log = EventLog(self.path, meta=self.meta, background=True)
+        try:
+            for i in range(50):
+                log.emit("e", data={"i": i})
+            log.flush()
+            self.assertEqual([r["data"]["i"] for r in _records(self.path)], list(range(50)))
+        finally:
+            log.close()
+        self.assertFalse(log._thread)
+
+    def test_close_races_with_emitters(self) -> None:
+        log = EventLog(self.path, meta=self.meta, background=True)
+        per_thread = 200
+        started = threading.Barrier(5)
+
+        def emitter(n: int) -> None:
+            started.wait()
+            for i in range(per_thread):
+                log.emit("e", data={"t": n, "i": i})
+
+        threads = [threading.Thread(target=emitter, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        started.wait()
+        log.close()
+        for t in threads:
+            t.join(10)
+        # Emits after close() are synchronous writes; close again to release their descriptor.
+        log.close()
+
+        recs = _records(self.path)
+        self.assertEqual(len(recs), 4 * per_thread)
+        for n in range(4):
+            self.assertEqual([r["data"]["i"] for r in recs if r["data"]["t"] == n], list(range(per_thread)))
+
+    def test_close_during_a_queue_put_keeps_the_record(self) -> None:
+        log = EventLog(self.path, meta=self.meta, background=True)
+        real = log._q
+        in_put = threading.Event()
+
+        class SlowQueue:
+            # Holds an emit inside put() so close() runs in the middle of it.
+            def put(self, item) -> None:
+                if isinstance(item, bytes):
+                    in_put.set()
+                    time.sleep(0.2)
+                real.put(item)
+
+            def __getattr__(self, name):
+                return getattr(real, name)
+
+        log._q = SlowQueue()  # type: ignore[assignment]
+        t = threading.Thread(target=log.emit, args=("late",))
+        t.start()
+        self.assertTrue(in_put.wait(5))
+        log.close()
+        t.join(5)
+        self.assertEqual([r["event"] for r in _records(self.path)], ["late"])
+
+    def test_writer_error_surfaces_on_flush(self) -> None:
+        log = EventLog(self.path, meta=self.meta, background=True)
+        try:
+            with mock.patch.object(log._out, "write", side_effect=OSError("disk full")):
+                log.emit("e")
+                with self.assertRaises(OSError):
+                    log.flush()
+            # Reported once; the log keeps working.
+            log.emit("f")
+            log.flush()
+            self.assertEqual([r["event"] for r in _records(self.path)], ["f"])
+        finally:
+            log.close()
+
+    def test_refresh_pid(self) -> None:
+        log = EventLog(self.path, meta=self.meta)
+        try:
+            with mock.patch.object(events.os, "getpid", return_value=424242):
+                events._refresh_pid()
+            self.assertEqual(log.emit("e")["pid"], 424242)
+        finally:
+            events._refresh_pid()
+            log.close()
+        self.assertEqual(events._PID, os.getpid())
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_forked_child_logs_its_own_pid(self) -> None:
+        log = EventLog(self.path, meta=self.meta)
+        try:
+            child = os.fork()
+            if child == 0:  # pragma: no cover - runs in the child
+                code = 0
+                try:
+                    log.emit("child")
+                except BaseException:
+                    code = 1
+                os._exit(code)
+            _, status = os.waitpid(child, 0)
+            self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+            log.emit("parent")
+        finally:
+            log.close()
+        pids = {r["event"]: r["pid"] for r in _records(self.path)}
+        self.assertEqual(pids, {"child": child, "parent": os.getpid()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from runtime import utils
+from runtime.common import jsonl
+from runtime.common.jsonl import JsonlAppender
+from runtime.utils import dumps_jsonl
+
+
+class TestDumpsJsonl(unittest.TestCase):
+    def test_one_line_utf8(self) -> None:
+        rec = {"event": "知网", "n": 1, "nested": {"a": [1, 2]}}
+        line = dumps_jsonl(rec)
+        self.assertTrue(line.endswith(b"\n"))
+        self.assertEqual(line.count(b"\n"), 1)
+        self.assertIn("知网".encode("utf-8"), line)
+        self.assertEqual(json.loads(line), rec)
+
+    def test_falls_back_to_stdlib(self) -> None:
+        # Beyond orjson's 64-bit ints.
+        big = {"n": 2**70}
+        self.assertEqual(json.loads(dumps_jsonl(big)), big)
+        with mock.patch.object(utils, "orjson", None):
+            self.assertEqual(dumps_jsonl({"a": "é"}), '{"a": "é"}\n'.encode("utf-8"))
+
+
+class TestJsonlAppender(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "log.jsonl"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _text(self) -> str:
+        return self.path.read_text(encoding="utf-8") if self.path.exists() else ""
+
+    def test_buffered_writes_flush_on_interval(self) -> None:
+        clock = [100.0]
+        with mock.patch.object(jsonl.time, "monotonic", side_effect=lambda: clock[0]):
+            out = JsonlAppender(self.path, flush_interval_s=1.0)
+            try:
+                out.write(b"a\n")
+                self.assertEqual(self._text(), "")
+                clock[0] += 1.5
+                out.write(b"b\n")
+                self.assertEqual(self._text(), "a\nb\n")
+                out.write(b"c\n")
+                self.assertEqual(self._text(), "a\nb\n")
+                out.flush()
+                self.assertEqual(self._text(), "a\nb\nc\n")
+            finally:
+                out.close()
+
+    def test_zero_interval_flushes_every_write(self) -> None:
+        out = JsonlAppender(self.path, flush_interval_s=0)
+        try:
+            out.write(b"a\n")
+            self.assertEqual(self._text(), "a\n")
+        finally:
+            out.close()
+
+    def test_raw_mode_appends_unbuffered(self) -> None:
+        self.path.write_bytes(b"old\n")
+        out = JsonlAppender(self.path, raw=True)
+        try:
+            out.write(b"a\n")
+            self.assertEqual(self._text(), "old\na\n")
+            # Another writer appends in between: O_APPEND keeps both intact.
+            with open(self.path, "ab") as other:
+                other.write(b"x\n")
+            out.write(b"b\n")
+            self.assertEqual(self._text(), "old\na\nx\nb\n")
+        finally:
+            out.close()
+        self.assertIsNone(out._fd)
+
+    def test_concurrent_raw_writes_keep_lines_whole(self) -> None:
+        out = JsonlAppender(self.path, raw=True)
+        lines = [(f"{n}:" + "x" * 200 + "\n").encode() for n in range(8)]
+
+        def worker(line: bytes) -> None:
+            for _ in range(100):
+                out.write(line)
+
+        threads = [threading.Thread(target=worker, args=(line,)) for line in lines]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        out.close()
+        got = self.path.read_bytes().splitlines(keepends=True)
+        self.assertEqual(len(got), 800)
+        self.assertTrue(set(got) <= set(lines))
+
+    def test_close_all_at_exit(self) -> None:
+        buffered = JsonlAppender(self.path, flush_interval_s=3600)
+        raw = JsonlAppender(self.path.with_name("raw.jsonl"), raw=True)
+        buffered.write(b"a\n")
+        raw.write(b"b\n")
+        self.assertIn(buffered, jsonl._OPEN)
+        self.assertIn(raw, jsonl._OPEN)
+
+        jsonl._close_all()
+        self.assertEqual(self._text(), "a\n")
+        self.assertNotIn(buffered, jsonl._OPEN)
+        self.assertNotIn(raw, jsonl._OPEN)
+        self.assertIsNone(raw._fd)
+
+        # Closed appenders reopen on the next write.
+        buffered.write(b"c\n")
+        buffered.close()
+        self.assertEqual(self._text(), "a\nc\n")
+
+    def test_close_is_idempotent(self) -> None:
+        out = JsonlAppender(self.path, raw=True)
+        out.close()
+        out.write(b"a\n")
+        out.close()
+        out.close()
+        self.assertEqual(self._text(), "a\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
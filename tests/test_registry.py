@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from runtime import registry
+
+
+class TestSkillDiscoveryCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name)
+        self.root = base / "project"
+        self.cache_dir = base / "cache"
+        self.environ = {"SKILLBOX_CACHE_DIR": str(self.cache_dir)}
+        self._write("alpha", "first")
+        self._write("beta", "second")
+        self._clear_memory()
+
+    def tearDown(self) -> None:
+        self._clear_memory()
+        self._tmp.cleanup()
+
+    def _clear_memory(self) -> None:
+        with registry._CACHE_LOCK:
+            registry._DISCOVERY_CACHE.clear()
+            registry._MANIFEST_CACHE.clear()
+
+    def _write(self, name: str, description: str) -> Path:
+        d = self.root / "skills" / name
+        d.mkdir(parents=True, exist_ok=True)
+        mf = d / "skill.json"
+        mf.write_text(json.dumps({"name": name, "description": description}), encoding="utf-8")
+        return mf
+
+    def _discover(self, environ: dict[str, str]) -> tuple[dict[str, str], int]:
+        """(name -> description, number of skill.json files parsed)."""
+        real = registry._load_manifest
+        with mock.patch.object(registry, "_load_manifest", side_effect=real) as load:
+            skills = registry.discover_skills(self.root, environ=environ)
+        return {s.name: s.description for s in skills}, load.call_count
+
+    def test_snapshot_is_opt_in(self) -> None:
+        self.assertIsNone(registry._snapshot_path({}))
+        with mock.patch.object(registry, "_write_snapshot", wraps=registry._write_snapshot) as write:
+            self._discover({})
+        self.assertEqual(write.call_count, 1)
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_snapshot_hit_skips_manifest_reads(self) -> None:
+        expected = {"alpha": "first", "beta": "second"}
+        self.assertEqual(self._discover(self.environ), (expected, 2))
+        self.assertTrue((self.cache_dir / "skills_snapshot.json").is_file())
+
+        # Same process: in-memory cache. Fresh process (caches cleared): the snapshot.
+        self.assertEqual(self._discover(self.environ), (expected, 0))
+        self._clear_memory()
+        self.assertEqual(self._discover(self.environ), (expected, 0))
+
+    def test_edited_manifest_invalidates_snapshot(self) -> None:
+        self._discover(self.environ)
+        self._clear_memory()
+
+        mf = self._write("alpha", "rewritten")
+        st = mf.stat()
+        os.utime(mf, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        got, reads = self._discover(self.environ)
+        self.assertEqual(got, {"alpha": "rewritten", "beta": "second"})
+        self.assertEqual(reads, 2)
+
+        # A new skill folder changes the stat manifest as well.
+        self._write("gamma", "third")
+        got, _ = self._discover(self.environ)
+        self.assertEqual(sorted(got), ["alpha", "beta", "gamma"])
+
+    def test_no_skill_cache_always_scans(self) -> None:
+        environ = {**self.environ, "SKILLBOX_NO_SKILL_CACHE": "1"}
+        self.assertEqual(self._discover(environ)[1], 2)
+        self.assertEqual(self._discover(environ)[1], 2)
+        self.assertFalse(self.cache_dir.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
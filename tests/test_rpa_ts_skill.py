@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import http.server
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from skills.rpa_ts_skill.common.fsutil import sanitize_profile_name
+from skills.rpa_ts_skill.common import runner
+from skills.rpa_ts_skill.common.runner import collect_screenshots_from_trace
+from skills.rpa_ts_skill import main as rpa_main
+from skills.rpa_ts_skill.main import _parse_loose_kv_object
+
+
+class TestProfileNames(unittest.TestCase):
+    def test_sanitize_profile_name(self) -> None:
+        self.assertEqual(sanitize_profile_name("jd"), "jd")
+        self.assertEqual(sanitize_profile_name("acc_a-1.x"), "acc_a-1.x")
+        # Runs of other characters collapse into one "_".
+        self.assertEqual(sanitize_profile_name("a b//c"), "a_b_c")
+        self.assertEqual(sanitize_profile_name("知网"), "_")
+        self.assertEqual(sanitize_profile_name(""), "")
+
+
+class TestTraceScreenshots(unittest.TestCase):
+    def test_collect_screenshots_from_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            trace = Path(tmp) / "rpa_trace.jsonl"
+            self.assertEqual(collect_screenshots_from_trace(trace), [])
+            trace.write_text(
+                '{"step":"open"}\n'
+                '{"screenshotPath":"a.png"}\n'
+                'not json "screenshotPath"\n'
+                '{"screenshotPath": "b.png"}\n'
+                '{"screenshotPath":"a.png"}\n'
+                '{"screenshotPath":""}\n',
+                encoding="utf-8",
+            )
+            self.assertEqual(collect_screenshots_from_trace(trace), ["a.png", "b.png"])
+
+
+class TestLooseKvObject(unittest.TestCase):
+    def test_flat_loose_object(self) -> None:
+        self.assertEqual(
+            _parse_loose_kv_object("{enabled:true,command:status,port:38200}"),
+            {"enabled": True, "command": "status", "port": 38200},
+        )
+        self.assertEqual(_parse_loose_kv_object("{}"), {})
+        self.assertIsNone(_parse_loose_kv_object("enabled:true"))
+
+    def test_nested_json_object(self) -> None:
+        self.assertEqual(_parse_loose_kv_object('{"a":{"b":1},"c":[1,2]}'), {"a": {"b": 1}, "c": [1, 2]})
+
+    def test_brackets_in_loose_values_stay_strings(self) -> None:
+        self.assertEqual(_parse_loose_kv_object("{sel:div[data-x],port:1}"), {"sel": "div[data-x]", "port": 1})
+        self.assertEqual(_parse_loose_kv_object("{a:[x],b:2}"), {"a": "[x]", "b": 2})
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _handle(self) -> None:
+        self.rfile.read(int(self.headers.get("content-length") or 0))
+        self.server.hits.append((self.command, self.path))
+        if self.path == "/drop":
+            # Ran the request, then lost the connection before answering.
+            self.close_connection = True
+            return
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # /idle-close: keep-alive response, then the server drops the idle connection anyway.
+        self.close_connection = self.path == "/idle-close"
+
+    do_GET = do_POST = _handle
+
+
+class TestJsonHttpRetries(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.hits = []
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        runner._drop_http_conn("127.0.0.1", self.server.server_address[1])
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _wait_closed(self) -> None:
+        conn = runner._HTTP_LOCAL.conns[("127.0.0.1", self.server.server_address[1])]
+        deadline = time.monotonic() + 5
+        while not runner._idle_conn_closed(conn) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_idle_closed_connection_is_replaced_before_sending(self) -> None:
+        self.assertEqual(runner._json_http("POST", f"{self.base}/idle-close", payload={}), {"ok": True})
+        self._wait_closed()
+        self.assertEqual(runner._json_http("POST", f"{self.base}/call", payload={}), {"ok": True})
+        self.assertEqual(self.server.hits, [("POST", "/idle-close"), ("POST", "/call")])
+
+    def test_post_is_not_resent_after_it_went_out(self) -> None:
+        self.assertEqual(runner._json_http("GET", f"{self.base}/health"), {"ok": True})
+        res = runner._json_http("POST", f"{self.base}/drop", payload={})
+        self.assertFalse(res["ok"])
+        self.assertEqual(self.server.hits, [("GET", "/health"), ("POST", "/drop")])
+
+    def test_get_is_resent_on_a_dropped_reused_connection(self) -> None:
+        runner._json_http("GET", f"{self.base}/health")
+        res = runner._json_http("GET", f"{self.base}/drop")
+        self.assertFalse(res["ok"])
+        self.assertEqual(self.server.hits, [("GET", "/health"), ("GET", "/drop"), ("GET", "/drop")])
+
+
+class TestLatestMarker(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        run_dir = self.root / "outputs" / "rpa_ts_skill" / "run1"
+        self.marker = self.root / "outputs" / "rpa_ts_skill" / "_latest.json"
+        self.ctx = SimpleNamespace(
+            skill_name="rpa_ts_skill",
+            run_id="run1",
+            agent_id="agent0",
+            config={"action": "inspectPage", "url": "https://example.com"},
+            platform=SimpleNamespace(root_dir=self.root, deps_dir=self.root / "deps"),
+            outputs_dir=run_dir / "agents" / "agent0" / "outputs",
+            shared_dir=run_dir / "shared",
+            work_dir=run_dir / "agents" / "agent0" / "work",
+        )
+        patcher = mock.patch.object(rpa_main, "run_rpaskill_ts", return_value={"response": {"blocked": False}})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        rpa_main._flush_markers()
+        self._tmp.cleanup()
+
+    def test_marker_written_on_flush(self) -> None:
+        with mock.patch.object(rpa_main, "_MARKER_DELAY_S", 60):
+            res = rpa_main.run(self.ctx)
+            self.assertEqual(res["status"], "ok")
+            # Coalesced: queued by the run, written by the flush.
+            self.assertIn(self.marker, rpa_main._PENDING_MARKERS)
+            rpa_main._flush_markers()
+        data = json.loads(self.marker.read_text(encoding="utf-8"))
+        self.assertEqual((data["skill"], data["run_id"], data["action"]), ("rpa_ts_skill", "run1", "inspectPage"))
+        self.assertEqual(data["paths"]["outputs_dir"], str(self.ctx.outputs_dir))
+        self.assertEqual(data["paths"]["captures_dir"], str(self.ctx.outputs_dir / "captures"))
+        self.assertEqual(data["payload_hints"]["url"], "https://example.com")
+        self.assertEqual(data["result_hints"], {"status": "ok"})
+        self.assertEqual(rpa_main._PENDING_MARKERS, {})
+
+    def test_timer_writes_the_last_marker(self) -> None:
+        with mock.patch.object(rpa_main, "_MARKER_DELAY_S", 0.05):
+            rpa_main.run(self.ctx)
+            self.ctx.run_id = "run2"
+            rpa_main.run(self.ctx)
+            deadline = time.monotonic() + 5
+            while not self.marker.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(json.loads(self.marker.read_text(encoding="utf-8"))["run_id"], "run2")
+
+    def test_marker_survives_a_cleaned_outputs_dir(self) -> None:
+        with mock.patch.object(rpa_main, "_MARKER_DELAY_S", 60):
+            rpa_main.run(self.ctx)
+            rpa_main._flush_markers()
+            shutil.rmtree(self.root / "outputs")
+            self.ctx.run_id = "run2"
+            rpa_main.run(self.ctx)
+            rpa_main._flush_markers()
+        self.assertEqual(json.loads(self.marker.read_text(encoding="utf-8"))["run_id"], "run2")
+
+    def test_run_dirs_are_absolute_and_cached(self) -> None:
+        rel = os.path.join("outputs", "sk", "run1")
+        dirs = rpa_main._run_dirs(rel, "shared", "work")
+        self.assertEqual(dirs["outputs_dir"], os.path.abspath(rel))
+        self.assertEqual(dirs["captures_dir"], os.path.join(os.path.abspath(rel), "captures"))
+        self.assertIs(rpa_main._run_dirs(rel, "shared", "work"), dirs)
+
+    def test_profile_dirs_are_created_once(self) -> None:
+        deps = str(self.root / "deps")
+        profile, state = rpa_main._resolve_profile(deps, "jd shop", "")
+        self.assertEqual(profile, os.path.join(deps, "browser_profiles", "jd_shop", "default"))
+        self.assertEqual(state, os.path.join(deps, "storage_states", "jd_shop", "default.json"))
+        self.assertTrue(os.path.isdir(profile))
+        self.assertTrue(os.path.isdir(os.path.dirname(state)))
+        with mock.patch.object(rpa_main, "ensure_dir") as ensure:
+            self.assertEqual(rpa_main._resolve_profile(deps, "jd shop", ""), (profile, state))
+        ensure.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
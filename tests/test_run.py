@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import math
+import unittest
+
+from run import _parse_override_value
+
+
+class TestParseOverrideValue(unittest.TestCase):
+    def test_json_values(self) -> None:
+        self.assertEqual(_parse_override_value("2"), 2)
+        self.assertEqual(_parse_override_value("-1.5"), -1.5)
+        self.assertIs(_parse_override_value("true"), True)
+        self.assertIsNone(_parse_override_value("null"))
+        self.assertEqual(_parse_override_value('"quoted"'), "quoted")
+        self.assertEqual(_parse_override_value('{"a":[1]}'), {"a": [1]})
+
+    def test_non_finite_floats(self) -> None:
+        self.assertTrue(math.isnan(_parse_override_value("NaN")))
+        self.assertEqual(_parse_override_value("Infinity"), math.inf)
+        self.assertEqual(_parse_override_value("-Infinity"), -math.inf)
+
+    def test_plain_and_invalid_values_stay_strings(self) -> None:
+        for v in ("laptops", "", "True", "nan", "1abc", "[broken", "-x"):
+            self.assertEqual(_parse_override_value(v), v)
+
+
+if __name__ == "__main__":
+    unittest.main()
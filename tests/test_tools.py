@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import contextlib
+import http.client
+import http.server
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+_TOOLS = Path(__file__).resolve().parents[1] / "tools"
+
+
+def _load_tool(name: str):
+    # tools/ is a folder of scripts, not a package; they import their shared helpers as siblings.
+    if str(_TOOLS) not in sys.path:
+        sys.path.insert(0, str(_TOOLS))
+    spec = importlib.util.spec_from_file_location(f"_tool_{name}", _TOOLS / f"{name}.py")
+    mod = importlib.util.module_from_spec(spec)
+    # dataclasses look their module up in sys.modules.
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class TestQueryEvents(unittest.TestCase):
+    def setUp(self) -> None:
+        self.qe = _load_tool("query_events")
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _log(self, agent: str, *lines: str) -> None:
+        d = self.root / "outputs" / "sk" / "run1" / "agents" / agent
+        d.mkdir(parents=True, exist_ok=True)
+        (d / "events.jsonl").write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+    def _query(self, *argv: str) -> list[str]:
+        out = io.StringIO()
+        old = sys.argv
+        sys.argv = ["query_events", "--root", str(self.root), *argv]
+        try:
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(self.qe.main(), 0)
+        finally:
+            sys.argv = old
+        return out.getvalue().splitlines()
+
+    def test_contains_matches_canonical_json_text(self) -> None:
+        # Compact (orjson-style) and stdlib-style lines are matched and printed the same way.
+        self._log("a0", '{"event":"skill.start","n":1}', '{"event": "skill.end", "n": 2}')
+        self.assertEqual(self._query("--contains", '"event": "skill.start"'), ['{"event": "skill.start", "n": 1}'])
+        self.assertEqual(self._query("--contains", '"n": 2'), ['{"event": "skill.end", "n": 2}'])
+
+    def test_contains_sees_unescaped_and_reformatted_values(self) -> None:
+        self._log("a0", '{"event":"x","message":"\\u77e5\\u7f51"}', '{"event":"y","v":1e-5}')
+        self.assertEqual(self._query("--contains", "知网"), ['{"event": "x", "message": "知网"}'])
+        self.assertEqual(self._query("--contains", "1e-05"), ['{"event": "y", "v": 1e-05}'])
+
+    def test_several_needles_and_event_filter(self) -> None:
+        self._log("a0", '{"event":"a","m":"alpha"}', '{"event":"b","m":"beta"}', '{"event":"a","m":"gamma"}')
+        self._log("a1", '{"event":"a","m":"beta"}', "not json")
+        self.assertEqual(len(self._query("--contains", "alpha", "beta")), 3)
+        self.assertEqual(
+            self._query("--event", "a", "--contains", "beta", "gamma"),
+            ['{"event": "a", "m": "gamma"}', '{"event": "a", "m": "beta"}'],
+        )
+        self.assertEqual(len(self._query("--limit", "2")), 2)
+
+    def test_raw_needles_skip_unsafe_needles(self) -> None:
+        self.assertEqual(self.qe._raw_needles("x", ["alpha"]), ([b'"x"'], [b"alpha"]))
+        # Punctuation, spacing and digits may be written differently on disk.
+        for needle in ('"event": "x"', "a b", "1e-05", "k:v"):
+            self.assertEqual(self.qe._raw_needles(None, ["alpha", needle]), ([], []))
+
+
+class TestListRuns(unittest.TestCase):
+    def test_status_cache_lives_outside_the_run_tree(self) -> None:
+        lr = _load_tool("list_runs")
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            agent = root / "outputs" / "sk" / "run1" / "agents" / "a0"
+            agent.mkdir(parents=True)
+            (agent / "result.json").write_text('{\n  "status": "ok",\n  "data": {}\n}\n', encoding="utf-8")
+
+            out = io.StringIO()
+            old = sys.argv
+            sys.argv = ["list_runs", "--root", str(root)]
+            try:
+                with contextlib.redirect_stdout(out):
+                    self.assertEqual(lr.main(), 0)
+            finally:
+                sys.argv = old
+            self.assertEqual(out.getvalue().splitlines()[1].split(), ["sk", "run1", "a0", "ok"])
+            self.assertTrue((root / ".cache" / "list_runs.json").is_file())
+            self.assertEqual(sorted(p.name for p in (root / "outputs").iterdir()), ["sk"])
+
+
+class TestValidateCodexSkills(unittest.TestCase):
+    def setUp(self) -> None:
+        self.v = _load_tool("validate_codex_skills")
+
+    def test_frontmatter_keys_fast_path(self) -> None:
+        text = '﻿---\r\nname: "a b"\r\ndescription: plain text\r\n---\r\nbody'
+        self.assertEqual(self.v._frontmatter_keys(text), {"name": "a b", "description": "plain text"})
+
+    def test_frontmatter_keys_leave_yaml_only_syntax_to_yaml(self) -> None:
+        for text in (
+            "---\nname: foo # comment\ndescription: x\n---\n",
+            "---\nname: a\ndescription: [x, y]\n---\n",
+            "---\nname: a\ndescription: {k: v}\n---\n",
+            "---\nname: a\ndescription: >\n  folded\n---\n",
+            "---\nname: a\ndescription:\n  - item\n---\n",
+            "---\nname: a\ndescription: one\n  two\n---\n",
+            "---\nname: 'it''s'\ndescription: d\n---\n",
+        ):
+            self.assertEqual(self.v._frontmatter_keys(text), {}, text)
+            # What the fast path declines, YAML still parses.
+            self.assertIn("description", self.v._parse_frontmatter(text), text)
+
+    def test_read_frontmatter_head(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            p = Path(tmp) / "SKILL.md"
+            p.write_bytes(b"---\nname: a\ndescription: b\n---\n" + b"x" * 50_000)
+            self.assertEqual(self.v._read_frontmatter_head(p, chunk=16), "---\nname: a\ndescription: b\n---\n")
+            p.write_bytes(b"# no frontmatter\n")
+            self.assertIsNone(self.v._read_frontmatter_head(p))
+            p.write_bytes(b"---\nname: a\n")
+            self.assertIsNone(self.v._read_frontmatter_head(p))
+
+
+class _SessionHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        params = json.loads(self.rfile.read(int(self.headers.get("content-length") or 0)))["params"]
+        self.server.calls.append(params)
+        if params == "drop":
+            # Ran the call, then lost the connection before answering.
+            self.close_connection = True
+            return
+        body = json.dumps({"ok": True, "result": params}).encode()
+        self.send_response(200)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # "idle-close": keep-alive response, then the server drops the idle connection anyway.
+        self.close_connection = params == "idle-close"
+
+
+class TestCnkiSessionHttp(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cnki = _load_tool("cnki_ai_trends_session")
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _SessionHandler)
+        self.server.calls = []
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.session = self.cnki.SessionState(base_url=f"http://127.0.0.1:{self.server.server_address[1]}")
+
+    def tearDown(self) -> None:
+        for conn in self.cnki._CONNS.values():
+            conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_idle_closed_connection_is_replaced_before_sending(self) -> None:
+        self.assertEqual(self.cnki.call(self.session, "click", "idle-close"), "idle-close")
+        (conn,) = self.cnki._CONNS.values()
+        deadline = time.monotonic() + 5
+        while not self.cnki._idle_conn_closed(conn) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.cnki.call(self.session, "click", "next"), "next")
+        self.assertEqual(self.server.calls, ["idle-close", "next"])
+
+    def test_call_is_not_resent_after_it_went_out(self) -> None:
+        self.cnki.call(self.session, "getUrl", [])
+        with self.assertRaises(http.client.RemoteDisconnected):
+            self.cnki.call(self.session, "click", "drop")
+        self.assertEqual(self.server.calls, [[], "drop"])
+
+
+class TestCnkiWaitUntilNotVerify(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cnki = _load_tool("cnki_ai_trends_session")
+        self.session = self.cnki.SessionState(base_url="http://127.0.0.1:1")
+
+    def _fake_call(self, long_poll_error: Exception, urls: list[str]):
+        methods: list[str] = []
+
+        def fake(session, method, params, *, timeout_s=60.0):
+            methods.append(method)
+            if method == "waitForUrlPredicate":
+                raise long_poll_error
+            return urls.pop(0)
+
+        return fake, methods
+
+    def test_long_poll(self) -> None:
+        with mock.patch.object(self.cnki, "call", return_value={"matched": True, "url": "https://kns.cnki.net/"}):
+            self.assertEqual(self.cnki.wait_until_not_verify(self.session), "https://kns.cnki.net/")
+
+    def test_older_server_falls_back_to_polling(self) -> None:
+        fake, methods = self._fake_call(
+            self.cnki.UnsupportedMethodError("method not allowed"),
+            ["https://kns.cnki.net/verify/home", "https://kns.cnki.net/kns8s/"],
+        )
+        with mock.patch.object(self.cnki, "call", side_effect=fake):
+            self.assertEqual(
+                self.cnki.wait_until_not_verify(self.session, timeout_s=5, poll_s=0), "https://kns.cnki.net/kns8s/"
+            )
+        self.assertEqual(methods, ["waitForUrlPredicate", "getUrl", "getUrl"])
+
+    def test_server_errors_do_not_restart_the_wait(self) -> None:
+        fake, methods = self._fake_call(RuntimeError("session call failed: page crashed"), [])
+        with mock.patch.object(self.cnki, "call", side_effect=fake):
+            with self.assertRaises(RuntimeError):
+                self.cnki.wait_until_not_verify(self.session, timeout_s=5, poll_s=0)
+        self.assertEqual(methods, ["waitForUrlPredicate"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Helpers shared by the scripts in tools/ (imported as a sibling module: `python tools/<script>.py`
+puts this folder on sys.path).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+# Bounded: each worker holds one open file.
+WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def subdirs(path: str | os.PathLike[str]) -> list[os.DirEntry[str]]:
+    """
+    Child directories of `path`, in the order sorted(Path.iterdir()) gave.
+
+    DirEntry.is_dir() reuses the type info readdir/FindFirstFile already returned, so unlike
+    Path.is_dir() it costs no extra stat() per entry.
+    """
+    try:
+        with os.scandir(path) as it:
+            dirs = [e for e in it if e.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    # normcase: Windows paths sort case-insensitively, as Path objects did.
+    dirs.sort(key=lambda e: os.path.normcase(e.name))
+    return dirs
+
+
+def cache_path(root: str | os.PathLike[str], name: str) -> Path:
+    """Where a tool keeps results between invocations: <project root>/.cache/<name>."""
+    return Path(root) / ".cache" / name
+
+
+def load_cache(path: Path) -> dict[str, list]:
+    try:
+        data = json.loads(path.read_bytes())
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_cache(path: Path, cache: dict[str, list]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception:
+        # best-effort
+        pass
@@ -20,12 +20,26 @@ Notes:
 import json
 import argparse
 import html as _html
+import http.client
+import os
+import re
+import select
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Iterable
-from urllib import request
+from urllib.parse import urlsplit
+
+try:
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    ijson = None  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
 
 
 @dataclass
@@ -38,7 +52,9 @@ def _utc_ts() -> str:
 
 
 def _read_json(path: Path) -> dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    # Both parsers take UTF-8 bytes directly: no separate decode pass.
+    data = path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
 
 def _write_text(path: Path, text: str) -> None:
@@ -46,24 +62,82 @@ def _write_text(path: Path, text: str) -> None:
     path.write_text(text, encoding="utf-8")
 
 
+def _write_bytes(path: Path, data: bytes | bytearray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+# One keep-alive connection per session server: call() runs dozens of times per CNKI run.
+_CONNS: dict[tuple[str, int], http.client.HTTPConnection] = {}
+
+
+def _idle_conn_closed(conn: http.client.HTTPConnection) -> bool:
+    """True if an idle keep-alive socket is readable, i.e. the server has closed (or reset) it."""
+    sock = conn.sock
+    if sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
 def _http_json_post(url: str, payload: dict[str, Any], timeout_s: float = 60.0) -> dict[str, Any]:
     data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    req = request.Request(
-        url,
-        data=data,
-        headers={"content-type": "application/json; charset=utf-8"},
-        method="POST",
-    )
-    with request.urlopen(req, timeout=timeout_s) as resp:
-        raw = resp.read().decode("utf-8", errors="replace")
-    return json.loads(raw)
+    parts = urlsplit(url)
+    key = (parts.hostname or "127.0.0.1", parts.port or 80)
+    headers = {"content-type": "application/json; charset=utf-8", "connection": "keep-alive"}
+    for attempt in (0, 1):
+        conn = _CONNS.get(key)
+        if conn is not None and _idle_conn_closed(conn):
+            # The server closed the idle connection (Node: after 5s); reconnect before sending.
+            _CONNS.pop(key).close()
+            conn = None
+        reused = conn is not None
+        if conn is None:
+            conn = _CONNS[key] = http.client.HTTPConnection(*key, timeout=timeout_s)
+        conn.timeout = timeout_s
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout_s)
+        try:
+            conn.request("POST", parts.path or "/", body=data, headers=headers)
+        except (BrokenPipeError, ConnectionResetError):
+            # Closed before reading the request, so it never ran; send it once more on a fresh one.
+            _CONNS.pop(key, None).close()
+            if reused and attempt == 0:
+                continue
+            raise
+        except Exception:
+            _CONNS.pop(key, None).close()
+            raise
+        try:
+            raw = conn.getresponse().read().decode("utf-8", errors="replace")
+        except Exception:
+            # Not retried: /call runs clicks and form fills, which the server may already have done.
+            _CONNS.pop(key, None).close()
+            raise
+        # Error statuses still carry the server's {"ok": false, "error": ...} body; call() raises on it.
+        return json.loads(raw)
+    raise RuntimeError("unreachable")
+
 
+class UnsupportedMethodError(RuntimeError):
+    """The session server (e.g. a warm one started by an older build) does not expose the method."""
 
-def call(session: SessionState, method: str, params: Any) -> Any:
+
+def call(session: SessionState, method: str, params: Any, *, timeout_s: float = 60.0) -> Any:
     # session_server accepts either list params or a single object; prefer list for multi-arg methods.
-    res = _http_json_post(f"{session.base_url.rstrip('/')}/call", {"method": method, "params": params})
+    res = _http_json_post(
+        f"{session.base_url.rstrip('/')}/call",
+        {"method": method, "params": params},
+        timeout_s=timeout_s,
+    )
     if not res.get("ok"):
-        raise RuntimeError(f"session call failed: {res.get('error')}")
+        err = str(res.get("error") or "")
+        if err.startswith("method not allowed"):
+            raise UnsupportedMethodError(f"session call failed: {err}")
+        raise RuntimeError(f"session call failed: {err}")
     return res.get("result")
 
 
@@ -76,13 +150,34 @@ def _load_session_state(root: Path, run_id: str) -> SessionState:
     return SessionState(base_url=base_url)
 
 
+# Shared with the session server's waitForUrlPredicate so both sides agree on "still verifying".
+_VERIFY_URL_PATTERN = r"verify/home|captcha|ident="
+_VERIFY_RE = re.compile(_VERIFY_URL_PATTERN)
+
+
 def _looks_like_verify(url: str) -> bool:
-    u = (url or "").lower()
-    return "verify/home" in u or "captcha" in u or "ident=" in u
+    # One regex pass over the lowercased URL instead of three substring scans.
+    return _VERIFY_RE.search((url or "").lower()) is not None
 
 
 def wait_until_not_verify(session: SessionState, *, timeout_s: float = 600.0, poll_s: float = 2.5) -> str:
     deadline = time.time() + timeout_s
+    # One long-poll RPC: the session server returns as soon as the page leaves the verify URL.
+    try:
+        res = call(
+            session,
+            "waitForUrlPredicate",
+            [_VERIFY_URL_PATTERN, {"negate": True, "timeout": int(timeout_s * 1000)}],
+            timeout_s=timeout_s + 30.0,
+        ) or {}
+        last = str(res.get("url") or "")
+        if res.get("matched") and last:
+            return last
+        raise TimeoutError(f"Timed out waiting for verification to clear. last_url={last!r}")
+    except UnsupportedMethodError:
+        # Session servers started by an older build don't expose waitForUrlPredicate; poll instead.
+        pass
+
     last = ""
     while time.time() < deadline:
         try:
@@ -96,23 +191,26 @@ def wait_until_not_verify(session: SessionState, *, timeout_s: float = 600.0, po
 
 
 def pick_best_text(items: Iterable[str]) -> str:
-    best = ""
-    for s in items:
-        t = str(s or "").strip()
-        if len(t) > len(best):
-            best = t
-    return best
+    # max() keeps the first of equally long candidates, like the original loop.
+    return max((str(s or "").strip() for s in items), key=len, default="")
 
 
-def parse_visible_links(elements_path: Path) -> list[dict[str, str]]:
+def _iter_elements(elements_path: Path) -> Iterable[Any]:
+    if ijson is not None:
+        # Stream `elements[*]` one at a time instead of materializing the whole dump.
+        with elements_path.open("rb") as fh:
+            yield from ijson.items(fh, "elements.item")
+        return
     obj = _read_json(elements_path)
     elements = obj.get("elements") if isinstance(obj, dict) else None
-    out: list[dict[str, str]] = []
-    if not isinstance(elements, list):
-        return out
+    if isinstance(elements, list):
+        yield from elements
 
+
+def parse_visible_links(elements_path: Path) -> list[dict[str, str]]:
+    out: list[dict[str, str]] = []
     seen: set[str] = set()
-    for el in elements:
+    for el in _iter_elements(elements_path):
         if not isinstance(el, dict):
             continue
         if str(el.get("tag") or "").lower() != "a":
@@ -134,6 +232,168 @@ def _safe_get(items: list[str], i: int) -> str:
     return ""
 
 
+def _fill_query(session: SessionState, selectors: list[str], query: str) -> tuple[bool, str]:
+    """Fill the first present query input; returns (filled, selector used)."""
+    # One RPC: the session server tries the candidates in order and fills the first one present.
+    # input/keyup events afterwards trigger CNKI's listeners (it sometimes depends on key events)
+    # without typing Space/Backspace into the field.
+    try:
+        res = call(
+            session,
+            "fillFirstMatching",
+            [selectors, query, {"timeout": 3000, "dispatchAfter": ["input", "keyup"]}],
+            timeout_s=120.0,
+        ) or {}
+        return bool(res.get("ok")), str(res.get("usedSelector") or "")
+    except UnsupportedMethodError:
+        pass
+    except Exception:
+        return False, ""
+
+    # Older session servers: one selector at a time.
+    for sel in selectors:
+        try:
+            # Prefer fill() so non-ASCII text is set correctly, then trigger events.
+            call(session, "click", [sel, {"timeout": 3000}])
+            call(session, "input", [sel, "", {"timeout": 3000}])
+            call(session, "input", [sel, query, {"timeout": 10000}])
+            # Trigger input listeners (CNKI sometimes depends on key events)
+            call(session, "press", ["Space", {"delay": 40}])
+            call(session, "press", ["Backspace", {"delay": 40}])
+            return True, sel
+        except Exception:
+            continue
+    return False, ""
+
+
+def _selector_text(spec: str | dict[str, str]) -> str:
+    # {"css", "hasText"} specs as a Playwright text selector, for servers without clickFirstMatching.
+    if isinstance(spec, dict):
+        return f"{spec['css']}:has-text('{spec['hasText']}')"
+    return spec
+
+
+def _click_search(session: SessionState, selectors: list[str | dict[str, str]]) -> bool:
+    try:
+        res = call(
+            session,
+            "clickFirstMatching",
+            [selectors, {"timeout": 5000, "force": True}],
+            timeout_s=120.0,
+        ) or {}
+        return bool(res.get("ok"))
+    except UnsupportedMethodError:
+        pass
+    except Exception:
+        return False
+
+    # Older session servers: one selector at a time.
+    for spec in selectors:
+        try:
+            call(session, "click", [_selector_text(spec), {"timeout": 5000, "force": True}])
+            return True
+        except Exception:
+            continue
+    return False
+
+
+_ROW_SELECTOR = "#gridTable table.result-table-list tbody tr"
+
+
+def _capture_results(session: SessionState, screenshot_path: str, html_path: str) -> dict[str, Any]:
+    """
+    Screenshot + HTML of the current page and the result-table columns, without reloading it.
+
+    Returns url, titles, urls, authors, sources, dates, opTexts and opHrefs.
+    """
+    out: dict[str, Any] = {
+        "url": "",
+        "titles": [],
+        "urls": [],
+        "authors": [],
+        "sources": [],
+        "dates": [],
+        "opTexts": [],
+        "opHrefs": [],
+    }
+    # One captureBundle call covers all of it.
+    try:
+        bundle = call(
+            session,
+            "captureBundle",
+            [
+                {
+                    "screenshotPath": screenshot_path,
+                    "htmlPath": html_path,
+                    "rowSelector": _ROW_SELECTOR,
+                    "columns": {
+                        "title": {"selector": "td.name a.fz14"},
+                        "href": {"selector": "td.name a.fz14", "attr": "href"},
+                        "author": {"selector": "td.author"},
+                        "source": {"selector": "td.source"},
+                        "date": {"selector": "td.date"},
+                        "opTexts": {"selector": "td.operat a", "all": True},
+                        "opHrefs": {"selector": "td.operat a", "attr": "href", "all": True},
+                    },
+                }
+            ],
+        ) or {}
+    except UnsupportedMethodError:
+        return _capture_results_legacy(session, screenshot_path, html_path, out)
+    except Exception as e:
+        print("WARN: failed to extract structured results:", e)
+        return out
+
+    out["url"] = str(bundle.get("url") or "")
+    for part, err in (bundle.get("errors") or {}).items():
+        print(f"WARN: capture {part} failed:", err)
+    for row in bundle.get("rows") or []:
+        out["opTexts"].extend(row.get("opTexts") or [])
+        out["opHrefs"].extend(row.get("opHrefs") or [])
+        # Rows without a title link (headers, ads) are not results.
+        if row.get("title") is None:
+            continue
+        out["titles"].append(row["title"])
+        out["urls"].append(row.get("href") or "")
+        out["authors"].append(row.get("author") or "")
+        out["sources"].append(row.get("source") or "")
+        out["dates"].append(row.get("date") or "")
+    return out
+
+
+def _capture_results_legacy(
+    session: SessionState, screenshot_path: str, html_path: str, out: dict[str, Any]
+) -> dict[str, Any]:
+    # Older session servers: one call per part and per column.
+    try:
+        out["url"] = str(call(session, "getUrl", []))
+    except Exception as e:
+        print("WARN: getUrl failed:", e)
+    try:
+        call(session, "captureScreenshot", [screenshot_path])
+    except Exception as e:
+        print("WARN: captureScreenshot failed:", e)
+    try:
+        _write_text(Path(html_path), str(call(session, "extractPageSource", [])))
+    except Exception as e:
+        print("WARN: extractPageSource failed:", e)
+    try:
+        out["titles"] = call(session, "extractAllText", [f"{_ROW_SELECTOR} td.name a.fz14", {}]) or []
+        out["urls"] = call(session, "extractAllAttributes", [f"{_ROW_SELECTOR} td.name a.fz14", "href", {}]) or []
+        out["authors"] = call(session, "extractAllText", [f"{_ROW_SELECTOR} td.author", {}]) or []
+        out["sources"] = call(session, "extractAllText", [f"{_ROW_SELECTOR} td.source", {}]) or []
+        out["dates"] = call(session, "extractAllText", [f"{_ROW_SELECTOR} td.date", {}]) or []
+    except Exception as e:
+        print("WARN: failed to extract structured results:", e)
+    try:
+        out["opTexts"] = call(session, "extractAllText", [f"{_ROW_SELECTOR} td.operat a", {}]) or []
+        out["opHrefs"] = call(session, "extractAllAttributes", [f"{_ROW_SELECTOR} td.operat a", "href", {}]) or []
+    except Exception:
+        # best-effort
+        pass
+    return out
+
+
 def main() -> int:
     root = Path(__file__).resolve().parents[1]
 
@@ -177,10 +437,7 @@ def main() -> int:
             "maxElements": 400,
             "detectBlockers": True,
             # keep capture files in the run output dir for easy discovery
-            "capturePrefix": str(
-                (root / "outputs" / "rpa_ts_run_profile" / run_id / "agents" / "agent0" / "captures" / "cnki_adv")
-                .resolve()
-            ),
+            "capturePrefix": str(root / "outputs" / "rpa_ts_run_profile" / run_id / "agents" / "agent0" / "captures" / "cnki_adv"),
         },
     )
 
@@ -211,22 +468,7 @@ def main() -> int:
         "input[type='text']",
     ]
 
-    filled = False
-    used_sel = ""
-    for sel in input_selectors:
-        try:
-            # Prefer fill() so non-ASCII text is set correctly, then trigger events.
-            call(session, "click", [sel, {"timeout": 3000}])
-            call(session, "input", [sel, "", {"timeout": 3000}])
-            call(session, "input", [sel, query, {"timeout": 10000}])
-            # Trigger input listeners (CNKI sometimes depends on key events)
-            call(session, "press", ["Space", {"delay": 40}])
-            call(session, "press", ["Backspace", {"delay": 40}])
-            filled = True
-            used_sel = sel
-            break
-        except Exception:
-            continue
+    filled, used_sel = _fill_query(session, input_selectors, query)
 
     if not filled:
         print("WARN: could not find the query input reliably. Capturing page for debugging...")
@@ -234,24 +476,17 @@ def main() -> int:
     # Try common search buttons
     button_selectors = [
         "div.search-buttons input.btn-search",
-        "button:has-text('检索')",
-        "button:has-text('搜索')",
-        "a:has-text('检索')",
-        "a:has-text('搜索')",
+        {"css": "button", "hasText": "检索"},
+        {"css": "button", "hasText": "搜索"},
+        {"css": "a", "hasText": "检索"},
+        {"css": "a", "hasText": "搜索"},
         "input.btn-search",
         "input.search-btn",
         "#btnSearch",
         "input[type='submit']",
     ]
 
-    clicked = False
-    for sel in button_selectors:
-        try:
-            call(session, "click", [sel, {"timeout": 5000, "force": True}])
-            clicked = True
-            break
-        except Exception:
-            continue
+    clicked = _click_search(session, button_selectors)
 
     if not clicked:
         print("WARN: could not click search button reliably. You may need to click it manually in the browser.")
@@ -285,65 +520,27 @@ def main() -> int:
     # IMPORTANT: Do NOT call inspectPage() here.
     # inspectPage() will do a page.goto(url) which reloads CNKI and may erase the current search results
     # (CNKI often renders results under the same /AdvSearch URL using in-page state).
-    result_url = str(call(session, "getUrl", []))
-
-    # Capture "what we see" + "DOM snapshot" for debugging / multimodal post-analysis.
-    screenshot_path = str(Path(f"{cap_prefix}_screenshot.png").resolve())
-    html_path = str(Path(f"{cap_prefix}_page.html").resolve())
-    try:
-        call(session, "captureScreenshot", [screenshot_path])
-    except Exception as e:
-        print("WARN: captureScreenshot failed:", e)
-    try:
-        page_html = str(call(session, "extractPageSource", []))
-        _write_text(Path(html_path), page_html)
-    except Exception as e:
-        print("WARN: extractPageSource failed:", e)
-
-    # Step 5: Extract structured results (more reliable than "visible links").
-    titles: list[str] = []
-    urls: list[str] = []
-    authors: list[str] = []
-    sources: list[str] = []
-    dates: list[str] = []
-    try:
-        titles = call(session, "extractAllText", ["#gridTable table.result-table-list tbody tr td.name a.fz14", {}]) or []
-        urls = call(
-            session,
-            "extractAllAttributes",
-            ["#gridTable table.result-table-list tbody tr td.name a.fz14", "href", {}],
-        ) or []
-        authors = call(session, "extractAllText", ["#gridTable table.result-table-list tbody tr td.author", {}]) or []
-        sources = call(session, "extractAllText", ["#gridTable table.result-table-list tbody tr td.source", {}]) or []
-        dates = call(session, "extractAllText", ["#gridTable table.result-table-list tbody tr td.date", {}]) or []
-    except Exception as e:
-        print("WARN: failed to extract structured results:", e)
+    # Capture "what we see" + "DOM snapshot" for debugging / multimodal post-analysis, and
+    # extract structured results (more reliable than "visible links"), all in one captureBundle call.
+    screenshot_path = os.path.abspath(f"{cap_prefix}_screenshot.png")
+    html_path = os.path.abspath(f"{cap_prefix}_page.html")
+    results = _capture_results(session, screenshot_path, html_path)
+    result_url = results["url"]
+    titles, urls = results["titles"], results["urls"]
+    authors, sources, dates = results["authors"], results["sources"], results["dates"]
+    op_texts, op_hrefs = results["opTexts"], results["opHrefs"]
 
     # Extract a lightweight "element map" (subset) from the results table.
     # This is a practical replacement for inspectPage(includeElements=true) in session flows.
     element_map: dict[str, Any] = {"url": result_url, "ts": _utc_ts(), "titleLinks": []}
-    try:
-        op_texts = call(
-            session,
-            "extractAllText",
-            ["#gridTable table.result-table-list tbody tr td.operat a", {}],
-        ) or []
-        op_hrefs = call(
-            session,
-            "extractAllAttributes",
-            ["#gridTable table.result-table-list tbody tr td.operat a", "href", {}],
-        ) or []
-        element_map["opLinksSample"] = [
-            {"text": _safe_get(op_texts, i), "href": _safe_get(op_hrefs, i)} for i in range(min(30, len(op_hrefs)))
-        ]
-    except Exception:
-        # best-effort
-        pass
+    element_map["opLinksSample"] = [
+        {"text": _safe_get(op_texts, i), "href": _safe_get(op_hrefs, i)} for i in range(min(30, len(op_hrefs)))
+    ]
 
     for i in range(min(len(titles), len(urls), int(args.max_items))):
         element_map["titleLinks"].append({"title": _safe_get(titles, i), "href": _safe_get(urls, i)})
 
-    elements_json_path = str(Path(f"{cap_prefix}_elements.json").resolve())
+    elements_json_path = os.path.abspath(f"{cap_prefix}_elements.json")
     try:
         _write_text(Path(elements_json_path), json.dumps(element_map, ensure_ascii=False, indent=2))
     except Exception:
@@ -352,22 +549,28 @@ def main() -> int:
     # Compose report
     report_dir = root / "outputs" / "cnki_ai_recent"
     report_path = report_dir / "report.md"
-    lines = []
-    lines.append(f"# CNKI 最近 AI 发展情况（自动抓取草稿）")
-    lines.append("")
-    lines.append(f"- ts: {_utc_ts()}")
-    lines.append(f"- query: {query}")
-    lines.append(f"- sessionRunId: {run_id}")
-    lines.append(f"- resultPageUrl: {result_url}")
-    lines.append(f"- capturePrefix: {cap_prefix}")
-    lines.append(f"- screenshot: {screenshot_path}")
-    lines.append(f"- html: {html_path}")
-    lines.append(f"- elements: {elements_json_path}")
-    lines.append("")
+    # Encoded as it is built: one bytes buffer instead of a list of lines, a join and a final encode.
+    buf = bytearray()
+
+    def w(line: str = "") -> None:
+        buf.extend(line.encode("utf-8"))
+        buf.append(0x0A)
+
+    w(f"# CNKI 最近 AI 发展情况（自动抓取草稿）")
+    w()
+    w(f"- ts: {_utc_ts()}")
+    w(f"- query: {query}")
+    w(f"- sessionRunId: {run_id}")
+    w(f"- resultPageUrl: {result_url}")
+    w(f"- capturePrefix: {cap_prefix}")
+    w(f"- screenshot: {screenshot_path}")
+    w(f"- html: {html_path}")
+    w(f"- elements: {elements_json_path}")
+    w()
 
     if titles and urls:
-        lines.append("## 检索结果（结构化提取：题名/作者/来源/时间）")
-        lines.append("")
+        w("## 检索结果（结构化提取：题名/作者/来源/时间）")
+        w()
         n = min(int(args.max_items), len(titles), len(urls))
         for i in range(n):
             t = _html.unescape(_safe_get(titles, i))
@@ -375,21 +578,21 @@ def main() -> int:
             a = " ".join(_safe_get(authors, i).split())
             s = " ".join(_safe_get(sources, i).split())
             d = _safe_get(dates, i)
-            lines.append(f"{i+1}. {t}")
+            w(f"{i+1}. {t}")
             if a:
-                lines.append(f"   - 作者: {a}")
+                w(f"   - 作者: {a}")
             if s:
-                lines.append(f"   - 来源: {s}")
+                w(f"   - 来源: {s}")
             if d:
-                lines.append(f"   - 时间: {d}")
+                w(f"   - 时间: {d}")
             if u:
-                lines.append(f"   - {u}")
-        lines.append("")
+                w(f"   - {u}")
+        w()
 
     if not titles or not urls:
-        lines.append("(未能自动提取到结果列表；可能仍在验证页/或 DOM 结构变化。请查看 captures 里的 screenshot/html/elements.json)")
+        w("(未能自动提取到结果列表；可能仍在验证页/或 DOM 结构变化。请查看 captures 里的 screenshot/html/elements.json)")
 
-    _write_text(report_path, "\n".join(lines) + "\n")
+    _write_bytes(report_path, buf)
     print("Wrote report:", report_path)
     return 0
 
@@ -1,12 +1,60 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _common import WORKERS, cache_path, load_cache, save_cache, subdirs
 
-def _read_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
+
+# Statuses from earlier invocations, keyed by result.json path and valid while (mtime_ns, size) match.
+# Kept under <root>/.cache/, outside the run tree this tool only reads.
+_CACHE_NAME = "list_runs.json"
+
+
+# result.json is written with two-space indentation (runtime write_json, orjson or stdlib), so
+# a top-level key is the only one at exactly two spaces; nested "status" keys sit deeper.
+_TOP_STATUS_RE = re.compile(rb'^  "status": "([^"\\\n]*)",?\r?$', re.M)
+
+
+def _read_status(result: str) -> str:
+    try:
+        with open(result, "rb") as fh:
+            data = fh.read()
+        m = _TOP_STATUS_RE.search(data)
+        if m:
+            return m.group(1).decode("utf-8")
+        # Compact/hand-written files, escaped or non-string statuses: parse properly.
+        obj = orjson.loads(data) if orjson is not None else json.loads(data)
+        return str(obj.get("status", "-"))
+    except Exception:
+        return "bad-json"
+
+
+def _load_status(result: str, cache: dict[str, list], seen: dict[str, list]) -> str:
+    key = result
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        return "-"
+    hit = cache.get(key)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        status = str(hit[2])
+    else:
+        status = _read_status(result)
+    # Plain dict stores are atomic; workers never write the same key.
+    seen[key] = [st.st_mtime_ns, st.st_size, status]
+    return status
 
 
 def main() -> int:
@@ -21,40 +69,45 @@ def main() -> int:
         print(f"outputs not found: {outputs}")
         return 2
 
-    skills = [outputs / args.skill] if args.skill else [p for p in outputs.iterdir() if p.is_dir()]
-
-    rows: list[tuple[str, str, str, str]] = []
-    for skill_dir in sorted(skills):
-        if not skill_dir.exists():
-            continue
-        skill = skill_dir.name
-        for run_dir in sorted([p for p in skill_dir.iterdir() if p.is_dir()]):
-            run_id = run_dir.name
-            agents_dir = run_dir / "agents"
-            if not agents_dir.exists():
-                continue
-            for agent_dir in sorted([p for p in agents_dir.iterdir() if p.is_dir()]):
-                agent = agent_dir.name
-                result = agent_dir / "result.json"
-                status = "-"
-                if result.exists():
-                    try:
-                        status = str(_read_json(result).get("status", "-"))
-                    except Exception:
-                        status = "bad-json"
-                rows.append((skill, run_id, agent, status))
+    if args.skill:
+        skills = [(args.skill, str(outputs / args.skill))]
+    else:
+        skills = [(e.name, e.path) for e in subdirs(outputs)]
+
+    # Plain strings all the way down: os.stat/open take them as-is, no Path object per entry.
+    found: list[tuple[str, str, str, str]] = []
+    for skill, skill_path in skills:
+        for run_entry in subdirs(skill_path):
+            for agent_entry in subdirs(os.path.join(run_entry.path, "agents")):
+                found.append((skill, run_entry.name, agent_entry.name, os.path.join(agent_entry.path, "result.json")))
+
+    cache_file = cache_path(root, _CACHE_NAME)
+    cache = load_cache(cache_file)
+    seen: dict[str, list] = {}
+    # result.json reads are independent small I/O; overlap them. map() keeps the listing order.
+    with ThreadPoolExecutor(max_workers=WORKERS) as ex:
+        statuses = list(ex.map(functools.partial(_load_status, cache=cache, seen=seen), [f[3] for f in found]))
+    # A full listing rebuilds the cache (dropping deleted runs); a --skill listing only updates it.
+    new_cache = seen if not args.skill else {**cache, **seen}
+    if new_cache != cache:
+        save_cache(cache_file, new_cache)
+    rows = [(skill, run_id, agent, st) for (skill, run_id, agent, _), st in zip(found, statuses)]
 
     if not rows:
         print("(no runs found)")
         return 0
 
-    # Simple fixed-width table
-    w1 = max(len(r[0]) for r in rows)
-    w2 = max(len(r[1]) for r in rows)
-    w3 = max(len(r[2]) for r in rows)
-    print(f"{'skill'.ljust(w1)}  {'run_id'.ljust(w2)}  {'agent'.ljust(w3)}  status")
-    for s, r, a, st in rows:
-        print(f"{s.ljust(w1)}  {r.ljust(w2)}  {a.ljust(w3)}  {st}")
+    # Simple fixed-width table: column widths in one pass, then one template for every row.
+    w1 = w2 = w3 = 0
+    for s, r, a, _ in rows:
+        w1 = max(w1, len(s))
+        w2 = max(w2, len(r))
+        w3 = max(w3, len(a))
+    fmt = f"{{:<{w1}}}  {{:<{w2}}}  {{:<{w3}}}  {{}}".format
+    lines = [fmt("skill", "run_id", "agent", "status")]
+    lines.extend(fmt(*row) for row in rows)
+    # One write for the whole table instead of a print() (and line flush) per row.
+    sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 
@@ -1,20 +1,169 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
+import mmap
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, Iterator
 
+from _common import WORKERS, subdirs
 
-def _iter_jsonl(path: Path) -> Iterable[dict[str, Any]]:
-    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
-        line = line.strip()
-        if not line:
-            continue
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
+try:
+    import ahocorasick  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    ahocorasick = None  # type: ignore
+
+
+def _loads(line: bytes | str) -> Any:
+    if orjson is not None:
         try:
-            yield json.loads(line)
-        except Exception:
+            return orjson.loads(line)
+        except ValueError:
+            # NaN/Infinity, ints beyond 64 bits: stdlib accepts those.
+            pass
+    return json.loads(line)
+
+
+def _dumps(rec: dict[str, Any]) -> str:
+    # The canonical form --contains matches against and records are printed in, whatever
+    # writer (orjson or stdlib, compact or not) produced the line.
+    return json.dumps(rec, ensure_ascii=False)
+
+
+def _iter_jsonl(path: str, keep: Callable[[bytes], bool] | None = None) -> Iterable[dict[str, Any]]:
+    # Streamed: --limit usually stops after a few records, long before the end of a large log.
+    # `keep` sees the raw line first; lines it rejects are never parsed.
+    with open(path, "rb", buffering=1 << 20) as fh:
+        for raw in fh:
+            line = raw.strip()
+            if not line or (keep is not None and not keep(line)):
+                continue
+            try:
+                yield _loads(line)
+            except ValueError:
+                # Parsers reject invalid UTF-8 bytes; the old text-mode read replaced them instead.
+                try:
+                    yield _loads(line.decode("utf-8", errors="replace"))
+                except ValueError:
+                    continue
+
+
+# Needle characters the canonical json.dumps text may render differently from the line on disk:
+# JSON punctuation and spacing (writers differ), escapes, U+FFFD (stands in for invalid bytes),
+# and digits/"+" (numbers are re-formatted, e.g. 1e-5 -> 1e-05).
+_UNSAFE_NEEDLE_CHARS = frozenset('"\\:,[]{}+\ufffd0123456789')
+
+
+def _raw_needles(event: str | None, contains: list[str]) -> tuple[list[bytes], list[bytes]]:
+    """
+    Byte strings a raw line must contain to possibly match: (all of these, at least one of these).
+
+    Sound only for lines without a backslash: then every string is written literally, so
+    "needle in json.dumps(record)" implies "needle bytes in the raw line". Needles that could span
+    JSON punctuation or whitespace, or depend on escaping or number formatting, get no pre-filter.
+    """
+    all_of: list[bytes] = []
+    any_of: list[bytes] = []
+    if event and not any(c in '"\\\ufffd' for c in event):
+        all_of.append(b'"' + event.encode("utf-8") + b'"')
+    # One unsafe alternative is enough to let any line through.
+    if contains and all(not any(c in _UNSAFE_NEEDLE_CHARS or c.isspace() for c in n) for n in contains):
+        any_of = [n.encode("utf-8") for n in contains]
+    return all_of, any_of
+
+
+def _file_may_match(path: str, all_of: list[bytes], any_of: list[bytes]) -> bool:
+    try:
+        with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"\\") != -1:
+                return True
+            return all(mm.find(n) != -1 for n in all_of) and (not any_of or any(mm.find(n) != -1 for n in any_of))
+    except ValueError:
+        # mmap of an empty file
+        return False
+
+
+def _text_matcher(needles: list[str]) -> Callable[[str], bool] | None:
+    """True if the text contains any of `needles`, scanning it once however many there are."""
+    if not needles:
+        return None
+    if len(needles) == 1:
+        # `in` is already a vectorized substring search.
+        needle = needles[0]
+        return lambda text: needle in text
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for n in needles:
+            automaton.add_word(n, n)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    # Alternation compiles to a single scan as well, just a slower one.
+    search = re.compile("|".join(map(re.escape, needles))).search
+    return lambda text: search(text) is not None
+
+
+def _matching(path: str, event: str | None, contains: list[str], limit: int) -> list[bytes]:
+    # The walk doesn't probe for events.jsonl: agents that never logged just fail to open here,
+    # which saves a stat() per agent directory.
+    try:
+        return _scan(path, event, contains, limit)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return []
+
+
+def _scan(path: str, event: str | None, contains: list[str], limit: int) -> list[bytes]:
+    out: list[bytes] = []
+    keep: Callable[[bytes], bool] | None = None
+    all_of, any_of = _raw_needles(event, contains)
+    if all_of or any_of:
+        if not _file_may_match(path, all_of, any_of):
+            return out
+
+        def _keep(line: bytes) -> bool:
+            if b"\\" in line:
+                return True
+            return all(n in line for n in all_of) and (not any_of or any(n in line for n in any_of))
+
+        keep = _keep
+    matches = _text_matcher(contains)
+    for rec in _iter_jsonl(path, keep):
+        if event and rec.get("event") != event:
             continue
+        text = _dumps(rec)
+        if matches is not None and not matches(text):
+            continue
+        out.append(text.encode("utf-8"))
+        if len(out) >= limit:
+            break
+    return out
+
+
+def _iter_events_files(
+    outputs: str, skill: str | None, run_id: str | None, agent: str | None
+) -> Iterator[str]:
+    # Search agent-private events first (safer without locks).
+    # Plain strings all the way down: open() takes them as-is, no Path object per entry.
+    for skill_entry in subdirs(outputs):
+        if skill and skill_entry.name != skill:
+            continue
+        for run_entry in subdirs(skill_entry.path):
+            if run_id and run_entry.name != run_id:
+                continue
+            for agent_entry in subdirs(os.path.join(run_entry.path, "agents")):
+                if agent and agent_entry.name != agent:
+                    continue
+                yield os.path.join(agent_entry.path, "events.jsonl")
 
 
 def main() -> int:
@@ -24,7 +173,12 @@ def main() -> int:
     p.add_argument("--run-id", default=None, help="Filter by run id")
     p.add_argument("--agent", default=None, help="Filter by agent id")
     p.add_argument("--event", default=None, help="Filter by event name (exact match)")
-    p.add_argument("--contains", default=None, help="Substring filter over JSON text")
+    p.add_argument(
+        "--contains",
+        nargs="+",
+        default=[],
+        help="Substring filter over JSON text; with several, a record matching any of them is kept",
+    )
     p.add_argument("--limit", type=int, default=50, help="Max events to print (default: 50)")
     args = p.parse_args()
 
@@ -34,40 +188,54 @@ def main() -> int:
         print(f"outputs not found: {outputs}")
         return 2
 
-    # Search agent-private events first (safer without locks).
-    events_files: list[Path] = []
-    for skill_dir in sorted([p for p in outputs.iterdir() if p.is_dir()]):
-        if args.skill and skill_dir.name != args.skill:
-            continue
-        for run_dir in sorted([p for p in skill_dir.iterdir() if p.is_dir()]):
-            if args.run_id and run_dir.name != args.run_id:
-                continue
-            agents_dir = run_dir / "agents"
-            if not agents_dir.exists():
-                continue
-            for agent_dir in sorted([p for p in agents_dir.iterdir() if p.is_dir()]):
-                if args.agent and agent_dir.name != args.agent:
-                    continue
-                f = agent_dir / "events.jsonl"
-                if f.exists():
-                    events_files.append(f)
+    # Walked lazily, as the window below asks for files: a satisfied --limit stops the walk too.
+    events_files = _iter_events_files(str(outputs), args.skill, args.run_id, args.agent)
+
+    # Files are filtered on a small thread pool (mostly waiting on reads), but printed strictly in walk
+    # order. Only a bounded window of files is in flight, so a satisfied --limit stops the scan.
+    # A file can't contribute more than --limit lines, so each job stops there.
+    per_file = max(args.limit, 1)
+    # Matched lines come back UTF-8 encoded (by the workers): write them to the binary buffer,
+    # skipping print()'s per-line encode (and per-line flush on a console). Flushed once, on exit.
+    buf = getattr(sys.stdout, "buffer", None)
+    if buf is not None:
+        sys.stdout.flush()
+        write = buf.write
+    else:
+        # Replaced stdout (e.g. captured in-process): text only.
+        def write(data: bytes) -> None:
+            sys.stdout.write(data.decode("utf-8", errors="replace"))
 
+    try:
+        return _print_matching(events_files, args, per_file, write)
+    finally:
+        (buf or sys.stdout).flush()
+
+
+def _print_matching(
+    events_files: Iterator[str], args: argparse.Namespace, per_file: int, write: Callable[[bytes], Any]
+) -> int:
     count = 0
-    for f in events_files:
-        for rec in _iter_jsonl(f):
-            if args.event and rec.get("event") != args.event:
-                continue
-            if args.contains:
-                if args.contains not in json.dumps(rec, ensure_ascii=False):
-                    continue
-            print(json.dumps(rec, ensure_ascii=False))
-            count += 1
-            if count >= args.limit:
-                return 0
+    with ThreadPoolExecutor(max_workers=WORKERS) as ex:
+        window: deque = deque()
+        pending = events_files
+        for f in itertools.islice(pending, WORKERS * 2):
+            window.append(ex.submit(_matching, f, args.event, args.contains, per_file))
+        while window:
+            lines = window.popleft().result()
+            nxt = next(pending, None)
+            if nxt is not None:
+                window.append(ex.submit(_matching, nxt, args.event, args.contains, per_file))
+            for line in lines:
+                write(line + b"\n")
+                count += 1
+                if count >= args.limit:
+                    for fut in window:
+                        fut.cancel()
+                    return 0
 
     return 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
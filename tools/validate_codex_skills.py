@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _common import cache_path, load_cache, save_cache, subdirs
+
 
 def _parse_frontmatter(text: str) -> dict:
     """
@@ -43,9 +49,143 @@ def _parse_frontmatter(text: str) -> dict:
         return out
 
 
+# Frontmatter block, tolerating a UTF-8 BOM and CRLF line endings.
+_FM = re.compile(r"\ufeff?---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|$)", re.S)
+# Top-level `name:` / `description:` with a plain or quoted one-line scalar.
+_KV = re.compile(r"""^(name|description)[ \t]*:[ \t]*(["']?)(.*?)\2[ \t]*\r?$""", re.M)
+# Characters that give a value YAML-only meaning the regex can't reproduce: comments, flow
+# collections, escapes, anchors/aliases/tags, block scalar indicators, reserved indicators.
+_YAML_ONLY = frozenset("#[]{}\\&*!|>%@`")
+# A line after the key that continues its value: indented (folded plain scalar, nested block)
+# or a block-list item.
+_CONTINUED = re.compile(r"\n(?:[ \t]|-)")
+
+
+def _frontmatter_keys(text: str) -> dict:
+    """
+    name/description from the frontmatter, without running a YAML parser.
+
+    Only plain or simply quoted one-line values take this path. An empty value, a continuation
+    line, a repeated key or any YAML-only syntax returns {} instead, and so does a block with
+    fewer than two matches; callers that get fewer than two keys back should use
+    _parse_frontmatter.
+    """
+    m = _FM.match(text)
+    if not m:
+        return {}
+    body = m.group(1)
+    out = {}
+    for kv in _KV.finditer(body):
+        key, quote, value = kv.groups()
+        if (
+            key in out
+            or not value
+            or any(c in _YAML_ONLY for c in value)
+            # Quotes inside the value: YAML escapes ('') or a scalar that isn't quoted as a whole.
+            or (quote and quote in value)
+            or (not quote and value[0] in "\"'")
+            or _CONTINUED.match(body, kv.end())
+        ):
+            return {}
+        out[key] = value
+    return out
+
+
+# Frontmatter results from earlier invocations, keyed by SKILL.md path and valid while
+# (mtime_ns, size) match: [mtime_ns, size, name or None when name/description are missing].
+_CACHE_NAME = "validate_codex_skills.json"
+
+
+# A closing `---` line, complete with its line ending.
+_FM_END = re.compile(rb"\n[ \t]*---[ \t]*\r?\n")
+# ...or as the last line of the file, without one.
+_FM_END_EOF = re.compile(rb"\n[ \t]*---[ \t]*\r?\Z")
+
+
+def _read_frontmatter_head(path: Path, chunk: int = 8192) -> str | None:
+    """
+    The start of `path`, through the closing `---` line; None if it has no frontmatter block.
+
+    Both frontmatter parsers only look that far, so long skill bodies are never read or decoded,
+    and files without a block are rejected from the first read without parsing anything.
+    """
+    with open(path, "rb") as fh:
+        head = fh.read(chunk)
+        if not head.lstrip(b"\xef\xbb\xbf").lstrip(b" \t").startswith(b"---"):
+            # No opening line: parsers would return {} whatever follows.
+            return None
+        while True:
+            m = _FM_END.search(head, 3)
+            if m:
+                return head[: m.end()].decode("utf-8", errors="replace")
+            more = fh.read(chunk)
+            if not more:
+                if _FM_END_EOF.search(head, 3):
+                    return head.decode("utf-8", errors="replace")
+                # Never closed: likewise {}.
+                return None
+            head += more
+
+
+def _skill_name(
+    skill_md: Path, st: os.stat_result, strict: bool, cache: dict[str, list], seen: dict[str, list]
+) -> str | None:
+    """Frontmatter `name`, or None if name/description are missing; unchanged files come from `cache`."""
+    key = str(skill_md)
+    hit = cache.get(key)
+    if not strict and hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        name = hit[2]
+    else:
+        text = _read_frontmatter_head(skill_md)
+        if text is None:
+            name = None
+        else:
+            fm = {} if strict else _frontmatter_keys(text)
+            if len(fm) < 2:
+                fm = _parse_frontmatter(text)
+            name = str(fm["name"]) if "name" in fm and "description" in fm else None
+    # Plain dict stores are atomic; workers never write the same key.
+    seen[key] = [st.st_mtime_ns, st.st_size, name]
+    return name
+
+
+def _validate_one(
+    skill_dir: Path, strict: bool, cache: dict[str, list], seen: dict[str, list]
+) -> tuple[bool, list[str]]:
+    """Check one skill folder; returns (ok, report lines) instead of printing."""
+    messages: list[str] = []
+    skill_md = skill_dir / "SKILL.md"
+    agents_yaml = skill_dir / "agents" / "openai.yaml"
+    # One stat both proves SKILL.md exists and keys the cache.
+    try:
+        st = os.stat(skill_md)
+    except (FileNotFoundError, NotADirectoryError):
+        return False, [f"[FAIL] missing SKILL.md: {skill_md}"]
+    if not agents_yaml.exists():
+        messages.append(f"[WARN] missing agents/openai.yaml: {agents_yaml}")
+
+    name = _skill_name(skill_md, st, strict, cache, seen)
+    if name is None:
+        messages.append(f"[FAIL] bad frontmatter (need name/description): {skill_md}")
+        return False, messages
+    messages.append(f"[OK] {name}: {skill_dir.name}")
+    return True, messages
+
+
 def main() -> int:
     p = argparse.ArgumentParser(description="Validate codex-skills folder structure.")
     p.add_argument("--root", default=".", help="Project root (default: .)")
+    p.add_argument(
+        "--strict",
+        action="store_true",
+        help="Always parse frontmatter as YAML (ignores cached results from earlier runs)",
+    )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=min(8, os.cpu_count() or 1),
+        help="Skill folders checked concurrently (default: min(8, CPUs))",
+    )
     args = p.parse_args()
 
     root = Path(args.root).resolve()
@@ -54,23 +194,23 @@ def main() -> int:
         print(f"missing: {codex}")
         return 2
 
+    cache_file = cache_path(root, _CACHE_NAME)
+    cache = load_cache(cache_file)
+    seen: dict[str, list] = {}
+    skill_dirs = [Path(entry.path) for entry in subdirs(codex)]
+    # Folders are independent; overlap their reads. map() keeps the report in folder order.
+    validate = functools.partial(_validate_one, strict=args.strict, cache=cache, seen=seen)
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as ex:
+        results = list(ex.map(validate, skill_dirs))
+    # Rebuilt from this walk, so removed skills drop out.
+    if seen != cache:
+        save_cache(cache_file, seen)
+
     ok = True
-    for skill_dir in sorted([p for p in codex.iterdir() if p.is_dir()]):
-        skill_md = skill_dir / "SKILL.md"
-        agents_yaml = skill_dir / "agents" / "openai.yaml"
-        if not skill_md.exists():
-            print(f"[FAIL] missing SKILL.md: {skill_md}")
-            ok = False
-            continue
-        if not agents_yaml.exists():
-            print(f"[WARN] missing agents/openai.yaml: {agents_yaml}")
-
-        fm = _parse_frontmatter(skill_md.read_text(encoding="utf-8", errors="replace"))
-        if "name" not in fm or "description" not in fm:
-            print(f"[FAIL] bad frontmatter (need name/description): {skill_md}")
-            ok = False
-        else:
-            print(f"[OK] {fm['name']}: {skill_dir.name}")
+    for one_ok, messages in results:
+        for msg in messages:
+            print(msg)
+        ok = ok and one_ok
 
     return 0 if ok else 1
 